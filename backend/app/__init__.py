@@ -1,28 +1,62 @@
+import copy
 import logging
-import connexion
+from functools import lru_cache
 from pathlib import Path
-from werkzeug.exceptions import HTTPException
+import yaml
 
+from app.core.config import Config
 from app.core.logging import setup_logging
 
 logger = logging.getLogger(__name__)
 
+SPECIFICATION_DIR = Path(__file__).parent.parent / 'openapi'
+
+@lru_cache(maxsize=None)
+def _parse_spec(name: str) -> dict:
+    with open(SPECIFICATION_DIR / name, 'rb') as spec_file:
+        # libyaml parses the spec several times faster than the pure-Python loader Connexion would use
+        return yaml.load(spec_file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+def load_spec(name: str) -> dict:
+    """OpenAPI document from `openapi/`, parsed once per process. Returns a copy: Connexion mutates what it is given."""
+    return copy.deepcopy(_parse_spec(name))
+
+def validator_map() -> dict:
+    """Responses are checked on a configurable sample (RESPONSE_VALIDATION_SAMPLE_RATE); see app/api/response_validation.py"""
+    from app.api.response_validation import SampledResponseValidator
+    return {'response': SampledResponseValidator}
+
 def create_app():
+    # Framework imports are deferred so that `import app.*` (CLI, workers, scripts) stays cheap
+    import connexion
+    from werkzeug.exceptions import HTTPException
+
     # Setup logging immediately
     setup_logging()
     
-    # Specification dir
-    specification_dir = Path(__file__).parent.parent / 'openapi'
-    
     # Create the Connexion application instance (v2 style)
-    connexion_app = connexion.App(__name__, specification_dir=specification_dir)
+    connexion_app = connexion.App(__name__, specification_dir=SPECIFICATION_DIR)
     
     # Read the openapi.yaml
     connexion_app.add_api(
-        'openapi.yaml', 
+        load_spec('openapi.yaml'), 
         strict_validation=True, 
-        validate_responses=True
+        validate_responses=True,
+        validator_map=validator_map()
     )
+    # Operational endpoints (/internal), behind their own shared-secret header
+    connexion_app.add_api(load_spec('internal.yaml'), strict_validation=True, validate_responses=True, validator_map=validator_map())
+    
+    # Per-operation request counters and latency histograms (GET /internal/metrics)
+    from app.api.request_metrics import instrument_flask
+    instrument_flask(connexion_app.app)
+    
+    # Opt-in request profiling; nothing is installed unless PROFILING_DIR is set
+    if Config.PROFILING_DIR:
+        from app.api import request_profiling
+        request_profiling.instrument_flask(connexion_app.app)
+    
+    start_background_services()
     
     # Register global exception handler for unhandled exceptions
     @connexion_app.app.errorhandler(Exception)
@@ -40,3 +74,20 @@ def create_app():
         return {'detail': 'An internal error occurred'}, 500
     
     return connexion_app
+
+def start_background_services():
+    """Process-level services shared by the Flask and async serving modes."""
+    # The password hashing pool starts on the first sign-in; only a calibration (PASSWORD_HASH_TARGET_MS) runs now,
+    # so it never delays a login request
+    if Config.PASSWORD_HASH_TARGET_MS > 0:
+        from app.core.password_hasher import get_password_hasher
+        get_password_hasher()
+    # Optional background refresh of stale zones (keeps `temperature` warm without user clicks)
+    if Config.REFRESH_SCHEDULER_ENABLED:
+        from app.services.refresh_scheduler import start_refresh_scheduler
+        start_refresh_scheduler()
+    
+    # Load the offline city index up front instead of on the first search
+    if Config.CITY_SEARCH_BACKEND == "local":
+        from app.services.gazetteer_index import get_gazetteer_index
+        get_gazetteer_index()
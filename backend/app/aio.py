@@ -0,0 +1,79 @@
+import functools
+import inspect
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional
+import connexion
+from connexion import utils
+from connexion.resolver import Resolver
+
+from app import SPECIFICATION_DIR, load_spec, start_background_services, validator_map
+from app.api.aio import DB_EXECUTOR_KEY, run_sync
+from app.api.request_metrics import aiohttp_middleware
+from app.core.aio_http_client import close_async_http_client
+from app.core.config import Config
+from app.core.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Upstream-bound operations served by native coroutines; everything else runs its sync handler on the DB pool
+ASYNC_OPERATIONS = {
+    "app.api.zones.refresh_zone": "app.api.aio.refresh_zone",
+    "app.api.cities.search_cities": "app.api.aio.search_cities",
+}
+
+def _offload(handler: Callable) -> Callable:
+    """Wraps a sync handler as a coroutine that runs it on the DB worker pool."""
+    @functools.wraps(handler)
+    async def wrapper(*args, request, **kwargs):
+        return await run_sync(request, functools.partial(handler, *args, **kwargs))
+
+    # Connexion passes only the arguments named in the signature: keep the handler's own, plus `request`
+    signature = inspect.signature(handler)
+    request_param = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY)
+    named = [p for p in signature.parameters.values() if p.kind is not inspect.Parameter.VAR_KEYWORD]
+    # A `**kwargs` catch-all (parameters named after Python keywords) must stay last
+    rest = [p for p in signature.parameters.values() if p.kind is inspect.Parameter.VAR_KEYWORD]
+    wrapper.__signature__ = signature.replace(parameters=[*named, request_param, *rest])
+    return wrapper
+
+def _resolve_function(operation_id: str) -> Callable:
+    if operation_id in ASYNC_OPERATIONS:
+        return utils.get_function_from_name(ASYNC_OPERATIONS[operation_id])
+    return _offload(utils.get_function_from_name(operation_id))
+
+def create_async_app(executor: Optional[Executor] = None):
+    """
+    Async serving mode: the same OpenAPI spec on Connexion's aiohttp flavour.
+    Provider-bound endpoints await the async HTTP client on the event loop; CRUD handlers are unchanged
+    and run on a bounded thread pool, so blocking DB work never stalls the loop.
+    """
+    setup_logging()
+
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=Config.ASYNC_DB_WORKERS, thread_name_prefix="db-worker")
+
+    connexion_app = connexion.AioHttpApp(__name__, specification_dir=SPECIFICATION_DIR)
+    connexion_app.add_api(
+        load_spec('openapi.yaml'),
+        strict_validation=True,
+        validate_responses=True,
+        pass_context_arg_name='request',
+        resolver=Resolver(function_resolver=_resolve_function),
+        validator_map=validator_map()
+    )
+    # Internal handlers only read in-process state, so they run directly on the loop
+    connexion_app.add_api(load_spec('internal.yaml'), strict_validation=True, validate_responses=True, validator_map=validator_map())
+    connexion_app.app[DB_EXECUTOR_KEY] = executor
+    # Outermost, so requests are counted with the status Connexion's problem handling finally answers
+    connexion_app.app.middlewares.insert(0, aiohttp_middleware())
+
+    start_background_services()
+
+    async def shutdown(_app):
+        await close_async_http_client()
+        executor.shutdown(wait=False)
+
+    connexion_app.app.on_cleanup.append(shutdown)
+    logger.info("Async serving mode enabled")
+    return connexion_app
@@ -0,0 +1,59 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Tuple
+from aiohttp import web
+from app.api.request_context import RequestContext, bind
+from app.core.database import get_session
+from app.dtos.city_dto import CitySearchResponse
+from app.dtos.weather_dto import WeatherData
+from app.dtos.zone_dto import ZoneResponse
+from app.services.city_search_service import CitySearchService
+from app.services.weather_service import WeatherService
+from app.services.zone_service import ZoneService
+
+logger = logging.getLogger(__name__)
+
+# Key of the DB worker pool on the aiohttp application (see `app.aio.create_async_app`)
+DB_EXECUTOR_KEY = web.AppKey("db_executor", Executor)
+
+async def run_sync(request, fn: Callable, *args) -> Any:
+    """Runs blocking (DB-bound) code on the worker pool, with the request bound for `request_context` lookups."""
+    context = contextvars.copy_context()
+    request_context = RequestContext(headers=request.headers, token_info=request.get('token_info'))
+    context.run(bind, request_context)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        request.config_dict[DB_EXECUTOR_KEY], functools.partial(context.run, fn, *args)
+    )
+
+def _load_zone(user_id: int, zone_id: int) -> ZoneResponse:
+    with get_session() as session:
+        return ZoneService(session, user_id).get_zone(zone_id)
+
+def _store_weather(user_id: int, zone_id: int, weather_data: WeatherData) -> ZoneResponse:
+    with get_session() as session:
+        return ZoneService(session, user_id).apply_weather(zone_id, weather_data)
+
+async def refresh_zone(zone_id: int, request) -> Tuple[Dict[str, Any], int]:
+    """Async `refresh_zone`: the provider wait happens on the event loop, outside any DB session or worker thread."""
+    user_id = int(request['token_info']['sub'])
+    zone = await run_sync(request, _load_zone, user_id, zone_id)
+
+    logger.info(f"Refreshing weather for zone {zone_id}")
+    weather_data = await WeatherService().fetch_current_weather_async(zone.latitude, zone.longitude)
+
+    refreshed = await run_sync(request, _store_weather, user_id, zone_id, weather_data)
+    return refreshed.model_dump(), 200
+
+async def search_cities(q: str) -> Tuple[Dict[str, Any], int]:
+    """Async `search_cities`. Cache hits and the local backend never leave the event loop."""
+    logger.info(f"City search requested for query: {q}")
+
+    results = await CitySearchService().search_cities_async(q)
+
+    response_dto = CitySearchResponse(results=results)
+    logger.info(f"Returning {len(results)} city results for query: {q}")
+    return response_dto.model_dump(), 200
@@ -1,8 +1,9 @@
 from typing import Dict, Tuple, Any
 import logging
+from werkzeug.exceptions import Unauthorized
 from app.services.auth_service import AuthService
-from app.dtos.auth_dto import UserRegister, UserLogin, GenericMessage
-from app.core.database import get_session
+from app.dtos.auth_dto import UserRegister, UserLogin, RefreshRequest, GenericMessage
+from app.core.database import get_read_session, get_session
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,8 @@ def register(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
 
 def login(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """Authenticates user credentials. Issues a JWT for subsequent stateless authorization."""
-    with get_session() as session:
-        auth_service = AuthService(session)
+    with get_session() as session, get_read_session(primary=session) as read_session:
+        auth_service = AuthService(session, read_session)
         request_dto = UserLogin(**body)
         
         logger.info(f"Login attempt for user: {request_dto.username}")
@@ -30,3 +31,23 @@ def login(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         logger.info(f"User logged in successfully: {request_dto.username}")
         
         return response_dto.model_dump(), 200
+
+def refresh(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """Exchanges a refresh token for a new access/refresh pair. The presented refresh token becomes invalid."""
+    with get_session() as session:
+        auth_service = AuthService(session)
+        request_dto = RefreshRequest(**body)
+        response_dto = auth_service.refresh_tokens(request_dto.refresh_token)
+
+    # Raised outside the session: revocations made while rejecting a reused token must be committed
+    if response_dto is None:
+        raise Unauthorized(description="Invalid or expired refresh token")
+    return response_dto.model_dump(), 200
+
+def logout(body: Dict[str, Any]) -> Tuple[None, int]:
+    """Revokes the refresh token (and its rotation family). Outstanding access tokens expire on their own."""
+    with get_session() as session:
+        auth_service = AuthService(session)
+        request_dto = RefreshRequest(**body)
+        auth_service.logout(request_dto.refresh_token)
+        return None, 204
@@ -0,0 +1,24 @@
+import hashlib
+import hmac
+from app.api.request_context import get_request_headers
+from app.core.config import Config
+
+def zones_etag(user_id: int, version: int, resource: str) -> str:
+    """
+    Strong ETag for a zone read: changes whenever any of the user's zones is written (`zones_version`).
+    Keyed with SECRET_KEY so tags reveal neither the counter nor anything about other tenants.
+    """
+    message = f"{user_id}:{version}:{resource}".encode("utf-8")
+    digest = hmac.new(Config.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+    return f'"{digest}"'
+
+def if_none_match(etag: str) -> bool:
+    """True when the request's `If-None-Match` already names `etag` (so a 304 can be sent)."""
+    header = get_request_headers().get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: a W/ prefix does not prevent a match
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
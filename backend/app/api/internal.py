@@ -0,0 +1,24 @@
+from typing import Any, Dict, Tuple
+from connexion.lifecycle import ConnexionResponse
+from app.api import response_validation
+from app.core import database, metrics
+
+def get_db_pool_stats() -> Tuple[Dict[str, Any], int]:
+    """Connection pool occupancy, checkout waits and connection ages of this process (plus the read replica's pool)."""
+    stats = database.pool_metrics.snapshot(database.get_engine())
+    if database.read_engine is not None:
+        stats["replica"] = database.read_pool_metrics.snapshot(database.read_engine)
+    return stats, 200
+
+def get_response_validation_stats() -> Tuple[Dict[str, Any], int]:
+    """Per-operation response validation sampling: responses, validated, violations and mean validation cost."""
+    return response_validation.stats.snapshot(), 200
+
+def get_metrics() -> ConnexionResponse:
+    """Prometheus text exposition; summed over all worker processes when METRICS_MULTIPROC_DIR is set."""
+    # Explicit mimetype: the operation also declares problem+json (401), so Connexion would default to JSON
+    return ConnexionResponse(
+        status_code=200,
+        mimetype="text/plain",
+        body=metrics.registry.collect()
+    )
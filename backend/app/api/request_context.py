@@ -0,0 +1,37 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+import connexion
+import flask
+from connexion.lifecycle import ConnexionResponse
+
+class RequestContext(NamedTuple):
+    headers: Mapping[str, str]
+    token_info: Optional[Dict[str, Any]]
+
+# Set by the async serving mode before a sync handler runs on the worker pool; unset under Flask.
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+def bind(context: RequestContext) -> None:
+    """Binds request data for the current (copied) context. Only used by the async serving mode bridge."""
+    _current.set(context)
+
+def get_token_info() -> Dict[str, Any]:
+    """Validated JWT payload of the current request, regardless of the serving mode."""
+    context = _current.get()
+    if context is not None:
+        return context.token_info
+    return connexion.context.get('token_info')
+
+def get_request_headers() -> Mapping[str, str]:
+    context = _current.get()
+    if context is not None:
+        return context.headers
+    return connexion.request.headers
+
+def encoded_json_response(body: bytes, status: int, headers: Mapping[str, str]) -> Any:
+    """Response for a body that is already JSON bytes, sent unchanged in either serving mode."""
+    if _current.get() is not None:
+        # The aiohttp flavour passes bytes bodies through as-is
+        return ConnexionResponse(status_code=status, mimetype="application/json", body=body, headers=headers)
+    # Flask re-encodes any JSON-typed ConnexionResponse body; a framework response is returned untouched
+    return flask.Response(body, status=status, headers=headers, mimetype="application/json")
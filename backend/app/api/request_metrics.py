@@ -0,0 +1,104 @@
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from app.core import metrics, query_accounting
+from app.core.config import Config
+from app.core.query_accounting import QueryStats
+
+logger = logging.getLogger(__name__)
+
+SPECS = ('openapi.yaml', 'internal.yaml')
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'patch', 'head', 'options')
+
+# Flask rule variables (`<int:zone_id>`) back to OpenAPI templates (`{zone_id}`)
+_FLASK_VARIABLE = re.compile(r'<(?:[^<>:]+:)?([^<>]+)>')
+
+@lru_cache(maxsize=None)
+def operation_index() -> Dict[Tuple[str, str], str]:
+    """(METHOD, full path template) -> operationId, for every operation of the served specs."""
+    from app import _parse_spec
+    index = {}
+    for name in SPECS:
+        spec = _parse_spec(name)
+        base_path = spec.get('servers', [{}])[0].get('url', '').rstrip('/')
+        for path, item in spec.get('paths', {}).items():
+            for method, operation in item.items():
+                if method in HTTP_METHODS and 'operationId' in operation:
+                    index[(method.upper(), base_path + path)] = operation['operationId']
+    return index
+
+def operation_for(method: str, path_template: Optional[str]) -> str:
+    """Metric label for a request: its operationId, or `unmatched` (unknown routes, docs, static files)."""
+    if path_template is None:
+        return 'unmatched'
+    index = operation_index()
+    operation = index.get((method, path_template))
+    if operation is None and method == 'HEAD':
+        operation = index.get(('GET', path_template))
+    return operation or 'unmatched'
+
+def flask_operation() -> str:
+    """operationId of the Flask request being served."""
+    import flask
+    rule = flask.request.url_rule
+    template = _FLASK_VARIABLE.sub(r'{\1}', rule.rule) if rule is not None else None
+    return operation_for(flask.request.method, template)
+
+def record_request(operation: str, status: int, seconds: float, queries: QueryStats) -> None:
+    metrics.http_request_duration.observe(seconds, operation=operation)
+    metrics.http_requests.inc(operation=operation, status=status)
+    metrics.db_statements_per_request.observe(queries.statements, operation=operation)
+    metrics.db_time_per_request.observe(queries.seconds, operation=operation)
+    if 0 < Config.REQUEST_QUERY_WARN_COUNT < queries.statements:
+        logger.warning(f"{operation} ({status}) issued {queries.statements} SQL statements in {queries.seconds * 1000:.1f} ms")
+    else:
+        logger.debug(f"{operation} ({status}): {seconds * 1000:.1f} ms, {queries.statements} SQL statements in {queries.seconds * 1000:.1f} ms")
+
+def instrument_flask(flask_app) -> None:
+    """Times every request of the Flask app and counts it by operation and status."""
+    import flask
+
+    @flask_app.before_request
+    def _start_timer():
+        flask.g.metrics_started = time.perf_counter()
+        flask.g.query_stats, flask.g.query_stats_token = query_accounting.begin(flask_operation())
+
+    @flask_app.after_request
+    def _record(response):
+        started = flask.g.pop('metrics_started', None)
+        if started is not None:
+            queries = flask.g.query_stats
+            record_request(queries.label, response.status_code, time.perf_counter() - started, queries)
+        return response
+
+    @flask_app.teardown_request
+    def _stop_query_tracking(_error):
+        token = flask.g.pop('query_stats_token', None)
+        if token is not None:
+            query_accounting.end(token)
+
+def aiohttp_middleware():
+    """Same instrumentation for the async serving mode; install it as the outermost middleware."""
+    from aiohttp import web
+
+    @web.middleware
+    async def metrics_middleware(request, handler):
+        resource = request.match_info.route.resource
+        operation = operation_for(request.method, resource.canonical if resource is not None else None)
+        started = time.perf_counter()
+        status = 500
+        # DB work handed to the worker pool runs in a copy of this context, so it is counted too
+        with query_accounting.track_queries(operation) as queries:
+            try:
+                response = await handler(request)
+                status = response.status
+                return response
+            except web.HTTPException as e:
+                status = e.status
+                raise
+            finally:
+                record_request(operation, status, time.perf_counter() - started, queries)
+
+    return metrics_middleware
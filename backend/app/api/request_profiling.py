@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import random
+import threading
+import uuid
+from datetime import datetime, timezone
+from app.api.request_metrics import flask_operation
+from app.core.config import Config
+from app.core.profiler import StackSampler
+from app.core.security import verify_internal_token
+
+logger = logging.getLogger(__name__)
+
+# Carries INTERNAL_API_TOKEN: only operators can make a request profile itself
+PROFILE_HEADER = 'X-Profile-Request'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+def instrument_flask(flask_app) -> None:
+    """
+    Profiles selected requests (PROFILE_HEADER, or a PROFILING_SAMPLE_RATE share) with a stack sampler and
+    writes `<PROFILING_DIR>/<id>.collapsed` plus `<id>.json` (operationId, status, timing). Not installed at all
+    while PROFILING_DIR is unset.
+    """
+    import flask
+
+    os.makedirs(Config.PROFILING_DIR, exist_ok=True)
+
+    @flask_app.before_request
+    def _start_profiler():
+        if _should_profile(flask.request.headers.get(PROFILE_HEADER)):
+            flask.g.profiler = StackSampler(threading.get_ident(), Config.PROFILING_INTERVAL_MS / 1000).start()
+
+    @flask_app.after_request
+    def _write_profile(response):
+        sampler = flask.g.pop('profiler', None)
+        if sampler is not None:
+            response.headers[PROFILE_ID_HEADER] = _finish(sampler, response.status_code)
+        return response
+
+    @flask_app.teardown_request
+    def _stop_profiler(_error):
+        # Only reached with a sampler still running when the request failed before after_request
+        sampler = flask.g.pop('profiler', None)
+        if sampler is not None:
+            _finish(sampler, 500)
+
+def _should_profile(header_token) -> bool:
+    if header_token is not None and verify_internal_token(header_token):
+        return True
+    rate = Config.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+def _finish(sampler: StackSampler, status: int) -> str:
+    import flask
+
+    sampler.stop()
+    operation = flask_operation()
+    now = datetime.now(timezone.utc)
+    profile_id = f"{now:%Y%m%dT%H%M%S}-{operation.rsplit('.', 1)[-1]}-{uuid.uuid4().hex[:8]}"
+    summary = {
+        "operation": operation,
+        "method": flask.request.method,
+        "path": flask.request.path,
+        "status": status,
+        "duration_ms": round(sampler.elapsed_seconds * 1000, 3),
+        "samples": sampler.samples,
+        "interval_ms": Config.PROFILING_INTERVAL_MS,
+        "recorded_at": now.isoformat(),
+    }
+    try:
+        base = os.path.join(Config.PROFILING_DIR, profile_id)
+        with open(base + ".collapsed", "w") as stacks_file:
+            stacks_file.write(sampler.collapsed())
+        with open(base + ".json", "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write request profile {profile_id}: {e}")
+    logger.info(f"Profiled {operation} ({sampler.elapsed_seconds * 1000:.1f} ms, {sampler.samples} samples): {profile_id}")
+    return profile_id
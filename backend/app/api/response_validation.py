@@ -0,0 +1,77 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict
+from connexion.decorators.response import ResponseValidator
+from connexion.exceptions import NonConformingResponse
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+class ResponseValidationStats:
+    """Per-operation counters: responses seen, responses validated, schema violations and time spent validating."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation_id: str, validated: bool, violation: bool = False, seconds: float = 0.0) -> None:
+        with self._lock:
+            entry = self._operations.setdefault(
+                operation_id, {"responses": 0, "validated": 0, "violations": 0, "validation_seconds": 0.0}
+            )
+            entry["responses"] += 1
+            if validated:
+                entry["validated"] += 1
+                entry["violations"] += violation
+                entry["validation_seconds"] += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {
+                operation_id: {
+                    "responses": entry["responses"],
+                    "validated": entry["validated"],
+                    "violations": entry["violations"],
+                    "mean_validation_ms": round(entry["validation_seconds"] / entry["validated"] * 1000, 3) if entry["validated"] else 0.0,
+                }
+                for operation_id, entry in self._operations.items()
+            }
+        return {
+            "sample_rate": Config.RESPONSE_VALIDATION_SAMPLE_RATE,
+            "strict": Config.RESPONSE_VALIDATION_STRICT,
+            "operations": operations,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+stats = ResponseValidationStats()
+
+class SampledResponseValidator(ResponseValidator):
+    """
+    Checks a random RESPONSE_VALIDATION_SAMPLE_RATE share of responses against the spec.
+    Violations are logged and counted; they fail the request (500) only with RESPONSE_VALIDATION_STRICT.
+    """
+
+    def validate_response(self, data, status_code, headers, url):
+        operation_id = self.operation.operation_id
+        rate = Config.RESPONSE_VALIDATION_SAMPLE_RATE
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            stats.record(operation_id, validated=False)
+            return True
+
+        started = time.perf_counter()
+        try:
+            super().validate_response(data, status_code, headers, url)
+        except NonConformingResponse as e:
+            stats.record(operation_id, validated=True, violation=True, seconds=time.perf_counter() - started)
+            detail = e.message.splitlines()[0] if e.message else ""
+            logger.error(f"Response of {operation_id} ({status_code}) does not match the spec: {e.reason}: {detail}")
+            if Config.RESPONSE_VALIDATION_STRICT:
+                raise
+            return False
+        stats.record(operation_id, validated=True, seconds=time.perf_counter() - started)
+        return True
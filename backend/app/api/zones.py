@@ -1,21 +1,57 @@
-import connexion
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
+from app.api.conditional import if_none_match, zones_etag
+from app.api.request_context import encoded_json_response, get_token_info
 from app.services.zone_service import ZoneService
-from app.dtos.zone_dto import ZoneCreate, ZoneUpdate
-from app.core.database import get_session
+from app.dtos.zone_dto import ZoneCreate, ZoneUpdate, ZoneBulkRefreshRequest
+from app.core.config import Config
+from app.core.database import get_session, read_at_watermark
+from app.core.pagination import decode_cursor
+from app.core.time_range import parse_bucket, parse_timestamp
+from app.core.serialization import dumps
 
 def _get_user_id() -> int:
     """Extracts user ID from the validated security context (JWT subject)."""
-    token_info = connexion.context.get('token_info')
+    token_info = get_token_info()
     return int(token_info['sub'])
 
-def list_zones() -> Tuple[List[Dict[str, Any]], int]:
-    """Returns all zones owned by the authenticated user. Implicitly filters by tenant."""
-    with get_session() as session:
-        user_id = _get_user_id()
-        service = ZoneService(session, user_id)
-        zones = service.list_zones()
-        return [z.model_dump() for z in zones], 200
+def _zone_reads(user_id: int):
+    """
+    The user's `zones_version` read once on the primary (`.value`, for ETags and 304s), and a read session (`.session()`)
+    on the replica once it holds that version, on the primary until then.
+    """
+    return read_at_watermark(lambda session: ZoneService(session, user_id).zones_version())
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    # Clients may keep the body but must revalidate it (cheap 304) before reuse
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def list_zones(limit: Optional[int] = None, cursor: Optional[str] = None) -> Any:
+    """
+    Returns one page of the zones owned by the authenticated user. Answers 304 when `If-None-Match` is current.
+    The page is encoded to JSON bytes here (fast encoder) rather than by the framework.
+    """
+    after_id = decode_cursor(cursor)
+    page_size = min(limit or Config.ZONES_PAGE_DEFAULT_LIMIT, Config.ZONES_PAGE_MAX_LIMIT)
+    user_id = _get_user_id()
+    with _zone_reads(user_id) as reads:
+        etag = zones_etag(user_id, reads.value, f"zones?limit={page_size}&after={after_id}")
+        if if_none_match(etag):
+            return None, 304, _cache_headers(etag)
+
+        page = ZoneService(reads.session(), user_id).list_zones(page_size, after_id)
+    return encoded_json_response(dumps(page), 200, _cache_headers(etag))
+
+def nearby_zones(lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> Any:
+    """Returns the user's zones within `radius_km` of a point, nearest first. Answers 304 when `If-None-Match` is current."""
+    max_results = min(limit or Config.ZONES_PAGE_DEFAULT_LIMIT, Config.ZONES_PAGE_MAX_LIMIT)
+    user_id = _get_user_id()
+    with _zone_reads(user_id) as reads:
+        etag = zones_etag(user_id, reads.value, f"zones/nearby?lat={lat}&lon={lon}&r={radius_km}&limit={max_results}")
+        if if_none_match(etag):
+            return None, 304, _cache_headers(etag)
+
+        result = ZoneService(reads.session(), user_id).nearby_zones(lat, lon, radius_km, max_results)
+    return encoded_json_response(dumps(result), 200, _cache_headers(etag))
 
 def create_zone(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """Provisions a new zone for the user. Initializes associated weather data structures."""
@@ -27,13 +63,27 @@ def create_zone(body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         created = service.create_zone(dto)
         return created.model_dump(), 201
 
-def get_zone(zone_id: int) -> Tuple[Dict[str, Any], int]:
-    """Retrieves zone details by ID. Enforces strict ownership validation."""
-    with get_session() as session:
-        user_id = _get_user_id()
-        service = ZoneService(session, user_id)
-        zone = service.get_zone(zone_id)
-        return zone.model_dump(), 200
+def get_zone(zone_id: int) -> Tuple[Optional[Dict[str, Any]], int, Dict[str, str]]:
+    """Retrieves zone details by ID. Enforces strict ownership validation. Answers 304 when `If-None-Match` is current."""
+    user_id = _get_user_id()
+    with _zone_reads(user_id) as reads:
+        # The version moves on every write (including deletion), so a matching tag implies the zone still exists unchanged
+        etag = zones_etag(user_id, reads.value, f"zones/{zone_id}")
+        if if_none_match(etag):
+            return None, 304, _cache_headers(etag)
+
+        zone = ZoneService(reads.session(), user_id).get_zone(zone_id)
+        return zone.model_dump(), 200, _cache_headers(etag)
+
+def get_zone_history(zone_id: int, to: Optional[str] = None, bucket: Optional[str] = None, **params: Any) -> Tuple[Dict[str, Any], int]:
+    """Temperature history of a zone, downsampled per bucket in the database. `from` is a keyword, so it arrives in `params`."""
+    start = parse_timestamp(params.get("from"), "from")
+    end = parse_timestamp(to, "to")
+    bucket_seconds = parse_bucket(bucket)
+    user_id = _get_user_id()
+    with _zone_reads(user_id) as reads:
+        history = ZoneService(reads.session(), user_id).get_history(zone_id, start, end, bucket_seconds)
+        return history.model_dump(), 200
 
 def update_zone(zone_id: int, body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """Modifies an existing zone. Validates constraints before applying partial or full updates."""
@@ -60,3 +110,13 @@ def refresh_zone(zone_id: int) -> Tuple[Dict[str, Any], int]:
         service = ZoneService(session, user_id)
         refreshed = service.refresh_zone(zone_id)
         return refreshed.model_dump(), 200
+
+def refresh_zones(body: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
+    """Refreshes many zones in one call using batched provider requests. Reports per-zone success or failure."""
+    with get_session() as session:
+        user_id = _get_user_id()
+        service = ZoneService(session, user_id)
+        dto = ZoneBulkRefreshRequest(**(body or {}))
+
+        result = service.refresh_zones(dto.zone_ids)
+        return result.model_dump(), 200
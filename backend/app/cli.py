@@ -0,0 +1,67 @@
+"""
+Operational commands, run explicitly rather than on process start.
+
+Usage (from backend/):
+    python -m app.cli init-db            # create the database (MSSQL) and tables; once per deployment
+    python -m app.cli backfill-geohash   # fill zones.geohash on zones created before the column existed
+    python -m app.cli purge-refresh-tokens  # delete expired and revoked refresh tokens; schedule it (e.g. daily)
+"""
+
+import argparse
+from app.core.logging import setup_logging
+
+def init_db_command(args) -> None:
+    from app.core.database import init_db
+    init_db()
+
+def backfill_geohash_command(args) -> None:
+    from app.core.database import get_session
+    from app.core.geo import encode_geohash
+    from app.repo.zone_repository import ZoneMaintenanceRepository
+
+    total = 0
+    while True:
+        # One transaction per batch: progress survives an interruption and locks stay short
+        with get_session() as session:
+            repo = ZoneMaintenanceRepository(session)
+            zones = repo.get_without_geohash(args.batch_size)
+            for zone in zones:
+                zone.geohash = encode_geohash(zone.latitude, zone.longitude)
+            repo.update_many(zones)
+        total += len(zones)
+        if len(zones) < args.batch_size:
+            break
+    print(f"Backfilled geohash on {total} zones")
+
+def purge_refresh_tokens_command(args) -> None:
+    from datetime import datetime, timezone
+    from app.core.database import get_session
+    from app.repo.refresh_token_repository import RefreshTokenRepository
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    total = 0
+    while True:
+        # One short transaction per batch, so sign-ins and refreshes are never blocked for long
+        with get_session() as session:
+            purged = RefreshTokenRepository(session).purge_dead(now, args.batch_size)
+        total += purged
+        if purged < args.batch_size:
+            break
+    print(f"Purged {total} refresh tokens")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Weather App operational commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init-db", help="create the database (MSSQL) and tables if missing").set_defaults(handler=init_db_command)
+    backfill = commands.add_parser("backfill-geohash", help="compute zones.geohash where it is missing")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.set_defaults(handler=backfill_geohash_command)
+    purge = commands.add_parser("purge-refresh-tokens", help="delete expired refresh tokens and those of ended sign-ins")
+    purge.add_argument("--batch-size", type=int, default=1000)
+    purge.set_defaults(handler=purge_refresh_tokens_command)
+    args = parser.parse_args(argv)
+    setup_logging()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
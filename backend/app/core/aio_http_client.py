@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Optional
+import aiohttp
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+class ProviderRequestError(Exception):
+    """Upstream call failed after retries (connection error, timeout or non-2xx status)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class AsyncProviderHttpClient:
+    """
+    Asyncio counterpart of `ProviderHttpClient` for the async serving mode.
+    One keep-alive connection pool per host shared by every request on the event loop, gzip decoding,
+    and the same retry policy (connection errors, timeouts, 429/5xx with jittered exponential backoff).
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        pool_size: int = Config.ASYNC_PROVIDER_POOL_SIZE,
+        max_retries: int = Config.PROVIDER_HTTP_MAX_RETRIES,
+        backoff_factor: float = Config.PROVIDER_HTTP_BACKOFF_FACTOR,
+        backoff_jitter: float = Config.PROVIDER_HTTP_BACKOFF_JITTER
+    ):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._requests = 0
+        self._failures = 0
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """GETs `url` and decodes the JSON body. Raises `ProviderRequestError` once retries are exhausted."""
+        self._requests += 1
+        session = self._get_session()
+        client_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        for attempt in range(self.max_retries + 1):
+            retryable = attempt < self.max_retries
+            try:
+                async with session.get(url, params=params, timeout=client_timeout) as response:
+                    if response.status in self.RETRY_STATUSES and retryable:
+                        await response.read()
+                    elif response.status >= 400:
+                        raise ProviderRequestError(f"{response.status} from {url}", status=response.status)
+                    else:
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not retryable:
+                    self._failures += 1
+                    raise ProviderRequestError(f"{type(e).__name__}: {e}") from e
+            except ProviderRequestError:
+                self._failures += 1
+                raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_jitter))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self._requests, "failures": self._failures, "pool_size": self.pool_size}
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily: a ClientSession binds to the event loop it is first used on
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+        return self._session
+
+_client: Optional[AsyncProviderHttpClient] = None
+
+def get_async_http_client() -> AsyncProviderHttpClient:
+    """Event-loop-wide provider client, created on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncProviderHttpClient()
+    return _client
+
+async def close_async_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -9,12 +9,98 @@ class Config:
     # FALLBACK: Local SQLite for development without Docker
     basedir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{os.path.join(basedir, "weather.db")}')
+
+    # Optional read replica for read-only endpoints (zone reads, login lookups). Unset = everything on DATABASE_URL.
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+    # Connection pool (QueuePool). Size it to the threads that hold sessions: request threads,
+    # ASYNC_DB_WORKERS in async mode, plus REFRESH_SCHEDULER_WORKERS. Watch GET /internal/db/pool.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Connections older than this are replaced on checkout (-1 = never); keep below server/LB idle timeouts
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # pyodbc bulk parameter binding for executemany (MSSQL only)
+    DB_FAST_EXECUTEMANY = os.getenv("DB_FAST_EXECUTEMANY", "true").lower() == "true"
+
+    # Statements slower than this are logged (SQL text, parameter types only). 0 = off
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+    # A request issuing more statements than this is logged as a warning (N+1 suspects). 0 = off
+    REQUEST_QUERY_WARN_COUNT = int(os.getenv("REQUEST_QUERY_WARN_COUNT", "50"))
+
+    # Shared secret for the /internal operational endpoints (X-Internal-Token). Unset = endpoints disabled.
+    INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
     
     # Auth & Security
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev_secret_key_change_in_production')
     SECURITY_PASSWORD_SALT = os.getenv('SECURITY_PASSWORD_SALT', 'dev_salt_change_in_production')
     JWT_ALGORITHM = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    # Opaque, rotating refresh tokens (POST /auth/refresh) so clients sign in with a password only once
+    REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    # Verified access tokens kept in memory per process; size for the number of concurrently active sessions
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+    # Password hashing (Argon2id). Stored hashes with other parameters are rehashed on the next login.
+    PASSWORD_HASH_TIME_COST = int(os.getenv("PASSWORD_HASH_TIME_COST", "3"))
+    PASSWORD_HASH_MEMORY_KIB = int(os.getenv("PASSWORD_HASH_MEMORY_KIB", "65536"))
+    PASSWORD_HASH_PARALLELISM = int(os.getenv("PASSWORD_HASH_PARALLELISM", "4"))
+    # When > 0, the time cost is calibrated at startup to reach this per-hash latency (overrides TIME_COST).
+    # Ignored with WEB_CONCURRENCY > 1 (each process would calibrate differently): pin the result of
+    # `python -m app.core.password_hasher <ms>` instead.
+    PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "0"))
+    # Server processes per host (gunicorn's WEB_CONCURRENCY); each gets its own hashing pool
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # Hashing processes per server process, started on the first hash/verify (0 = hash inline on the request thread).
+    # The default splits the host's cores across the WEB_CONCURRENCY server processes.
+    PASSWORD_HASH_WORKERS = int(os.getenv(
+        "PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // max(1, WEB_CONCURRENCY)))
+    ))
+    # Pending hash/verify jobs beyond which sign-ins are rejected with 503 (0 = unbounded)
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
+
+    # Serving mode: "wsgi" (Flask, one thread per request) or "async" (aiohttp event loop)
+    APP_SERVER_MODE = os.getenv("APP_SERVER_MODE", "wsgi").lower()
+    # Async mode only: threads running DB-bound (sync) handlers off the event loop
+    ASYNC_DB_WORKERS = int(os.getenv("ASYNC_DB_WORKERS", "16"))
+    # Async mode only: concurrent provider connections per host (requests beyond this queue on the loop)
+    ASYNC_PROVIDER_POOL_SIZE = int(os.getenv("ASYNC_PROVIDER_POOL_SIZE", "100"))
+
+    # GET /zones keyset pagination. The OpenAPI spec caps `limit` at 500; the max here can only lower that.
+    ZONES_PAGE_DEFAULT_LIMIT = int(os.getenv("ZONES_PAGE_DEFAULT_LIMIT", "100"))
+    ZONES_PAGE_MAX_LIMIT = int(os.getenv("ZONES_PAGE_MAX_LIMIT", "500"))
+
+    # GET /zones/{id}/history: points per response when `bucket` is omitted, and the most any `bucket` may yield
+    ZONE_HISTORY_TARGET_POINTS = int(os.getenv("ZONE_HISTORY_TARGET_POINTS", "400"))
+    ZONE_HISTORY_MAX_POINTS = int(os.getenv("ZONE_HISTORY_MAX_POINTS", "2000"))
+    # Weather history rows per INSERT statement (refreshes and scheduled ticks write all their readings at once)
+    WEATHER_READINGS_INSERT_BATCH = int(os.getenv("WEATHER_READINGS_INSERT_BATCH", "500"))
+
+    # Share of responses checked against the OpenAPI spec (1 = all, as the test suite runs; 0 = off)
+    RESPONSE_VALIDATION_SAMPLE_RATE = float(os.getenv("RESPONSE_VALIDATION_SAMPLE_RATE", "0.01"))
+    # Fail non-conforming responses with 500 instead of only logging and counting them (tests)
+    RESPONSE_VALIDATION_STRICT = os.getenv("RESPONSE_VALIDATION_STRICT", "false").lower() == "true"
+
+    # GET /internal/metrics across worker processes: a directory shared by all of them, where each writes its
+    # counters every METRICS_FLUSH_SECONDS. Empty it on every deployment. Unset = per-process metrics only.
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+    # On-demand request profiling (Flask mode). Unset = off, with no hooks installed. Dumps collapsed stacks here.
+    PROFILING_DIR = os.getenv("PROFILING_DIR")
+    # Share of requests profiled; a request carrying X-Profile-Request: <INTERNAL_API_TOKEN> is always profiled
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+
+    # Shared provider HTTP client (keep-alive pools for weather + geocoding)
+    PROVIDER_HTTP_POOL_SIZE = int(os.getenv("PROVIDER_HTTP_POOL_SIZE", "10"))
+    PROVIDER_HTTP_MAX_RETRIES = int(os.getenv("PROVIDER_HTTP_MAX_RETRIES", "2"))
+    PROVIDER_HTTP_BACKOFF_FACTOR = float(os.getenv("PROVIDER_HTTP_BACKOFF_FACTOR", "0.2"))
+    PROVIDER_HTTP_BACKOFF_JITTER = float(os.getenv("PROVIDER_HTTP_BACKOFF_JITTER", "0.2"))
+    # Longest Retry-After (429/503) waited for before retrying; keep well below WEATHER_PROVIDER_TIMEOUT_SECONDS
+    PROVIDER_HTTP_MAX_RETRY_AFTER_SECONDS = float(os.getenv("PROVIDER_HTTP_MAX_RETRY_AFTER_SECONDS", "1"))
 
     # External Weather provider
     WEATHER_PROVIDER_BASE_URL = os.getenv(
@@ -24,6 +110,43 @@ class Config:
     WEATHER_PROVIDER_TIMEOUT_SECONDS = int(
         os.getenv("WEATHER_PROVIDER_TIMEOUT_SECONDS", "5")
     )
+    # Max locations per multi-location provider request (comma-separated latitude/longitude)
+    WEATHER_PROVIDER_BATCH_SIZE = int(
+        os.getenv("WEATHER_PROVIDER_BATCH_SIZE", "50")
+    )
+
+    # Weather cache (process-wide, keyed on quantized coordinates)
+    WEATHER_CACHE_TTL_SECONDS = int(
+        os.getenv("WEATHER_CACHE_TTL_SECONDS", "600")
+    )
+    WEATHER_CACHE_MAX_ENTRIES = int(
+        os.getenv("WEATHER_CACHE_MAX_ENTRIES", "10000")
+    )
+    # Decimal places kept when quantizing coordinates (2 ~= 1.1 km)
+    WEATHER_CACHE_COORD_PRECISION = int(
+        os.getenv("WEATHER_CACHE_COORD_PRECISION", "2")
+    )
+
+    # Background refresh scheduler (optional, in-process).
+    # Run it in a single process per deployment; every process that enables it polls independently.
+    REFRESH_SCHEDULER_ENABLED = os.getenv("REFRESH_SCHEDULER_ENABLED", "false").lower() == "true"
+    REFRESH_SCHEDULER_INTERVAL_SECONDS = int(
+        os.getenv("REFRESH_SCHEDULER_INTERVAL_SECONDS", "60")
+    )
+    # Zones whose data is older than this are eligible. Keep above WEATHER_CACHE_TTL_SECONDS.
+    REFRESH_SCHEDULER_MAX_AGE_SECONDS = int(
+        os.getenv("REFRESH_SCHEDULER_MAX_AGE_SECONDS", "1800")
+    )
+    REFRESH_SCHEDULER_BATCH_SIZE = int(
+        os.getenv("REFRESH_SCHEDULER_BATCH_SIZE", "500")
+    )
+    REFRESH_SCHEDULER_WORKERS = int(
+        os.getenv("REFRESH_SCHEDULER_WORKERS", "4")
+    )
+    # Global cap on upstream fetches started by the scheduler
+    REFRESH_SCHEDULER_RATE_PER_SECOND = float(
+        os.getenv("REFRESH_SCHEDULER_RATE_PER_SECOND", "5")
+    )
 
     # City Geocoding provider
     CITY_GEOCODING_BASE_URL = os.getenv(
@@ -31,4 +154,22 @@ class Config:
         "https://geocoding-api.open-meteo.com/v1/search"
     )
 
+    # City search backend: "open_meteo" (remote geocoding API) or "local" (offline gazetteer index)
+    CITY_SEARCH_BACKEND = os.getenv("CITY_SEARCH_BACKEND", "open_meteo").lower()
+    # GeoNames-style TSV (e.g. cities500.txt) used to build the local index
+    CITY_GAZETTEER_PATH = os.getenv("CITY_GAZETTEER_PATH")
+    # Persisted binary index, memory-mapped at startup; written after the first build when missing
+    CITY_GAZETTEER_INDEX_PATH = os.getenv("CITY_GAZETTEER_INDEX_PATH")
+    CITY_GAZETTEER_MIN_POPULATION = int(
+        os.getenv("CITY_GAZETTEER_MIN_POPULATION", "0")
+    )
+
+    # City search cache (normalized query -> results)
+    CITY_SEARCH_CACHE_TTL_SECONDS = int(
+        os.getenv("CITY_SEARCH_CACHE_TTL_SECONDS", "3600")
+    )
+    CITY_SEARCH_CACHE_MAX_ENTRIES = int(
+        os.getenv("CITY_SEARCH_CACHE_MAX_ENTRIES", "20000")
+    )
+
 
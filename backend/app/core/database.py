@@ -1,9 +1,16 @@
 import logging
 import re
-from contextlib import contextmanager
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Optional
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.schema import CreateColumn
+from app.core import metrics, query_accounting
 from app.core.config import Config
+from app.core.db_pool_metrics import PoolMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -72,39 +79,213 @@ def ensure_database_exists():
         raise  # Fail fast - no retries
 
 
-# Ensure database exists before creating engine (for MSSQL)
-if "sqlite" not in Config.DATABASE_URL:
-    ensure_database_exists()
+def engine_options(database_url: str) -> dict:
+    """Pool and driver options from Config for the given URL."""
+    options = {}
+    if "sqlite" in database_url:
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in database_url:
+            return options  # single shared connection, no pool to tune
+    options.update(
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING
+    )
+    if database_url.startswith("mssql+pyodbc"):
+        options["fast_executemany"] = Config.DB_FAST_EXECUTEMANY
+    return options
 
-# Create engine - database should exist now
-engine = create_engine(
-    Config.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in Config.DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engines are created on first use, so importing this module opens no connections and does no provisioning.
+# Sessions made before then are bound when the engine is created.
+engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+# The factory get_engine binds, held separately so that a swapped-in SessionLocal (tests) is never rebound
+_primary_sessions = SessionLocal
+pool_metrics = PoolMetrics()
+
+# Optional read replica for read-only request paths (see get_read_session)
+read_engine = None
+ReadSessionLocal = None
+read_pool_metrics = PoolMetrics()
+
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """The primary engine, created once per process on first use. Expects the database to be provisioned (init_db)."""
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                created = create_engine(Config.DATABASE_URL, **engine_options(Config.DATABASE_URL))
+                pool_metrics.attach(created)
+                query_accounting.attach(created)
+                _primary_sessions.configure(bind=created)
+                engine = created
+    return engine
+
+def _read_session_factory() -> Optional[sessionmaker]:
+    """Replica session factory, created on first use; None when DATABASE_READ_URL is unset."""
+    global read_engine, ReadSessionLocal
+    if ReadSessionLocal is None and Config.DATABASE_READ_URL:
+        with _engine_lock:
+            if ReadSessionLocal is None:
+                read_engine = create_engine(Config.DATABASE_READ_URL, **engine_options(Config.DATABASE_READ_URL))
+                read_pool_metrics.attach(read_engine)
+                query_accounting.attach(read_engine)
+                ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    return ReadSessionLocal
 
 Base = declarative_base()
 
+def _checkout(session: Session, metrics: PoolMetrics) -> None:
+    # Acquire the connection up front so time spent waiting on the pool is measured
+    started = time.perf_counter()
+    session.connection()
+    metrics.record_wait(time.perf_counter() - started)
+
+def _record_session(database: str, outcome: str, started: float) -> None:
+    metrics.db_session_duration.observe(time.perf_counter() - started, database=database)
+    metrics.db_sessions.inc(database=database, outcome=outcome)
+
 @contextmanager
 def get_session():
     """
     Request-scoped session context manager.
     Handles commit on success, rollback on error, and guaranteed closing.
     """
+    get_engine()
+    started = time.perf_counter()
+    outcome = "error"
     session = SessionLocal()
     try:
+        _checkout(session, pool_metrics)
         yield session
         session.commit()
+        outcome = "ok"
     except Exception as e:
         logger.error(f"Database session error, rolling back: {str(e)}")
         session.rollback()
         raise
     finally:
         session.close()
+        _record_session("primary", outcome, started)
+
+@contextmanager
+def _primary_or(primary: Optional[Session]):
+    if primary is not None:
+        yield primary
+        return
+    with get_session() as session:
+        yield session
+
+@contextmanager
+def get_read_session(
+    primary: Optional[Session] = None,
+    watermark: Optional[Callable[[Session], int]] = None,
+    expected: Optional[int] = None
+):
+    """
+    Read-only session on the replica (DATABASE_READ_URL). Nothing is committed.
+    Falls back to the primary when no replica is configured, or when the replica is behind: `watermark` reads a
+    counter that every relevant write increments, and the replica serves only once it has reached `expected`
+    (the value read on the primary). A caller already holding a primary session passes it as `primary`.
+    """
+    read_sessions = _read_session_factory()
+    if read_sessions is None:
+        with _primary_or(primary) as session:
+            yield session
+        return
+
+    started = time.perf_counter()
+    outcome = "error"
+    session = read_sessions()
+    try:
+        _checkout(session, read_pool_metrics)
+        if watermark is not None and expected is not None and watermark(session) < expected:
+            outcome = "behind"
+        else:
+            yield session
+            outcome = "ok"
+    finally:
+        session.rollback()
+        session.close()
+        _record_session("replica", outcome, started)
+
+    if outcome != "behind":
+        return
+    # The replica has not applied the latest write yet
+    with _primary_or(primary) as session:
+        yield session
+
+class WatermarkedRead:
+    """`value`: the watermark as read on the primary. `session()`: the read session, opened on first call."""
+    def __init__(self, value: int, open_session: Callable[[], Session]):
+        self.value = value
+        self._open_session = open_session
+        self._session: Optional[Session] = None
+
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = self._open_session()
+        return self._session
+
+@contextmanager
+def read_at_watermark(watermark: Callable[[Session], int]):
+    """
+    Read-your-writes routing across processes. `watermark` reads a counter that every relevant write increments
+    (e.g. `users.zones_version`). It is read once on the primary, which every process shares, so callers can answer
+    conditional requests from `value` alone; `session()` then opens the replica only if it has caught up with
+    `value` (the primary otherwise). Without a replica, a single primary session serves both.
+    """
+    with ExitStack() as stack:
+        read_sessions = _read_session_factory()
+        if read_sessions is None:
+            primary = stack.enter_context(get_session())
+            yield WatermarkedRead(watermark(primary), lambda: primary)
+            return
+
+        with get_session() as primary:
+            value = watermark(primary)
+        yield WatermarkedRead(
+            value, lambda: stack.enter_context(get_read_session(watermark=watermark, expected=value))
+        )
 
 def init_db():
-    """Explicitly create tables."""
+    """
+    Provisions the database: creates it if missing (MSSQL) and creates the tables. Idempotent.
+    Run once per deployment (`python -m app.cli init-db`), not on every process start.
+    """
     import app.models.user
     import app.models.zone
+    import app.models.refresh_token
+    import app.models.weather_reading
+    if "sqlite" not in Config.DATABASE_URL:
+        ensure_database_exists()
     print(f"Creating tables in: {Config.DATABASE_URL}")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+    add_missing_columns()
+
+def add_missing_columns() -> None:
+    """
+    Adds model columns (and their indexes) missing from tables created by an earlier release, such as
+    `users.zones_version`. `create_all` only creates whole tables. New columns need a server default
+    or must be nullable, so existing rows stay valid.
+    """
+    engine = get_engine()
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in present]
+            for column in missing:
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                logger.info(f"Adding column {table.name}.{column.name}")
+                connection.execute(text(f"ALTER TABLE {table.name} ADD {ddl}"))
+            if missing:
+                for index in table.indexes:
+                    index.create(bind=connection, checkfirst=True)
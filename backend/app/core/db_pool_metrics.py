@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class PoolMetrics:
+    """
+    Connection pool instrumentation fed by SQLAlchemy pool events plus checkout waits timed in `get_session`.
+    Keeps running counters and a window of recent waits (for percentiles); cheap enough to leave on.
+    """
+
+    WAIT_WINDOW = 2048
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits: Deque[float] = deque(maxlen=self.WAIT_WINDOW)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._sessions = 0
+        self._checkouts = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        # id(connection record) -> creation time, for connections currently owned by the pool
+        self._created_at: Dict[int, float] = {}
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine.pool, "connect", self._on_connect)
+        event.listen(engine.pool, "checkout", self._on_checkout)
+        event.listen(engine.pool, "checkin", self._on_checkin)
+        event.listen(engine.pool, "invalidate", self._on_invalidate)
+        event.listen(engine.pool, "close", self._on_close)
+        event.listen(engine.pool, "detach", self._on_close)
+
+    def record_wait(self, seconds: float) -> None:
+        """Time a request spent acquiring its connection (queueing for a free slot, connecting, pre-ping)."""
+        with self._lock:
+            self._sessions += 1
+            self._waits.append(seconds)
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    def snapshot(self, engine: Engine) -> Dict[str, Any]:
+        pool = engine.pool
+        now = time.monotonic()
+        with self._lock:
+            waits = sorted(self._waits)
+            ages = [now - created for created in self._created_at.values()]
+            stats = {
+                "pool_class": type(pool).__name__,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "connects": self._connects,
+                "invalidations": self._invalidations,
+                "checkout_wait_ms": {
+                    "sessions": self._sessions,
+                    "mean": round(self._wait_total / self._sessions * 1000, 3) if self._sessions else 0.0,
+                    "p50": _percentile_ms(waits, 0.50),
+                    "p95": _percentile_ms(waits, 0.95),
+                    "p99": _percentile_ms(waits, 0.99),
+                    "max": round(self._wait_max * 1000, 3),
+                },
+                "connection_age_seconds": {
+                    "open": len(ages),
+                    "oldest": round(max(ages), 1) if ages else 0.0,
+                    "mean": round(sum(ages) / len(ages), 1) if ages else 0.0,
+                },
+            }
+        # QueuePool exposes its own occupancy; other pool classes (e.g. SQLite in-memory) do not
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        return stats
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._connects += 1
+            self._created_at[id(connection_record)] = time.monotonic()
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self._invalidations += 1
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._created_at.pop(id(connection_record), None)
+
+def _percentile_ms(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
@@ -7,3 +7,5 @@ class WeatherProviderUnavailable(ServiceUnavailable):
 class CitySearchUnavailable(ServiceUnavailable):
     description = "City search temporarily unavailable"
 
+class PasswordHashingBusy(ServiceUnavailable):
+    description = "Too many concurrent sign-ins"
@@ -0,0 +1,90 @@
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+# Stored geohash length: 9 characters is a cell of about 4.8 x 4.8 m
+GEOHASH_PRECISION = 9
+# Most cells a proximity search may scan; coarser cells are used until the search area fits in this many
+MAX_COVERING_CELLS = 32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def _bits(precision: int) -> Tuple[int, int]:
+    """(latitude bits, longitude bits) of a geohash of `precision` characters; bits alternate starting with longitude."""
+    total = 5 * precision
+    return total // 2, (total + 1) // 2
+
+def _index(value: float, low: float, span: float, bits: int) -> int:
+    return min(int((value - low) / span * (1 << bits)), (1 << bits) - 1)
+
+def _cell(lat_index: int, lon_index: int, precision: int) -> str:
+    lat_bits, lon_bits = _bits(precision)
+    code = 0
+    for i in range(5 * precision):
+        if i % 2 == 0:
+            lon_bits -= 1
+            code = (code << 1) | ((lon_index >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            code = (code << 1) | ((lat_index >> lat_bits) & 1)
+    return "".join(_BASE32[(code >> shift) & 31] for shift in range(5 * (precision - 1), -1, -5))
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_bits, lon_bits = _bits(precision)
+    return _cell(_index(latitude, -90.0, 180.0, lat_bits), _index(longitude, -180.0, 360.0, lon_bits), precision)
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _successor(prefix: str) -> Optional[str]:
+    """Smallest geohash prefix sorting after every hash starting with `prefix` (`None` past the last cell)."""
+    while prefix:
+        position = _BASE32.index(prefix[-1])
+        if position < len(_BASE32) - 1:
+            return prefix[:-1] + _BASE32[position + 1]
+        prefix = prefix[:-1]
+    return None
+
+def covering_geohash_ranges(latitude: float, longitude: float, radius_km: float) -> List[Tuple[str, Optional[str]]]:
+    """
+    `[low, high)` geohash ranges (`high` None = unbounded) whose cells cover every point within `radius_km`.
+    Uses the finest precision where the circle's bounding box spans at most MAX_COVERING_CELLS cells;
+    adjacent cells are merged into one range. Matches still need an exact distance check.
+    """
+    # Bounding box of the circle on the sphere, handling the poles and the antimeridian
+    angular = radius_km / EARTH_RADIUS_KM
+    lat_min = max(-90.0, latitude - math.degrees(angular))
+    lat_max = min(90.0, latitude + math.degrees(angular))
+    if lat_min > -90.0 and lat_max < 90.0 and math.sin(angular) < math.cos(math.radians(latitude)):
+        half_width = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(latitude))))
+        west, east = longitude - half_width, longitude + half_width
+        if west < -180.0:
+            lon_spans = [(west + 360.0, 180.0), (-180.0, east)]
+        elif east > 180.0:
+            lon_spans = [(west, 180.0), (-180.0, east - 360.0)]
+        else:
+            lon_spans = [(west, east)]
+    else:
+        lon_spans = [(-180.0, 180.0)]
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits, lon_bits = _bits(precision)
+        lat_range = range(_index(lat_min, -90.0, 180.0, lat_bits), _index(lat_max, -90.0, 180.0, lat_bits) + 1)
+        lon_ranges = [
+            range(_index(west, -180.0, 360.0, lon_bits), _index(east, -180.0, 360.0, lon_bits) + 1)
+            for west, east in lon_spans
+        ]
+        if len(lat_range) * sum(len(r) for r in lon_ranges) <= MAX_COVERING_CELLS:
+            break
+
+    cells = sorted({_cell(lat_index, lon_index, precision) for lat_index in lat_range for r in lon_ranges for lon_index in r})
+    ranges: List[Tuple[str, Optional[str]]] = []
+    for cell in cells:
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1] = (ranges[-1][0], _successor(cell))
+        else:
+            ranges.append((cell, _successor(cell)))
+    return ranges
@@ -0,0 +1,128 @@
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.core.config import Config
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+class _CappedRetry(Retry):
+    """`Retry` that waits at most `max_retry_after` seconds for a Retry-After header (urllib3 waits as long as asked)."""
+
+    def __init__(self, *args, max_retry_after: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw) -> "_CappedRetry":
+        retry = super().new(**kw)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+class ProviderHttpClient:
+    """
+    Shared keep-alive HTTP client for external providers (weather, geocoding).
+    Keeps a connection pool per host so repeat calls skip the TCP/TLS handshake, asks for gzip,
+    and retries idempotent GETs on connection errors and 429/5xx with jittered exponential backoff.
+    A Retry-After header is honoured up to `max_retry_after` seconds, so an upstream asking for minutes cannot hold
+    the request thread (and every caller coalesced onto it) for that long.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        pool_size: int = Config.PROVIDER_HTTP_POOL_SIZE,
+        max_retries: int = Config.PROVIDER_HTTP_MAX_RETRIES,
+        backoff_factor: float = Config.PROVIDER_HTTP_BACKOFF_FACTOR,
+        backoff_jitter: float = Config.PROVIDER_HTTP_BACKOFF_JITTER,
+        max_retry_after: float = Config.PROVIDER_HTTP_MAX_RETRY_AFTER_SECONDS
+    ):
+        retry = _CappedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            max_retry_after=max_retry_after,
+            # Hand the final response back so callers keep using `raise_for_status`
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._failures = 0
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> requests.Response:
+        with self._lock:
+            self._requests += 1
+        try:
+            return self.session.get(url, params=params, timeout=timeout)
+        except requests.RequestException:
+            with self._lock:
+                self._failures += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters plus per-host pool usage (connections opened vs. requests served over them)."""
+        pools = {}
+        pool_manager = self._adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                # The queue is pre-filled with None placeholders; only real entries are open idle connections
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+                "max_size": pool.pool.maxsize if pool.pool is not None else 0,
+            }
+        with self._lock:
+            return {"requests": self._requests, "failures": self._failures, "pools": pools}
+
+    def close(self) -> None:
+        self.session.close()
+
+_client: Optional[ProviderHttpClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> ProviderHttpClient:
+    """Process-wide provider client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ProviderHttpClient()
+    return _client
+
+def _pool_stats(field: str) -> Dict[Tuple[str, ...], float]:
+    if _client is None:
+        return {}
+    return {(pool,): stats[field] for pool, stats in _client.stats()["pools"].items()}
+
+registry.collected(
+    "provider_http_connections_opened_total", "Provider connections opened, per host pool", ("pool",), "counter",
+    lambda: _pool_stats("connections_opened")
+)
+registry.collected(
+    "provider_http_pool_requests_total", "Provider requests sent over pooled connections, per host pool", ("pool",), "counter",
+    lambda: _pool_stats("requests")
+)
+registry.collected(
+    "provider_http_idle_connections", "Idle keep-alive provider connections, per host pool", ("pool",), "gauge",
+    lambda: _pool_stats("idle_connections")
+)
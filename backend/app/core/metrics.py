@@ -0,0 +1,308 @@
+import asyncio
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import requests
+from app.core.cache import TTLCache
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Counter:
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self.registry._add(self.name, _label_values(self.labelnames, labels), amount)
+
+class Histogram:
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self.registry._observe(self, _label_values(self.labelnames, labels), value)
+
+    @contextmanager
+    def time(self, **labels: Any):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+class CollectedMetric:
+    """
+    A counter or gauge read from another component's own bookkeeping when metrics are collected.
+    `read` returns {label values: value}; several sources may report under one metric.
+    """
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], kind: str):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.kind = kind
+        self.sources: List[Callable[[], Dict[Tuple[str, ...], float]]] = []
+
+    def read(self) -> Dict[Tuple[str, ...], float]:
+        values: Dict[Tuple[str, ...], float] = {}
+        for source in list(self.sources):
+            for labels, value in source().items():
+                values[labels] = values.get(labels, 0.0) + value
+        return values
+
+class MetricsRegistry:
+    """
+    In-process counters and latency histograms, rendered in the Prometheus text format.
+
+    With METRICS_MULTIPROC_DIR set, every process (e.g. each gunicorn worker) writes its snapshot to
+    `<dir>/metrics_<pid>.json` every METRICS_FLUSH_SECONDS and at exit; a scrape of any process sums all files,
+    so totals are correct for the whole deployment (lagging by at most one flush interval).
+    Files of exited processes are kept so their counts are not lost; clear the directory on deployment.
+    Gauges (current sizes, queue depths) are summed across the files the same way.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple[str, ...], float]] = {}
+        # name -> label values -> [per-bucket counts..., +Inf count, sum]
+        self._histograms: Dict[str, Dict[Tuple[str, ...], List[float]]] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_stop = threading.Event()
+        if hasattr(os, "register_at_fork"):
+            # A forked worker must not report what its parent recorded before the fork
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(self, self.prefix + name, documentation, tuple(labelnames))
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(self, self.prefix + name, documentation, tuple(labelnames), tuple(buckets))
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collected(self, name: str, documentation: str, labelnames: Iterable[str], kind: str, read: Callable[[], Dict[Tuple[str, ...], float]]) -> CollectedMetric:
+        """Adds `read` as a source of the `kind` ("counter" or "gauge") metric `name`, creating the metric on first use."""
+        metric = self._metrics.get(self.prefix + name)
+        if metric is None:
+            metric = self._metrics[self.prefix + name] = CollectedMetric(self.prefix + name, documentation, tuple(labelnames), kind)
+        metric.sources.append(read)
+        return metric
+
+    def register_cache(self, name: str, cache: TTLCache) -> None:
+        """Reports the cache's own counters (lookups, evictions, expirations) and current size, labelled `cache=name`."""
+        def requests() -> Dict[Tuple[str, ...], float]:
+            stats = cache.stats()
+            return {(name, "hit"): stats["hits"], (name, "miss"): stats["misses"]}
+
+        self.collected("cache_requests_total", "Lookups of the in-process caches by result", ("cache", "result"), "counter", requests)
+        self.collected("cache_evictions_total", "Entries evicted to stay within the cache size", ("cache",), "counter",
+                       lambda: {(name,): cache.stats()["evictions"]})
+        self.collected("cache_expirations_total", "Entries dropped on lookup after their TTL", ("cache",), "counter",
+                       lambda: {(name,): cache.stats()["expirations"]})
+        self.collected("cache_entries", "Entries currently held by the cache", ("cache",), "gauge", lambda: {(name,): len(cache)})
+
+    def register_singleflight(self, name: str, flight: Any) -> None:
+        """Reports a `SingleFlight`'s executions and callers coalesced onto an in-flight call, labelled `flight=name`."""
+        def calls() -> Dict[Tuple[str, ...], float]:
+            stats = flight.stats()
+            return {(name, "executed"): stats["executions"], (name, "coalesced"): stats["coalesced"]}
+
+        self.collected("singleflight_calls_total", "Deduplicated calls: run by a leader or coalesced onto its result", ("flight", "result"), "counter", calls)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """This process's values (JSON-serializable)."""
+        with self._lock:
+            counters = {name: [[list(k), v] for k, v in series.items()] for name, series in self._counters.items()}
+            histograms = {name: [[list(k), list(v)] for k, v in series.items()] for name, series in self._histograms.items()}
+        gauges: Dict[str, List[List[Any]]] = {}
+        for metric in list(self._metrics.values()):
+            if isinstance(metric, CollectedMetric):
+                target = counters if metric.kind == "counter" else gauges
+                target[metric.name] = [[list(k), v] for k, v in metric.read().items()]
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def collect(self) -> str:
+        """Prometheus text exposition: this process alone, or the whole deployment in multi-process mode."""
+        snapshot = self.snapshot()
+        directory = Config.METRICS_MULTIPROC_DIR
+        if not directory:
+            return self.render([snapshot])
+
+        self._write(directory, snapshot)
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+            try:
+                with open(path) as snapshot_file:
+                    snapshots.append(json.load(snapshot_file))
+            except (OSError, ValueError):
+                logger.warning(f"Skipping unreadable metrics file {path}")
+        return self.render(snapshots)
+
+    def render(self, snapshots: List[Dict[str, Any]]) -> str:
+        counters: Dict[str, Dict[Tuple[str, ...], float]] = {}
+        gauges: Dict[str, Dict[Tuple[str, ...], float]] = {}
+        histograms: Dict[str, Dict[Tuple[str, ...], List[float]]] = {}
+        for snapshot in snapshots:
+            for totals, key in ((counters, "counters"), (gauges, "gauges")):
+                for name, series in snapshot.get(key, {}).items():
+                    merged = totals.setdefault(name, {})
+                    for labels, value in series:
+                        merged[tuple(labels)] = merged.get(tuple(labels), 0.0) + value
+            for name, series in snapshot["histograms"].items():
+                merged = histograms.setdefault(name, {})
+                for labels, values in series:
+                    current = merged.setdefault(tuple(labels), [0.0] * len(values))
+                    merged[tuple(labels)] = [a + b for a, b in zip(current, values)]
+
+        lines = []
+        for kind, totals in (("counter", counters), ("gauge", gauges)):
+            for name, series in sorted(totals.items()):
+                metric = self._metrics[name]
+                lines.append(f"# HELP {name} {metric.documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")
+        for name, series in sorted(histograms.items()):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, values in sorted(series.items()):
+                cumulative = 0.0
+                for bound, count in zip((*metric.buckets, float("inf")), values):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(metric.labelnames, labels, le=le)} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(metric.labelnames, labels)} {_format_value(values[-1])}")
+                lines.append(f"{name}_count{_format_labels(metric.labelnames, labels)} {_format_value(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """Writes this process's snapshot for the other processes' scrapes (multi-process mode only)."""
+        if Config.METRICS_MULTIPROC_DIR:
+            self._write(Config.METRICS_MULTIPROC_DIR, self.snapshot())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _add(self, name: str, labels: Tuple[str, ...], amount: float) -> None:
+        self._ensure_flusher()
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def _observe(self, metric: Histogram, labels: Tuple[str, ...], value: float) -> None:
+        self._ensure_flusher()
+        index = len(metric.buckets)
+        for i, bound in enumerate(metric.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            values = self._histograms.setdefault(metric.name, {}).get(labels)
+            if values is None:
+                values = self._histograms[metric.name][labels] = [0.0] * (len(metric.buckets) + 2)
+            values[index] += 1
+            values[-1] += value
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or not Config.METRICS_MULTIPROC_DIR:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+                self._flusher.start()
+                atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        while not self._flush_stop.wait(Config.METRICS_FLUSH_SECONDS):
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Metrics flush failed: {e}")
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._flusher = None
+        self._flush_stop = threading.Event()
+
+    @staticmethod
+    def _write(directory: str, snapshot: Dict[str, Any]) -> None:
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        # Readers never see a half-written file
+        with open(path + ".tmp", "w") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        os.replace(path + ".tmp", path)
+
+def _label_values(labelnames: Tuple[str, ...], labels: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(str(labels[name]) for name in labelnames)
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], **extra: str) -> str:
+    pairs = [*zip(labelnames, values), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+registry = MetricsRegistry(prefix="weather_app_")
+
+http_requests = registry.counter("http_requests_total", "Requests by API operation and response status", ("operation", "status"))
+http_request_duration = registry.histogram("http_request_duration_seconds", "Request latency by API operation", ("operation",))
+upstream_requests = registry.counter("upstream_requests_total", "Provider calls by provider and outcome (2xx/4xx/5xx/timeout/error)", ("provider", "status"))
+upstream_request_duration = registry.histogram("upstream_request_duration_seconds", "Provider call latency, retries included", ("provider",))
+db_sessions = registry.counter("db_sessions_total", "Database sessions by database and outcome", ("database", "outcome"))
+db_session_duration = registry.histogram("db_session_duration_seconds", "Time a request holds a database session", ("database",))
+db_statements_per_request = registry.histogram(
+    "db_statements_per_request", "SQL statements executed per request", ("operation",), buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+db_time_per_request = registry.histogram("db_time_per_request_seconds", "Time spent executing SQL per request", ("operation",))
+
+@contextmanager
+def upstream_call(provider: str):
+    """
+    Times one provider call (retries included) and counts it by outcome: `2xx` when the block completes,
+    otherwise derived from the exception (HTTP errors by status class, timeouts, anything else as `error`).
+    """
+    status = "2xx"
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        status = _classify_failure(e)
+        raise
+    finally:
+        upstream_request_duration.observe(time.perf_counter() - started, provider=provider)
+        upstream_requests.inc(provider=provider, status=status)
+
+def _classify_failure(error: Exception) -> str:
+    # requests.HTTPError carries the response; ProviderRequestError (async client) carries the status
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "status", None)
+    if status:
+        return f"{int(status) // 100}xx"
+    if isinstance(error.__cause__ or error, (requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    return "error"
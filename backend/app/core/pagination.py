@@ -0,0 +1,26 @@
+import base64
+import binascii
+from typing import Optional
+from werkzeug.exceptions import BadRequest
+
+# Cursors are opaque to clients; the prefix lets the encoding change without misreading old cursors
+_CURSOR_PREFIX = "id:"
+
+def encode_cursor(last_id: int) -> str:
+    """Keyset cursor pointing just past `last_id`."""
+    return base64.urlsafe_b64encode(f"{_CURSOR_PREFIX}{last_id}".encode("ascii")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Returns the last ID seen, or `None` for the first page. Raises `BadRequest` on a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        if not raw.startswith(_CURSOR_PREFIX):
+            raise ValueError(raw)
+        last_id = int(raw[len(_CURSOR_PREFIX):])
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequest(description="Invalid pagination cursor")
+    if last_id < 0:
+        raise BadRequest(description="Invalid pagination cursor")
+    return last_id
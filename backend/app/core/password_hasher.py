@@ -0,0 +1,200 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from passlib.context import CryptContext
+from app.core.config import Config
+from app.core.metrics import registry
+from app.core.exceptions import PasswordHashingBusy
+
+logger = logging.getLogger(__name__)
+
+class Argon2Params(NamedTuple):
+    time_cost: int
+    memory_kib: int
+    parallelism: int
+
+@lru_cache(maxsize=8)
+def _context(params: Argon2Params) -> CryptContext:
+    # Built once per (process, params); hashes with other parameters are flagged for rehash on verify
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=params.time_cost,
+        argon2__memory_cost=params.memory_kib,
+        argon2__parallelism=params.parallelism
+    )
+
+# Worker-side entry points: module-level so the process pool can pickle them by reference
+def _hash(params: Argon2Params, password: str) -> str:
+    return _context(params).hash(password)
+
+def _verify_and_update(params: Argon2Params, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return _context(params).verify_and_update(password, hashed)
+
+def _noop() -> None:
+    return None
+
+class PasswordHasher:
+    """
+    Runs Argon2 hashing/verification on a dedicated, bounded process pool so that login bursts
+    neither hold the GIL nor occupy request threads beyond waiting on a future.
+    Callers block until their job completes; once `max_queue` jobs are pending, new ones are rejected
+    with `PasswordHashingBusy` (503) instead of piling up behind the pool.
+    The pool starts on the first hash/verify, so processes that never sign anyone in never start it.
+    `workers=0` hashes inline on the calling thread.
+    """
+
+    def __init__(
+        self,
+        params: Argon2Params,
+        workers: int = Config.PASSWORD_HASH_WORKERS,
+        max_queue: int = Config.PASSWORD_HASH_MAX_QUEUE
+    ):
+        self.params = params
+        self.workers = max(0, workers)
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    def start(self) -> None:
+        """Starts the worker processes now rather than on the first job (e.g. to keep it out of a latency budget)."""
+        if not self.workers or self._executor is not None:
+            return
+        with self._start_lock:
+            if self._executor is None:
+                # Started lazily, when request threads already exist: forking then could copy a lock held by
+                # another thread. The forkserver starts workers from a clean single-threaded process instead.
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+                executor.submit(_noop).result()
+                self._executor = executor
+                logger.info(f"Password hashing pool started ({self.workers} processes, {self.params})")
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, self.params, password)
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash). `new_hash` is set when `hashed` used other parameters and should be stored."""
+        return self._run(_verify_and_update, self.params, password, hashed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth (`in_flight` includes jobs waiting for a free process) and throughput counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "max_queue": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "busy_seconds": round(self._busy_seconds, 3),
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.max_queue and self._in_flight >= self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusy(description="Too many concurrent sign-ins. Please try again shortly.")
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        started = time.perf_counter()
+        try:
+            if not self.workers:
+                return fn(*args)
+            self.start()
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._busy_seconds += time.perf_counter() - started
+
+def calibrate(
+    target_ms: float,
+    memory_kib: int = Config.PASSWORD_HASH_MEMORY_KIB,
+    parallelism: int = Config.PASSWORD_HASH_PARALLELISM,
+    max_time_cost: int = 20
+) -> Argon2Params:
+    """Smallest time cost (at fixed memory) whose single hash takes at least `target_ms` on this machine."""
+    for time_cost in range(1, max_time_cost + 1):
+        params = Argon2Params(time_cost, memory_kib, parallelism)
+        started = time.perf_counter()
+        _hash(params, "calibration-password")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= target_ms:
+            break
+    logger.info(f"Calibrated Argon2 to {params} ({elapsed_ms:.0f} ms per hash, target {target_ms:.0f} ms)")
+    return params
+
+def configured_params() -> Argon2Params:
+    """
+    Parameters from Config, or calibrated when PASSWORD_HASH_TARGET_MS is set (at startup, see
+    `start_background_services`). Several server processes would each calibrate to their own time cost and rehash
+    each other's hashes, so the target is ignored when WEB_CONCURRENCY > 1: pin the CLI's result instead.
+    """
+    if Config.PASSWORD_HASH_TARGET_MS > 0:
+        if Config.WEB_CONCURRENCY <= 1:
+            return calibrate(Config.PASSWORD_HASH_TARGET_MS)
+        logger.warning(
+            "PASSWORD_HASH_TARGET_MS is ignored with WEB_CONCURRENCY > 1; "
+            "set PASSWORD_HASH_TIME_COST from `python -m app.core.password_hasher <ms>`"
+        )
+    return Argon2Params(Config.PASSWORD_HASH_TIME_COST, Config.PASSWORD_HASH_MEMORY_KIB, Config.PASSWORD_HASH_PARALLELISM)
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide hasher, created on first use."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(configured_params())
+    return _hasher
+
+def _hasher_series(series: Callable[[Dict[str, Any]], Dict[Tuple[str, ...], float]]) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    # Nothing to report until the process-wide hasher exists
+    return lambda: series(_hasher.stats()) if _hasher is not None else {}
+
+registry.collected(
+    "password_hash_jobs_total", "Password hash/verify jobs by result", ("result",), "counter",
+    _hasher_series(lambda stats: {("completed",): stats["completed"], ("rejected",): stats["rejected"]})
+)
+registry.collected(
+    "password_hash_busy_seconds_total", "Time callers spent in hash/verify jobs, queueing included", (), "counter",
+    _hasher_series(lambda stats: {(): stats["busy_seconds"]})
+)
+registry.collected(
+    "password_hash_in_flight", "Hash/verify jobs running or queued for a hashing process", (), "gauge",
+    _hasher_series(lambda stats: {(): stats["in_flight"]})
+)
+registry.collected(
+    "password_hash_workers", "Configured password hashing processes (0 = inline)", (), "gauge",
+    _hasher_series(lambda stats: {(): stats["workers"]})
+)
+
+if __name__ == "__main__":
+    # python -m app.core.password_hasher 250  ->  env values for a ~250 ms hash on this machine
+    import sys
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    calibrated = calibrate(target)
+    print(f"PASSWORD_HASH_TIME_COST={calibrated.time_cost}")
+    print(f"PASSWORD_HASH_MEMORY_KIB={calibrated.memory_kib}")
+    print(f"PASSWORD_HASH_PARALLELISM={calibrated.parallelism}")
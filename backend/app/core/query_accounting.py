@@ -0,0 +1,84 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MAX_CHARS = 2000
+
+class QueryStats:
+    """Statements executed and time spent in the database within one `track_queries` block."""
+
+    def __init__(self, label: str, parent: Optional["QueryStats"] = None, keep_statements: bool = False):
+        self.label = label
+        self.parent = parent
+        self.statements = 0
+        self.seconds = 0.0
+        # SQL text of every statement, for test failure messages (off in production)
+        self.executed: Optional[List[str]] = [] if keep_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.statements += 1
+            stats.seconds += seconds
+            if stats.executed is not None:
+                stats.executed.append(statement)
+            stats = stats.parent
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries(label: str, keep_statements: bool = False):
+    """
+    Counts statements run by any engine passed to `attach` within the block (this thread or task, and work
+    handed to executors with a copied context). Blocks nest: outer blocks include the inner ones' statements.
+    """
+    stats, token = begin(label, keep_statements)
+    try:
+        yield stats
+    finally:
+        end(token)
+
+def begin(label: str, keep_statements: bool = False) -> Tuple[QueryStats, Token]:
+    """`track_queries` for hook pairs (before/after request): pass the token to `end` in the same context."""
+    stats = QueryStats(label, parent=_current.get(), keep_statements=keep_statements)
+    return stats, _current.set(stats)
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+def attach(engine: Engine) -> None:
+    """Times every statement of `engine`: counted into the active `track_queries` block and logged when slow."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if Config.SLOW_QUERY_MS > 0 and elapsed * 1000 >= Config.SLOW_QUERY_MS:
+        label = stats.label if stats is not None else "-"
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms, {label}): {' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]}"
+            f" | params: {redact(parameters)}"
+        )
+
+def redact(parameters: Any) -> str:
+    """Parameter shapes without values (they may hold credentials or personal data)."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} rows of {redact(parameters[0])}"
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return f"<{type(parameters).__name__}>"
@@ -1,18 +1,40 @@
 
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import jwt
-from passlib.context import CryptContext
 from connexion.exceptions import OAuthProblem
+from app.core.cache import TTLCache
 from app.core.config import Config
+from app.core.metrics import registry
+from app.core.password_hasher import get_password_hasher
 
-# Password context setup
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Already-verified tokens (sha256 of the token -> payload), each kept until its own `exp`
+_verified_tokens = TTLCache(
+    max_entries=Config.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+registry.register_cache("access_token", _verified_tokens)
+
+def verify_internal_token(token: str, required_scopes=None) -> Optional[Dict[str, Any]]:
+    """
+    Checks the X-Internal-Token header of the /internal endpoints (x-apikeyInfoFunc).
+    Returns None (401) when the token is wrong or INTERNAL_API_TOKEN is unset.
+    """
+    expected = Config.INTERNAL_API_TOKEN
+    if not expected or not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
+        return None
+    return {"sub": "internal"}
 
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decodes the JWT token.
     Called by Connexion's security handler (x-bearerInfoFunc).
+    A token verified before is served from a digest-keyed cache until its `exp`; anything else
+    (new, tampered or expired tokens) goes through the full `jwt.decode`.
     
     Args:
         token (str): The Bearer token from the Authorization header.
@@ -23,18 +45,34 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         OAuthProblem: If token is invalid or expired (Connexion handles the 401).
     """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _verified_tokens.get(digest)
+    # The wall-clock check keeps `exp` authoritative even if the monotonic TTL and the clock drift apart
+    if cached is not None and cached["exp"] > time.time():
+        return dict(cached)
+
     try:
         payload = jwt.decode(
             token, 
             Config.SECRET_KEY, 
             algorithms=[Config.JWT_ALGORITHM]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         raise OAuthProblem(description='Token expired')
     except jwt.InvalidTokenError:
         raise OAuthProblem(description='Invalid token')
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _verified_tokens.set(digest, dict(payload), ttl_seconds=exp - time.time())
+    return payload
+
+def token_cache_stats() -> Dict[str, int]:
+    return _verified_tokens.stats()
+
+def clear_token_cache() -> None:
+    _verified_tokens.clear()
+
 def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a new JWT access token.
@@ -58,14 +96,36 @@ def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None)
     encoded_jwt = jwt.encode(to_encode, Config.SECRET_KEY, algorithm=Config.JWT_ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token() -> Tuple[str, str]:
+    """
+    Generates an opaque refresh token.
+    
+    Returns:
+        Tuple[str, str]: The token for the client and its SHA-256 hex digest for storage.
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Digest under which a refresh token is stored. A plain hash suffices: the token has 256 bits of entropy.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 def hash_password(password: str) -> str:
     """
-    Hashes a plaintext password.
+    Hashes a plaintext password (on the password hashing pool).
     """
-    return pwd_context.hash(password)
+    return get_password_hasher().hash(password)
 
 def check_password(password: str, hashed: str) -> bool:
     """
     Verifies a password against a hash.
     """
-    return pwd_context.verify(password, hashed)
+    return get_password_hasher().verify_and_update(password, hashed)[0]
+
+def verify_and_update_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, when the hash was made with outdated Argon2 parameters, returns a replacement hash.
+    """
+    return get_password_hasher().verify_and_update(password, hashed)
@@ -0,0 +1,25 @@
+import datetime
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+def _default(value: Any) -> Any:
+    # Same datetime rendering as Connexion's encoder: naive values are UTC and get a "Z" suffix
+    if isinstance(value, datetime.datetime):
+        return value.isoformat("T") if value.tzinfo else value.isoformat("T") + "Z"
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> bytes:
+    """
+    Compact JSON bytes for hot response paths, equivalent (after parsing) to what Connexion would emit.
+    Uses orjson when installed, the standard library otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+    return json.dumps(value, separators=(",", ":"), default=_default).encode("utf-8")
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+from typing import Optional
+from werkzeug.exceptions import BadRequest
+
+_BUCKET_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def parse_timestamp(value: Optional[str], name: str) -> Optional[datetime]:
+    """ISO 8601 query value as naive UTC (a value without offset is taken as UTC). Raises `BadRequest` when malformed."""
+    if not value:
+        return None
+    # fromisoformat only accepts the RFC 3339 "Z" suffix from Python 3.11 (the image runs 3.10)
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(description=f"Invalid `{name}` timestamp, expected ISO 8601")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def parse_bucket(value: Optional[str]) -> Optional[int]:
+    """Bucket width such as `15m`, `1h` or `1d`, in seconds. Raises `BadRequest` when malformed."""
+    if not value:
+        return None
+    unit = _BUCKET_UNITS.get(value[-1:])
+    if unit is None or not value[:-1].isdigit() or int(value[:-1]) <= 0:
+        raise BadRequest(description="Invalid `bucket`, expected minutes, hours or days such as 15m, 1h or 1d")
+    return int(value[:-1]) * unit
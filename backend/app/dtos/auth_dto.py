@@ -8,10 +8,14 @@ class UserLogin(BaseModel):
     username: str = Field(..., example="johndoe")
     password: str = Field(..., example="secret123")
 
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
 class AuthResponse(BaseModel):
     access_token: str
     token_type: str = Field("Bearer", example="Bearer")
     expires_in: int = Field(..., description="Token expiration in seconds", example=3600)
+    refresh_token: str = Field(..., description="Single-use token for POST /auth/refresh")
 
 class GenericMessage(BaseModel):
     message: str = Field(..., example="User created successfully")
@@ -1,6 +1,23 @@
 from datetime import datetime
+from typing import List
 from pydantic import BaseModel
 
 class WeatherData(BaseModel):
     temperature_celsius: float
     fetched_at: datetime
+    # True when served from the shared weather cache instead of a live provider call
+    from_cache: bool = False
+
+class WeatherHistoryPoint(BaseModel):
+    bucket_start: datetime
+    min_temperature: float
+    max_temperature: float
+    avg_temperature: float
+    readings: int
+
+class ZoneHistoryResponse(BaseModel):
+    zone_id: int
+    start: datetime
+    end: datetime
+    bucket_seconds: int
+    points: List[WeatherHistoryPoint]
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_serializer
 
 class ZoneCreate(BaseModel):
     name: str = Field(..., min_length=1, example="Home")
@@ -26,3 +26,27 @@ class ZoneResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ZoneListResponse(BaseModel):
+    items: List[ZoneResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
+class ZoneBulkRefreshRequest(BaseModel):
+    zone_ids: Optional[List[int]] = Field(None, max_length=500, description="Zones to refresh; all of the user's zones when omitted", example=[1, 2, 3])
+
+class ZoneRefreshResult(BaseModel):
+    zone_id: int
+    success: bool
+    zone: Optional[ZoneResponse] = None
+    error: Optional[str] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_absent_outcome(self, handler):
+        # Only one of `zone` / `error` applies to a given result; omit the other rather than emitting null.
+        data = handler(self)
+        return {k: v for k, v in data.items() if v is not None}
+
+class ZoneBulkRefreshResponse(BaseModel):
+    refreshed: int
+    failed: int
+    results: List[ZoneRefreshResult]
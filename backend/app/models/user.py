@@ -10,6 +10,8 @@ class User(Base):
     username = Column(String(255), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
+    # Bumped on every write to the user's zones; drives the ETags of zone reads
+    zones_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     zones = relationship("app.models.zone.Zone", back_populates="user")
 
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Index, Integer, PrimaryKeyConstraint
+from app.core.database import Base
+
+class WeatherReading(Base):
+    """Append-only weather history: one row per observation stored on a zone. Never updated."""
+    __tablename__ = "weather_readings"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", mssql_clustered=False),
+        # The only access path (one zone, time range). Clustered on MSSQL, so a range scan reads contiguous pages.
+        Index("ix_weather_readings_zone_time", "zone_id", "fetched_at", mssql_clustered=True),
+    )
+
+    # 64-bit on MSSQL (grows with every refresh); SQLite needs INTEGER for its rowid alias
+    id = Column(BigInteger().with_variant(Integer, "sqlite"))
+    zone_id = Column(Integer, ForeignKey("zones.id"), nullable=False)
+    # Naive UTC, like the provider's fetch time stored on the zone
+    fetched_at = Column(DateTime, nullable=False)
+    temperature = Column(Float, nullable=False)
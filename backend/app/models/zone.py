@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.core.enums import WeatherStatus
 
 class Zone(Base):
     __tablename__ = "zones"
+    __table_args__ = (
+        # Proximity search: one range seek per covering cell, within the tenant
+        Index("ix_zones_user_geohash", "user_id", "geohash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -12,6 +16,8 @@ class Zone(Base):
     country_code = Column(String(2), nullable=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Geohash of (latitude, longitude), kept in sync by ZoneService (app.core.geo.GEOHASH_PRECISION characters)
+    geohash = Column(String(12), nullable=True)
     # Caches the latest fetched weather data directly on the entity.
     # Manually invalidated when zone coordinates change or refreshed on demand.
     temperature = Column(Float, nullable=True)
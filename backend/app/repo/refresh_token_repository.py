@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from app.models.refresh_token import RefreshToken
+from app.repo.base_repository import BaseRepository
+
+class RefreshTokenRepository(BaseRepository):
+    """Persistence for refresh tokens. Looked up by token hash (not tenant-scoped: the token identifies the user)."""
+    def __init__(self, session: Session):
+        super().__init__(session)
+
+    def create(self, token: RefreshToken) -> RefreshToken:
+        self.session.add(token)
+        self.session.flush()
+        return token
+
+    def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Single unique-index lookup; this is the whole cost of verifying a refresh token."""
+        return self.session.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+
+    def revoke(self, token: RefreshToken, revoked_at: datetime) -> bool:
+        """Revokes one token if still active. Returns `False` when a concurrent request revoked it first."""
+        revoked = (
+            self.session.query(RefreshToken)
+            .filter(RefreshToken.id == token.id, RefreshToken.revoked_at.is_(None))
+            .update({RefreshToken.revoked_at: revoked_at}, synchronize_session=False)
+        )
+        self.session.flush()
+        return revoked == 1
+
+    def revoke_family(self, family_id: str, revoked_at: datetime) -> int:
+        """Revokes every still-active token of a sign-in. Returns the number of tokens revoked."""
+        revoked = (
+            self.session.query(RefreshToken)
+            .filter(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .update({RefreshToken.revoked_at: revoked_at}, synchronize_session=False)
+        )
+        self.session.flush()
+        return revoked
+
+    def purge_dead(self, now: datetime, limit: int) -> int:
+        """
+        Deletes up to `limit` tokens that can no longer be used or matter: expired ones, and every token of a sign-in
+        with no live token left (logged out, reuse-revoked or fully rotated out). Revoked tokens of a live sign-in stay,
+        since replaying one is what reveals a leak. Returns the number of tokens deleted.
+        """
+        live_families = select(RefreshToken.family_id).where(
+            RefreshToken.revoked_at.is_(None), RefreshToken.expires_at > now
+        )
+        dead_ids = (
+            select(RefreshToken.id)
+            .where(or_(RefreshToken.expires_at <= now, RefreshToken.family_id.not_in(live_families)))
+            .order_by(RefreshToken.id)
+            .limit(limit)
+        )
+        ids = list(self.session.scalars(dead_ids))
+        if not ids:
+            return 0
+        self.session.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+        return len(ids)
@@ -18,3 +18,7 @@ class UserRepository(BaseRepository):
         self.session.flush()
         self.session.refresh(user)
         return user
+
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """Replaces the stored hash by id (the identity may have been loaded from a read replica)."""
+        self.session.query(User).filter(User.id == user_id).update({User.password_hash: password_hash}, synchronize_session=False)
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from sqlalchemy import DateTime, Integer, Row, func, insert, literal, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from app.core.config import Config
+from app.models.weather_reading import WeatherReading
+from app.repo.base_repository import BaseRepository
+
+class seconds_between(FunctionElement):
+    """Whole seconds from one datetime expression to another, per dialect."""
+    type = Integer()
+    name = "seconds_between"
+    inherit_cache = True
+
+@compiles(seconds_between)
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(CAST(strftime('%s', {end}) AS INTEGER) - CAST(strftime('%s', {start}) AS INTEGER))"
+
+@compiles(seconds_between, "mssql")
+def _seconds_between_mssql(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    # DATEDIFF returns INT and fails past ~68 years of seconds (e.g. a history `from` of 1900-01-01); _BIG is BIGINT
+    return f"DATEDIFF_BIG(second, {start}, {end})"
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Readings are stored as naive UTC; aware values are converted, naive ones taken as UTC already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+class WeatherReadingRepository(BaseRepository):
+    """
+    Append-only weather history. Not user-scoped: callers resolve zone ownership first
+    (`ZoneService`) or are system jobs.
+    """
+    def __init__(self, session: Session):
+        super().__init__(session)
+
+    def add_many(self, readings: List[Dict[str, Any]]) -> int:
+        """Inserts `{zone_id, fetched_at, temperature}` rows as multi-row INSERTs of WEATHER_READINGS_INSERT_BATCH rows."""
+        batch_size = Config.WEATHER_READINGS_INSERT_BATCH
+        for start in range(0, len(readings), batch_size):
+            self.session.execute(insert(WeatherReading), readings[start:start + batch_size])
+        return len(readings)
+
+    def delete_for_zone(self, zone_id: int) -> None:
+        self.session.query(WeatherReading).filter(WeatherReading.zone_id == zone_id).delete(synchronize_session=False)
+
+    def get_buckets(self, zone_id: int, start: datetime, end: datetime, bucket_seconds: int) -> List[Row]:
+        """
+        Readings in [start, end) aggregated per `bucket_seconds` window counted from `start`, in the database:
+        (bucket index, min, max, avg temperature, readings) rows for non-empty buckets, in time order.
+        """
+        offset = seconds_between(literal(start, DateTime), WeatherReading.fetched_at)
+        # Grouped through a subquery: MSSQL rejects a parameterized GROUP BY expression repeated in the select list
+        samples = (
+            select((offset // bucket_seconds).label("bucket"), WeatherReading.temperature)
+            .where(
+                WeatherReading.zone_id == zone_id,
+                WeatherReading.fetched_at >= start,
+                WeatherReading.fetched_at < end,
+            )
+            .subquery()
+        )
+        query = (
+            select(
+                samples.c.bucket,
+                func.min(samples.c.temperature),
+                func.max(samples.c.temperature),
+                func.avg(samples.c.temperature),
+                func.count(),
+            )
+            .group_by(samples.c.bucket)
+            .order_by(samples.c.bucket)
+        )
+        return self.session.execute(query).all()
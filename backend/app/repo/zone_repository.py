@@ -1,7 +1,23 @@
-from typing import List, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import Row, Select, and_, bindparam, or_, select
 from sqlalchemy.orm import Session
+from app.models.user import User
 from app.models.zone import Zone
-from app.repo.base_repository import UserScopedRepository
+from app.repo.base_repository import BaseRepository, UserScopedRepository
+
+# Zone columns exposed by the API, in `ZoneResponse` field order
+ZONE_RESPONSE_COLUMNS = (
+    Zone.id,
+    Zone.name,
+    Zone.country_code,
+    Zone.latitude,
+    Zone.longitude,
+    Zone.temperature,
+    Zone.last_fetched_at,
+    Zone.weather_status,
+)
 
 class ZoneRepository(UserScopedRepository[Zone]):
     """Concrete implementation of user-scoped persistence. Guarantees all Zone interactions are strictly specific to the bound user."""
@@ -12,25 +28,129 @@ class ZoneRepository(UserScopedRepository[Zone]):
         """Persists new Zone. Forcibly sets `user_id` to repo scope to enforce ownership."""
         zone.user_id = self.user_id
         self.session.add(zone)
+        # Column defaults are applied in Python and the id comes back from the INSERT: no refresh SELECT needed
         self.session.flush()
-        self.session.refresh(zone)
+        self._record_write()
         return zone
 
     def get_by_id(self, zone_id: int) -> Optional[Zone]:
         """Resolves Zone entity. Returns `None` if ID doesn't exist OR belongs to another tenant."""
         return self._base_query(Zone).filter(Zone.id == zone_id).first()
 
-    def get_all(self) -> List[Zone]:
-        """Fetches entire collection for the tenant. Unpaginated."""
-        return self._base_query(Zone).all()
+    def get_all(self, limit: Optional[int] = None) -> List[Zone]:
+        """Fetches entire collection for the tenant, ordered by id. Unpaginated; `limit` caps the row count."""
+        return self._base_query(Zone).order_by(Zone.id).limit(limit).all()
+
+    def get_page_rows(self, after_id: Optional[int], limit: int) -> List[Row]:
+        """
+        Keyset page: up to `limit` Zones with `id > after_id`, ordered by id. Cost does not grow with page depth.
+        Returns plain `ZONE_RESPONSE_COLUMNS` tuples (no entities, no identity map): for read-only listings.
+        """
+        query = self.session.query(*ZONE_RESPONSE_COLUMNS).filter(Zone.user_id == self.user_id)
+        if after_id is not None:
+            query = query.filter(Zone.id > after_id)
+        return query.order_by(Zone.id).limit(limit).all()
+
+    def get_rows_in_geohash_ranges(self, ranges: List[Tuple[str, Optional[str]]]) -> List[Row]:
+        """`ZONE_RESPONSE_COLUMNS` rows of the tenant's zones whose geohash falls in any `[low, high)` range."""
+        if not ranges:
+            return []
+        params = {"user_id": self.user_id}
+        for i, (low, high) in enumerate(ranges):
+            params[f"low_{i}"] = low
+            params[f"high_{i}"] = high if high is not None else _GEOHASH_MAX
+        return self.session.execute(_geohash_ranges_query(len(ranges)), params).all()
+
+    def get_many(self, zone_ids: List[int]) -> List[Zone]:
+        """Resolves several owned Zones in one query. Unknown or foreign IDs are silently skipped."""
+        if not zone_ids:
+            return []
+        return self._base_query(Zone).filter(Zone.id.in_(zone_ids)).order_by(Zone.id).all()
 
     def update(self, zone: Zone) -> Zone:
         """Updates Zone entity (Full Update, not field-by-field)."""
         self.session.flush()
-        self.session.refresh(zone)
+        self._record_write()
         return zone
 
+    def update_many(self, zones: List[Zone]) -> List[Zone]:
+        """Writes back a set of modified Zones with a single flush (no per-row refresh)."""
+        self.session.flush()
+        if zones:
+            self._record_write()
+        return zones
+
     def delete(self, zone: Zone) -> None:
         """Deletes Zone entity."""
         self.session.delete(zone)
         self.session.flush()
+        self._record_write()
+
+    def _record_write(self) -> None:
+        """Invalidates the tenant's zone ETags; replica reads wait for the bumped version (read-your-writes)."""
+        _bump_zones_version(self.session, [self.user_id])
+
+    def get_version(self) -> int:
+        """The tenant's zone change counter (single primary-key lookup). Changes whenever any owned Zone is written."""
+        return self.session.query(User.zones_version).filter(User.id == self.user_id).scalar() or 0
+
+
+class ZoneMaintenanceRepository(BaseRepository):
+    """Cross-tenant Zone access for system jobs (background refresh). Never exposed to request handlers."""
+    def __init__(self, session: Session):
+        super().__init__(session)
+
+    def get_stalest(self, stale_before: datetime, limit: int) -> List[Zone]:
+        """Zones never fetched or fetched before `stale_before`, stalest first (NULLs sort first on SQLite and MSSQL)."""
+        return (
+            self.session.query(Zone)
+            .filter((Zone.last_fetched_at.is_(None)) | (Zone.last_fetched_at < stale_before))
+            .order_by(Zone.last_fetched_at.asc(), Zone.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def get_without_geohash(self, limit: int) -> List[Zone]:
+        """Zones created before geohashes were maintained, oldest first."""
+        return self.session.query(Zone).filter(Zone.geohash.is_(None)).order_by(Zone.id).limit(limit).all()
+
+    def get_by_ids(self, zone_ids: List[int]) -> List[Zone]:
+        if not zone_ids:
+            return []
+        return self.session.query(Zone).filter(Zone.id.in_(zone_ids)).all()
+
+    def update_many(self, zones: List[Zone]) -> List[Zone]:
+        """Writes back a set of modified Zones with a single flush."""
+        self.session.flush()
+        _bump_zones_version(self.session, {zone.user_id for zone in zones})
+        return zones
+
+# Sorts after every stored geohash (at most 12 base32 characters): upper bound of the last cell's range
+_GEOHASH_MAX = "z" * 13
+
+@lru_cache(maxsize=None)
+def _geohash_ranges_query(count: int) -> Select:
+    """
+    Candidate query for `count` geohash ranges, built once per count with bound parameters only (expression
+    building costs more than the indexed lookups). Each range repeats the tenant filter, so that it is
+    an independent seek on (user_id, geohash).
+    """
+    return select(*ZONE_RESPONSE_COLUMNS).where(or_(*(
+        and_(
+            Zone.user_id == bindparam("user_id"),
+            Zone.geohash >= bindparam(f"low_{i}"),
+            Zone.geohash < bindparam(f"high_{i}"),
+        )
+        for i in range(count)
+    )))
+
+def _bump_zones_version(session: Session, user_ids: Iterable[int]) -> None:
+    """Atomically increments `users.zones_version` in the current transaction, invalidating the owners' zone ETags."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    (
+        session.query(User)
+        .filter(User.id.in_(user_ids))
+        .update({User.zones_version: User.zones_version + 1}, synchronize_session=False)
+    )
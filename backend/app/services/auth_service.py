@@ -1,9 +1,20 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import BadRequest, Unauthorized
 from app.dtos.auth_dto import UserRegister, UserLogin, AuthResponse
+from app.models.refresh_token import RefreshToken
 from app.models.user import User
+from app.repo.refresh_token_repository import RefreshTokenRepository
 from app.repo.user_repository import UserRepository
-from app.core.security import hash_password, check_password, create_access_token
+from app.core.security import (
+    hash_password,
+    verify_and_update_password,
+    create_access_token,
+    create_refresh_token,
+    hash_refresh_token,
+)
 from app.core.config import Config
 
 import logging
@@ -11,8 +22,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 class AuthService:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, read_session: Optional[Session] = None):
         self.user_repo = UserRepository(session)
+        # Credential lookups may be served by a read replica; writes always go through `session`
+        use_reader = read_session is not None and read_session is not session
+        self.user_reader = UserRepository(read_session) if use_reader else self.user_repo
+        self.refresh_repo = RefreshTokenRepository(session)
 
     def register_user(self, dto: UserRegister) -> None:
         """Orchestrates user creation. Computes secure password hash before persistence to prevent plaintext exposure."""
@@ -25,16 +40,68 @@ class AuthService:
 
     def login_user(self, dto: UserLogin) -> AuthResponse:
         """Verifies credentials against stored hashes. Logs security events (failed attempts) for auditability."""
-        user = self.user_repo.get_by_username(dto.username)
-        if not user or not check_password(dto.password, user.password_hash):
+        user = self.user_reader.get_by_username(dto.username)
+        if user is None and self.user_reader is not self.user_repo:
+            # Freshly registered users may not have reached the replica yet
+            user = self.user_repo.get_by_username(dto.username)
+        valid, new_hash = verify_and_update_password(dto.password, user.password_hash) if user else (False, None)
+        if not valid:
             logger.warning(f"Failed login attempt for username: {dto.username}")
             raise Unauthorized(description="Invalid credentials")
+
+        if new_hash:
+            # Hash predates the current Argon2 parameters; upgrade it while the plaintext is at hand
+            self.user_repo.update_password_hash(user.id, new_hash)
+            logger.info(f"Rehashed password for user_id={user.id} with current parameters")
         
-        # Create Token
-        token = create_access_token(user_id=user.id)
         logger.info(f"Successful login for user_id={user.id}")
+        # Each sign-in starts a new refresh token family
+        return self._issue_tokens(user.id, family_id=secrets.token_hex(16))
+
+    def refresh_tokens(self, refresh_token: str) -> Optional[AuthResponse]:
+        """
+        Rotates a refresh token: the presented token is revoked and a new access/refresh pair is issued.
+        Costs one indexed lookup, no password hashing. Returns `None` when the token is rejected; the caller raises
+        after the session commits so that a reuse-triggered family revocation is kept.
+        """
+        now = _utcnow()
+        stored = self.refresh_repo.get_by_hash(hash_refresh_token(refresh_token))
+        if stored is None:
+            return None
+
+        if stored.revoked_at is not None:
+            # An already-rotated token came back: assume it leaked and end the whole sign-in
+            revoked = self.refresh_repo.revoke_family(stored.family_id, now)
+            logger.warning(f"Refresh token reuse for user_id={stored.user_id}; revoked {revoked} active token(s)")
+            return None
+
+        if stored.expires_at <= now or not self.refresh_repo.revoke(stored, now):
+            return None
+
+        return self._issue_tokens(stored.user_id, stored.family_id)
+
+    def logout(self, refresh_token: str) -> None:
+        """Revokes the sign-in the refresh token belongs to. Unknown tokens are ignored (logout is idempotent)."""
+        stored = self.refresh_repo.get_by_hash(hash_refresh_token(refresh_token))
+        if stored is not None:
+            self.refresh_repo.revoke_family(stored.family_id, _utcnow())
+            logger.info(f"Logged out refresh token family for user_id={stored.user_id}")
+
+    def _issue_tokens(self, user_id: int, family_id: str) -> AuthResponse:
+        refresh_token, token_hash = create_refresh_token()
+        self.refresh_repo.create(RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            family_id=family_id,
+            expires_at=_utcnow() + timedelta(days=Config.REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
         return AuthResponse(
-            access_token=token,
+            access_token=create_access_token(user_id=user_id),
             token_type="Bearer",
-            expires_in=Config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=Config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            refresh_token=refresh_token
         )
+
+def _utcnow() -> datetime:
+    # Naive UTC, matching the DateTime columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
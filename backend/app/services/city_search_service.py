@@ -1,67 +1,198 @@
 import logging
+import threading
 import requests
-from typing import List
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from app.dtos.city_dto import CitySearchResult
+from app.core.cache import TTLCache
 from app.core.config import Config
+from app.core.http_client import get_http_client
+from app.core.metrics import registry, upstream_call
 
 logger = logging.getLogger(__name__)
 
+class _CachedSearch(NamedTuple):
+    results: Tuple[CitySearchResult, ...]
+    # True when the provider returned fewer than MAX_RESULTS, i.e. nothing was cut off
+    complete: bool
+
+# Process-wide typeahead cache keyed on the normalized query
+_search_cache = TTLCache(
+    max_entries=Config.CITY_SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.CITY_SEARCH_CACHE_TTL_SECONDS
+)
+registry.register_cache("city_search", _search_cache)
+# Request threads answer from prefixes concurrently; the read-modify-write is guarded
+_prefix_hits = 0
+_prefix_hits_lock = threading.Lock()
+
 class CitySearchService:
     """
-    Stateless adapter for external geocoding providers.
-    Does not cache results; relies on upstream provider reliability.
+    Adapter for geocoding backends, selected by `CITY_SEARCH_BACKEND`.
+    The local backend answers from an offline gazetteer index with no external call.
+    The Open-Meteo backend caches results per normalized query (TTL + LRU); a longer query is answered locally
+    by filtering a cached shorter prefix whose result set was complete (not truncated at `MAX_RESULTS`).
     """
-    
+
     MAX_RESULTS = 5
     TIMEOUT_SECONDS = 5
-    
+    # Open-Meteo matches 1-2 character queries exactly, so shorter prefixes cannot be filtered down
+    MIN_PREFIX_REUSE_LENGTH = 3
+
     def search_cities(self, query: str) -> List[CitySearchResult]:
-        """Queries external API. Filters and sanitizes results to legally match expected DTO schema."""
+        """Serves typeahead queries from the cache when possible; otherwise queries the provider and caches the answer."""
         if not query or not query.strip():
             logger.warning("Empty search query provided")
             return []
-        
-        params = {
-            "name": query.strip(),
-            "count": self.MAX_RESULTS,
-            "language": "en",
-            "format": "json"
-        }
-        
+
+        if Config.CITY_SEARCH_BACKEND == "local":
+            # Already an in-memory lookup; nothing to gain from the query cache
+            from app.services.gazetteer_index import get_gazetteer_index
+            return get_gazetteer_index().search(query, self.MAX_RESULTS)
+
+        normalized = self.normalize_query(query)
+        cached = self._lookup_cache(normalized)
+        if cached is None:
+            cached = self._search_provider(query.strip())
+            if cached is None:
+                return []
+            _search_cache.set(normalized, cached)
+
+        return list(cached.results)
+
+    async def search_cities_async(self, query: str) -> List[CitySearchResult]:
+        """Async serving mode variant of `search_cities`: same backends and cache, non-blocking provider call."""
+        if not query or not query.strip():
+            logger.warning("Empty search query provided")
+            return []
+
+        if Config.CITY_SEARCH_BACKEND == "local":
+            from app.services.gazetteer_index import get_gazetteer_index
+            return get_gazetteer_index().search(query, self.MAX_RESULTS)
+
+        normalized = self.normalize_query(query)
+        cached = self._lookup_cache(normalized)
+        if cached is None:
+            cached = await self._search_provider_async(query.strip())
+            if cached is None:
+                return []
+            _search_cache.set(normalized, cached)
+
+        return list(cached.results)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case-folds and collapses whitespace so equivalent keystrokes share one cache entry."""
+        return " ".join(query.split()).casefold()
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        stats = _search_cache.stats()
+        with _prefix_hits_lock:
+            stats["prefix_hits"] = _prefix_hits
+        return stats
+
+    @staticmethod
+    def clear_cache() -> None:
+        global _prefix_hits
+        _search_cache.clear()
+        with _prefix_hits_lock:
+            _prefix_hits = 0
+
+    def _lookup_cache(self, normalized: str) -> Optional[_CachedSearch]:
+        """Exact cache hit, or an answer derived from a cached prefix (stored under `normalized` for next time)."""
+        cached = _search_cache.get(normalized)
+        if cached is None:
+            cached = self._answer_from_prefix(normalized)
+            if cached is not None:
+                _search_cache.set(normalized, cached)
+        return cached
+
+    def _answer_from_prefix(self, normalized: str) -> Optional[_CachedSearch]:
+        """Filters the longest cached, complete prefix result set down to names starting with `normalized`."""
+        global _prefix_hits
+        for length in range(len(normalized) - 1, self.MIN_PREFIX_REUSE_LENGTH - 1, -1):
+            prefix_result = _search_cache.peek(normalized[:length])
+            if prefix_result is None or not prefix_result.complete:
+                continue
+            matches = tuple(
+                city for city in prefix_result.results
+                if self.normalize_query(city.name).startswith(normalized)
+            )
+            with _prefix_hits_lock:
+                _prefix_hits += 1
+            logger.debug(f"Answered '{normalized}' from cached prefix '{normalized[:length]}'")
+            return _CachedSearch(results=matches, complete=True)
+        return None
+
+    def _search_provider(self, query: str) -> Optional[_CachedSearch]:
+        """Queries external API. Filters and sanitizes results to legally match expected DTO schema. Returns `None` on a malformed answer."""
         try:
             logger.debug(f"Searching cities with query: {query}")
-            response = requests.get(
-                Config.CITY_GEOCODING_BASE_URL,
-                params=params,
-                timeout=self.TIMEOUT_SECONDS
-            )
-            response.raise_for_status()
-            
+            with upstream_call("geocoding"):
+                response = get_http_client().get(
+                    Config.CITY_GEOCODING_BASE_URL,
+                    params=self._provider_params(query),
+                    timeout=self.TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+
             data = response.json()
             logger.info(f"City search successful for query: {query}")
-            
-            # Open-Meteo returns results in 'results' array
-            if "results" not in data or not data["results"]:
-                logger.debug(f"No results found for query: {query}")
-                return []
-            
-            # Map API response to our DTOs
-            cities = []
-            for result in data["results"][:self.MAX_RESULTS]:
-                cities.append(CitySearchResult(
-                    name=result.get("name", ""),
-                    country_code=result.get("country_code", None),
-                    latitude=float(result.get("latitude", 0)),
-                    longitude=float(result.get("longitude", 0))
-                ))
-            
-            logger.debug(f"Returning {len(cities)} city results")
-            return cities
-            
+            return self._parse_provider_results(query, data)
+
         except requests.RequestException as e:
             logger.warning("City search provider unavailable", exc_info=e)
             from app.core.exceptions import CitySearchUnavailable
             raise CitySearchUnavailable("City search is temporarily unavailable. Please try again later.")
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Invalid response format from geocoding API: {str(e)}")
-            return []
+            return None
+
+    async def _search_provider_async(self, query: str) -> Optional[_CachedSearch]:
+        """Non-blocking provider call on the shared async client. Same error contract as `_search_provider`."""
+        from app.core.aio_http_client import ProviderRequestError, get_async_http_client
+        try:
+            logger.debug(f"Searching cities (async) with query: {query}")
+            with upstream_call("geocoding"):
+                data = await get_async_http_client().get_json(
+                    Config.CITY_GEOCODING_BASE_URL,
+                    params=self._provider_params(query),
+                    timeout=self.TIMEOUT_SECONDS
+                )
+            logger.info(f"City search successful for query: {query}")
+            return self._parse_provider_results(query, data)
+
+        except ProviderRequestError as e:
+            logger.warning("City search provider unavailable", exc_info=e)
+            from app.core.exceptions import CitySearchUnavailable
+            raise CitySearchUnavailable("City search is temporarily unavailable. Please try again later.")
+        except (KeyError, ValueError, TypeError) as e:
+            logger.error(f"Invalid response format from geocoding API: {str(e)}")
+            return None
+
+    def _provider_params(self, query: str) -> Dict[str, Any]:
+        return {
+            "name": query,
+            "count": self.MAX_RESULTS,
+            "language": "en",
+            "format": "json"
+        }
+
+    def _parse_provider_results(self, query: str, data: Dict[str, Any]) -> _CachedSearch:
+        # Open-Meteo returns results in 'results' array
+        if "results" not in data or not data["results"]:
+            logger.debug(f"No results found for query: {query}")
+            return _CachedSearch(results=(), complete=True)
+
+        # Map API response to our DTOs
+        cities = []
+        for result in data["results"][:self.MAX_RESULTS]:
+            cities.append(CitySearchResult(
+                name=result.get("name", ""),
+                country_code=result.get("country_code", None),
+                latitude=float(result.get("latitude", 0)),
+                longitude=float(result.get("longitude", 0))
+            ))
+
+        logger.debug(f"Returning {len(cities)} city results")
+        return _CachedSearch(results=tuple(cities), complete=len(data["results"]) < self.MAX_RESULTS)
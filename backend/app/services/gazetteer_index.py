@@ -0,0 +1,295 @@
+import bisect
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.config import Config
+from app.dtos.city_dto import CitySearchResult
+
+logger = logging.getLogger(__name__)
+
+# File layout: little-endian header, then 12 sections (8-byte aligned). The arrays are in the byte order of the
+# host that built the index (memoryview.cast reads native order only), recorded in the header and checked on load.
+#   lat f32[n] | lon f32[n] | population u32[n] | country 2 bytes[n] | name_offsets u32[n+1] | name_blob
+#   key_offsets u32[k+1] | key_blob (sorted, normalized, UTF-8) | key_records u32[k]
+#   prefix_offsets u32[p+1] | prefix_blob (sorted) | top_offsets u32[p+1] | top_records u32[]  (see _TOP_PREFIX_CHARS)
+_MAGIC = b"GZX4"
+_BYTE_ORDER = sys.byteorder.encode("ascii")[:1]
+_HEADER = struct.Struct("<4scxxxIII13Q")
+
+# Short prefixes match a large share of all names, so their most populous records are ranked at build time:
+# up to _TOP_K records per prefix of at most _TOP_PREFIX_CHARS characters. So is every longer prefix matching more
+# than _RANGE_SCAN_MAX keys ("sant", "new y"); any other prefix ranks its matching key range, at most that many keys.
+_TOP_PREFIX_CHARS = 3
+_TOP_K = 16
+_RANGE_SCAN_MAX = 256
+
+# GeoNames TSV columns (https://download.geonames.org/export/dump/readme.txt)
+_COL_NAME, _COL_ASCIINAME, _COL_LAT, _COL_LON, _COL_FEATURE_CLASS, _COL_COUNTRY, _COL_POPULATION = 1, 2, 4, 5, 6, 8, 14
+
+def normalize_name(name: str) -> str:
+    """Same normalization as the city search cache: case-folded, whitespace collapsed."""
+    return " ".join(name.split()).casefold()
+
+class _KeyView:
+    """Sequence view over the sorted key blob. Compares raw UTF-8 bytes (same order as code points)."""
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+class GazetteerIndex:
+    """
+    Compact, read-only prefix index over a GeoNames-style gazetteer.
+    Names are stored as sorted UTF-8 keys with parallel typed arrays, so the same buffer works
+    whether it was just built in memory or memory-mapped from a persisted index file.
+    Lookups are a binary search: short and crowded prefixes read their precomputed population top-k, others rank
+    the (small) matching key range.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        magic, byte_order, n, k, p, *offsets = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a gazetteer index file (or one from an older release; delete it to rebuild)")
+        if byte_order != _BYTE_ORDER:
+            raise ValueError("Gazetteer index was built on a host with a different byte order; rebuild it here")
+
+        def section(i: int, length: int, fmt: Optional[str] = None):
+            chunk = view[offsets[i]:offsets[i] + length]
+            return chunk.cast(fmt) if fmt else chunk
+
+        self._buffer = buffer
+        self.size = n
+        self.key_count = k
+        self._lat = section(0, 4 * n, "f")
+        self._lon = section(1, 4 * n, "f")
+        self._population = section(2, 4 * n, "I")
+        self._country = section(3, 2 * n)
+        self._name_offsets = section(4, 4 * (n + 1), "I")
+        self._names = section(5, self._name_offsets[n])
+        key_offsets = section(6, 4 * (k + 1), "I")
+        self._keys = _KeyView(key_offsets, section(7, key_offsets[k]))
+        self._key_records = section(8, 4 * k, "I")
+        prefix_offsets = section(9, 4 * (p + 1), "I")
+        self._prefixes = _KeyView(prefix_offsets, section(10, prefix_offsets[p]))
+        self._top_offsets = section(11, 4 * (p + 1), "I")
+        self._top_records = section(12, 4 * self._top_offsets[p], "I")
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, float, float, int, Optional[str]]]) -> "GazetteerIndex":
+        """Builds an in-memory index from (name, ascii_name, latitude, longitude, population, country_code) rows."""
+        return cls(cls._serialize(rows))
+
+    @classmethod
+    def from_geonames(cls, path: str, min_population: int = 0) -> "GazetteerIndex":
+        """Parses a GeoNames dump (e.g. cities500.txt), keeping populated places (feature class P)."""
+        def rows():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    cols = line.rstrip("\n").split("\t")
+                    if len(cols) <= _COL_POPULATION or cols[_COL_FEATURE_CLASS] not in ("P", ""):
+                        continue
+                    try:
+                        population = int(cols[_COL_POPULATION] or 0)
+                        lat, lon = float(cols[_COL_LAT]), float(cols[_COL_LON])
+                    except ValueError:
+                        continue
+                    if population < min_population:
+                        continue
+                    yield cols[_COL_NAME], cols[_COL_ASCIINAME], lat, lon, population, cols[_COL_COUNTRY] or None
+        return cls.build(rows())
+
+    @classmethod
+    def load(cls, path: str) -> "GazetteerIndex":
+        """Memory-maps a persisted index. Pages are loaded lazily by the OS, so startup is near-instant."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._buffer)
+        os.replace(tmp_path, path)
+
+    def search(self, query: str, limit: int) -> List[CitySearchResult]:
+        """Cities whose name starts with `query`, most populous first."""
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        prefix = normalized.encode("utf-8")
+        if len(normalized) <= _TOP_PREFIX_CHARS and limit <= _TOP_K:
+            return self._ranked_top(prefix, limit)
+
+        lo = bisect.bisect_left(self._keys, prefix)
+        # 0xFF never occurs in UTF-8, so it sorts after every key sharing the prefix
+        hi = bisect.bisect_left(self._keys, prefix + b"\xff", lo)
+        if hi - lo > _RANGE_SCAN_MAX and limit <= _TOP_K:
+            # Crowded prefixes were ranked at build time (see _crowded_prefix_candidates)
+            return self._ranked_top(prefix, limit)
+
+        population = self._population
+        records = self._key_records
+        seen = set()
+        results = []
+        # Over-fetch to absorb records matched through both their name and ascii name
+        for i in heapq.nlargest(2 * limit, range(lo, hi), key=lambda i: population[records[i]]):
+            record = records[i]
+            if record in seen:
+                continue
+            seen.add(record)
+            results.append(self._result(record))
+            if len(results) == limit:
+                break
+        return results
+
+    def _ranked_top(self, prefix: bytes, limit: int) -> List[CitySearchResult]:
+        # Every short and every crowded prefix is listed, so a missing prefix means no match
+        i = bisect.bisect_left(self._prefixes, prefix)
+        if i == len(self._prefixes) or self._prefixes[i] != prefix:
+            return []
+        start, end = self._top_offsets[i], self._top_offsets[i + 1]
+        return [self._result(record) for record in self._top_records[start:min(end, start + limit)]]
+
+    def _result(self, record: int) -> CitySearchResult:
+        name = bytes(self._names[self._name_offsets[record]:self._name_offsets[record + 1]]).decode("utf-8")
+        country = bytes(self._country[2 * record:2 * record + 2]).decode("ascii").strip() or None
+        return CitySearchResult(
+            name=name,
+            country_code=country,
+            latitude=round(self._lat[record], 4),
+            longitude=round(self._lon[record], 4)
+        )
+
+    @staticmethod
+    def _serialize(rows: Iterable[Tuple[str, str, float, float, int, Optional[str]]]) -> bytes:
+        lat, lon, population = array("f"), array("f"), array("I")
+        country = bytearray()
+        name_offsets, name_blob = array("I", [0]), bytearray()
+        keys: List[Tuple[bytes, int]] = []
+        prefix_candidates: Dict[str, List[Tuple[int, int]]] = {}
+
+        for name, ascii_name, latitude, longitude, pop, country_code in rows:
+            record = len(lat)
+            lat.append(latitude)
+            lon.append(longitude)
+            population.append(max(0, min(pop, 0xFFFFFFFF)))
+            country += (country_code or "").encode("ascii", "replace")[:2].ljust(2)
+            name_blob += name.encode("utf-8")
+            name_offsets.append(len(name_blob))
+            record_keys = {key for key in (normalize_name(name), normalize_name(ascii_name or "")) if key}
+            for key in record_keys:
+                keys.append((key.encode("utf-8"), record))
+            # A normalized query never ends in a space, so such prefixes are never looked up
+            short_prefixes = {key[:length] for key in record_keys for length in range(1, _TOP_PREFIX_CHARS + 1)}
+            for short_prefix in short_prefixes:
+                if not short_prefix.endswith(" "):
+                    prefix_candidates.setdefault(short_prefix, []).append((population[record], record))
+
+        keys.sort()
+        key_offsets, key_blob, key_records = array("I", [0]), bytearray(), array("I")
+        for key, record in keys:
+            key_blob += key
+            key_offsets.append(len(key_blob))
+            key_records.append(record)
+        prefix_candidates.update(_crowded_prefix_candidates(keys, population))
+
+        prefix_offsets, prefix_blob = array("I", [0]), bytearray()
+        top_offsets, top_records = array("I", [0]), array("I")
+        for short_prefix in sorted(prefix_candidates, key=lambda prefix: prefix.encode("utf-8")):
+            prefix_blob += short_prefix.encode("utf-8")
+            prefix_offsets.append(len(prefix_blob))
+            # Most populous first, ties in record order
+            top = heapq.nsmallest(_TOP_K, prefix_candidates[short_prefix], key=lambda c: (-c[0], c[1]))
+            top_records.extend(record for _, record in top)
+            top_offsets.append(len(top_records))
+
+        sections = [
+            lat.tobytes(), lon.tobytes(), population.tobytes(), bytes(country),
+            name_offsets.tobytes(), bytes(name_blob),
+            key_offsets.tobytes(), bytes(key_blob), key_records.tobytes(),
+            prefix_offsets.tobytes(), bytes(prefix_blob), top_offsets.tobytes(), top_records.tobytes()
+        ]
+        body = bytearray()
+        offsets = []
+        for data in sections:
+            start = _HEADER.size + len(body)
+            padding = (-start) % 8
+            body += b"\0" * padding
+            offsets.append(_HEADER.size + len(body))
+            body += data
+        header = _HEADER.pack(_MAGIC, _BYTE_ORDER, len(lat), len(key_records), len(prefix_offsets) - 1, *offsets)
+        return header + bytes(body)
+
+def _crowded_prefix_candidates(keys: List[Tuple[bytes, int]], population) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    (population, record) candidates of each prefix longer than _TOP_PREFIX_CHARS that matches more than
+    _RANGE_SCAN_MAX of the sorted `keys`. Keys sharing a prefix are adjacent, so each length only splits
+    the ranges that were still crowded one character shorter.
+    """
+    texts = [key.decode("utf-8") for key, _ in keys]
+    candidates: Dict[str, List[Tuple[int, int]]] = {}
+    ranges = [(0, len(keys))]
+    length = 0
+    while ranges:
+        length += 1
+        crowded = []
+        for lo, hi in ranges:
+            start = lo
+            while start < hi:
+                prefix = texts[start][:length]
+                end = start + 1
+                while end < hi and texts[end][:length] == prefix:
+                    end += 1
+                # A key shorter than `length` ends its own run (matched by the shorter prefix already)
+                if end - start > _RANGE_SCAN_MAX and len(prefix) == length:
+                    crowded.append((start, end))
+                    if length > _TOP_PREFIX_CHARS and not prefix.endswith(" "):
+                        records = {keys[i][1] for i in range(start, end)}
+                        candidates[prefix] = [(population[record], record) for record in records]
+                start = end
+        ranges = crowded
+    return candidates
+
+_index: Optional[GazetteerIndex] = None
+_index_lock = threading.Lock()
+
+def get_gazetteer_index() -> GazetteerIndex:
+    """
+    Process-wide index, loaded once. Memory-maps `CITY_GAZETTEER_INDEX_PATH` when it exists; otherwise builds
+    from the `CITY_GAZETTEER_PATH` TSV and persists to `CITY_GAZETTEER_INDEX_PATH` (if set) for the next start.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _load_configured_index()
+    return _index
+
+def _load_configured_index() -> GazetteerIndex:
+    index_path = Config.CITY_GAZETTEER_INDEX_PATH
+    if index_path and os.path.exists(index_path):
+        index = GazetteerIndex.load(index_path)
+        logger.info(f"Loaded gazetteer index from {index_path} ({index.size} places)")
+        return index
+
+    if not Config.CITY_GAZETTEER_PATH:
+        raise ValueError("CITY_SEARCH_BACKEND=local requires CITY_GAZETTEER_PATH or an existing CITY_GAZETTEER_INDEX_PATH")
+
+    index = GazetteerIndex.from_geonames(Config.CITY_GAZETTEER_PATH, Config.CITY_GAZETTEER_MIN_POPULATION)
+    logger.info(f"Built gazetteer index from {Config.CITY_GAZETTEER_PATH} ({index.size} places, {index.key_count} names)")
+    if index_path:
+        index.save(index_path)
+        logger.info(f"Persisted gazetteer index to {index_path}")
+    return index
@@ -0,0 +1,170 @@
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from app.core.config import Config
+from app.core.database import get_session
+from app.core.enums import WeatherStatus
+from app.core.exceptions import WeatherProviderUnavailable
+from app.core.rate_limiter import TokenBucket
+from app.dtos.weather_dto import WeatherData
+from app.repo.weather_reading_repository import WeatherReadingRepository, to_utc_naive
+from app.repo.zone_repository import ZoneMaintenanceRepository
+from app.services.weather_service import WeatherService
+from app.services.zone_service import weather_reading
+
+logger = logging.getLogger(__name__)
+
+class _LocationGroup:
+    """All stale zones (across tenants) sharing one weather cache key."""
+    def __init__(self, latitude: float, longitude: float, last_fetched_at: Optional[datetime]):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.last_fetched_at = last_fetched_at
+        self.zone_ids: List[int] = []
+
+class RefreshScheduler:
+    """
+    Background, staleness-driven weather refresh.
+    Each tick picks the stalest zones by `last_fetched_at`, collapses identical locations across tenants,
+    and fetches them stalest-first on a bounded worker pool behind a global rate limit.
+    Upstream calls happen outside any DB session; results are written back in one transaction per tick.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = Config.REFRESH_SCHEDULER_INTERVAL_SECONDS,
+        max_age_seconds: float = Config.REFRESH_SCHEDULER_MAX_AGE_SECONDS,
+        batch_size: int = Config.REFRESH_SCHEDULER_BATCH_SIZE,
+        workers: int = Config.REFRESH_SCHEDULER_WORKERS,
+        rate_per_second: float = Config.REFRESH_SCHEDULER_RATE_PER_SECOND
+    ):
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self._limiter = TokenBucket(rate_per_second)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-refresh-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Refresh scheduler started (interval={self.interval_seconds}s, max_age={self.max_age_seconds}s, "
+            f"workers={self.workers}, rate={self._limiter.rate_per_second}/s)"
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> int:
+        """Runs a single tick. Returns the number of zones refreshed."""
+        groups = self._load_stale_groups()
+        if not groups:
+            return 0
+
+        # Priority queue: stalest location first (never fetched before anything else)
+        queue: List[Tuple[datetime, int, Tuple[float, float]]] = [
+            (group.last_fetched_at or datetime.min, seq, key)
+            for seq, (key, group) in enumerate(groups.items())
+        ]
+        heapq.heapify(queue)
+
+        weather_service = WeatherService()
+        results: Dict[Tuple[float, float], WeatherData] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="weather-refresh") as executor:
+            futures = {}
+            while queue and not self._stop.is_set():
+                _, _, key = heapq.heappop(queue)
+                if not self._limiter.acquire(self._stop):
+                    break
+                group = groups[key]
+                futures[executor.submit(weather_service.fetch_current_weather, group.latitude, group.longitude)] = key
+
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except WeatherProviderUnavailable:
+                    logger.warning(f"Scheduled refresh failed for location {key}")
+
+        refreshed = self._write_results(groups, results)
+        logger.info(f"Scheduled refresh: {refreshed} zones over {len(results)}/{len(groups)} locations")
+        return refreshed
+
+    def _load_stale_groups(self) -> Dict[Tuple[float, float], _LocationGroup]:
+        stale_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.max_age_seconds)
+        groups: Dict[Tuple[float, float], _LocationGroup] = {}
+        with get_session() as session:
+            zones = ZoneMaintenanceRepository(session).get_stalest(stale_before, self.batch_size)
+            for zone in zones:
+                key = WeatherService.cache_key(zone.latitude, zone.longitude)
+                group = groups.get(key)
+                if group is None:
+                    # Zones arrive stalest first, so the first zone of a group carries its priority
+                    group = groups[key] = _LocationGroup(zone.latitude, zone.longitude, zone.last_fetched_at)
+                group.zone_ids.append(zone.id)
+        return groups
+
+    def _write_results(
+        self, groups: Dict[Tuple[float, float], _LocationGroup], results: Dict[Tuple[float, float], WeatherData]
+    ) -> int:
+        zone_ids = [zone_id for key in results for zone_id in groups[key].zone_ids]
+        if not zone_ids:
+            return 0
+        with get_session() as session:
+            repo = ZoneMaintenanceRepository(session)
+            zones = repo.get_by_ids(zone_ids)
+            updated = []
+            readings = []
+            for zone in zones:
+                # Skip zones moved by their owner since the stale read
+                weather_data = results.get(WeatherService.cache_key(zone.latitude, zone.longitude))
+                if weather_data is None:
+                    continue
+                reading = weather_reading(zone, weather_data)
+                if reading is not None:
+                    readings.append(reading)
+                zone.temperature = weather_data.temperature_celsius
+                zone.last_fetched_at = to_utc_naive(weather_data.fetched_at)
+                zone.weather_status = WeatherStatus.CACHED if weather_data.from_cache else WeatherStatus.FRESH
+                updated.append(zone)
+            repo.update_many(updated)
+            WeatherReadingRepository(session).add_many(readings)
+            return len(updated)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Refresh scheduler tick failed: {type(e).__name__}: {str(e)}", exc_info=True)
+            self._stop.wait(self.interval_seconds)
+
+_scheduler: Optional[RefreshScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def start_refresh_scheduler() -> RefreshScheduler:
+    """Starts the process-wide scheduler once. Safe to call repeatedly."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler()
+        _scheduler.start()
+        return _scheduler
+
+def stop_refresh_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.stop()
+            _scheduler = None
@@ -1,16 +1,176 @@
 import logging
 import requests
 from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
 from app.dtos.weather_dto import WeatherData
+from app.core.cache import TTLCache
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
 from app.core.exceptions import WeatherProviderUnavailable
 from app.core.config import Config
+from app.core.http_client import get_http_client
+from app.core.metrics import registry, upstream_call
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache shared by all requests. Zones on the same city resolve to the same key.
+_weather_cache = TTLCache(
+    max_entries=Config.WEATHER_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.WEATHER_CACHE_TTL_SECONDS
+)
+registry.register_cache("weather", _weather_cache)
+# Deduplicates concurrent upstream fetches for the same cache key (thundering herd on expiry).
+_inflight = SingleFlight()
+# Same deduplication for the async serving mode (one event loop per process)
+_async_inflight = AsyncSingleFlight()
+registry.register_singleflight("weather", _inflight)
+registry.register_singleflight("weather_async", _async_inflight)
+
 class WeatherService:
-    # Uses a single provider implementation. 
+    # Uses a single provider implementation.
     # Can be refactored to support multiple providers if requirements change.
     def fetch_current_weather(self, latitude: float, longitude: float) -> WeatherData:
+        """
+        Serves from the shared coordinate cache when possible; otherwise calls the provider and caches the result.
+        Concurrent misses for the same key share a single upstream call and its result or error.
+        """
+        key = self.cache_key(latitude, longitude)
+        cached = _weather_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Weather cache hit for {key}")
+            return cached.model_copy(update={"from_cache": True})
+
+        return _inflight.do(key, lambda: self._fetch_and_cache(key, latitude, longitude))
+
+    async def fetch_current_weather_async(self, latitude: float, longitude: float) -> WeatherData:
+        """Async serving mode variant of `fetch_current_weather`: same cache and coalescing, non-blocking provider call."""
+        key = self.cache_key(latitude, longitude)
+        cached = _weather_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Weather cache hit for {key}")
+            return cached.model_copy(update={"from_cache": True})
+
+        return await _async_inflight.do(key, lambda: self._fetch_and_cache_async(key, latitude, longitude))
+
+    def fetch_current_weather_many(
+        self, coordinates: Iterable[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], WeatherData]:
+        """
+        Resolves many locations with as few provider calls as possible.
+        Coordinates are deduplicated by cache key, cache hits are served locally and the remaining
+        misses are sent in multi-location requests of up to `WEATHER_PROVIDER_BATCH_SIZE`.
+        Returns results keyed by `cache_key`; keys whose batch failed are absent from the result.
+        """
+        results: Dict[Tuple[float, float], WeatherData] = {}
+        misses: Dict[Tuple[float, float], Tuple[float, float]] = {}
+        for latitude, longitude in coordinates:
+            key = self.cache_key(latitude, longitude)
+            if key in results or key in misses:
+                continue
+            cached = _weather_cache.get(key)
+            if cached is not None:
+                results[key] = cached.model_copy(update={"from_cache": True})
+            else:
+                misses[key] = (latitude, longitude)
+
+        pending = list(misses.items())
+        batch_size = max(1, Config.WEATHER_PROVIDER_BATCH_SIZE)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                fetched = self._fetch_many_from_provider([coords for _, coords in batch])
+            except WeatherProviderUnavailable:
+                logger.warning(f"Weather batch of {len(batch)} locations failed")
+                continue
+            for (key, _), weather_data in zip(batch, fetched):
+                _weather_cache.set(key, weather_data)
+                results[key] = weather_data
+
+        return results
+
+    @staticmethod
+    def cache_key(latitude: float, longitude: float) -> Tuple[float, float]:
+        """Quantizes coordinates so nearby zones (same city) share one cache entry."""
+        precision = Config.WEATHER_CACHE_COORD_PRECISION
+        return (round(latitude, precision), round(longitude, precision))
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Hit/miss/eviction counters of the shared weather cache, for sizing."""
+        return _weather_cache.stats()
+
+    @staticmethod
+    def inflight_stats() -> Dict[str, int]:
+        """Upstream executions vs. callers coalesced onto an in-flight fetch."""
+        return _inflight.stats()
+
+    @staticmethod
+    def clear_cache() -> None:
+        _weather_cache.clear()
+        _inflight.reset_stats()
+        _async_inflight.reset_stats()
+
+    def _fetch_and_cache(self, key: Tuple[float, float], latitude: float, longitude: float) -> WeatherData:
+        """Runs once per in-flight key. Re-checks the cache in case a previous leader filled it after our miss."""
+        cached = _weather_cache.peek(key)
+        if cached is not None:
+            return cached.model_copy(update={"from_cache": True})
+
+        weather_data = self._fetch_from_provider(latitude, longitude)
+        _weather_cache.set(key, weather_data)
+        return weather_data
+
+    async def _fetch_and_cache_async(self, key: Tuple[float, float], latitude: float, longitude: float) -> WeatherData:
+        cached = _weather_cache.peek(key)
+        if cached is not None:
+            return cached.model_copy(update={"from_cache": True})
+
+        weather_data = await self._fetch_from_provider_async(latitude, longitude)
+        _weather_cache.set(key, weather_data)
+        return weather_data
+
+    def _fetch_many_from_provider(self, coordinates: List[Tuple[float, float]]) -> List[WeatherData]:
+        """Single multi-location provider call. Results are returned in the order of `coordinates`."""
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in coordinates),
+            "longitude": ",".join(str(lon) for _, lon in coordinates),
+            "current_weather": "true"
+        }
+
+        try:
+            url = Config.WEATHER_PROVIDER_BASE_URL
+            logger.debug(f"Fetching weather for {len(coordinates)} locations from {url}")
+
+            with upstream_call("weather"):
+                response = get_http_client().get(
+                    url,
+                    params=params,
+                    timeout=Config.WEATHER_PROVIDER_TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+
+            data = response.json()
+            # The provider answers a single location with an object and several with a list
+            locations = data if isinstance(data, list) else [data]
+            if len(locations) != len(coordinates):
+                raise ValueError("Unexpected number of locations from weather provider")
+
+            fetched_at = datetime.now(timezone.utc)
+            results = []
+            for location in locations:
+                if "current_weather" not in location:
+                    raise ValueError("Invalid response format from weather provider")
+                results.append(WeatherData(
+                    temperature_celsius=location["current_weather"]["temperature"],
+                    fetched_at=fetched_at
+                ))
+            logger.info(f"Weather data for {len(results)} locations fetched successfully from provider")
+            return results
+
+        except (requests.RequestException, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Weather batch fetch failed: {str(e)}")
+            raise WeatherProviderUnavailable(description="Unable to fetch weather data")
+
+    def _fetch_from_provider(self, latitude: float, longitude: float) -> WeatherData:
         """Direct downstream call to weather provider. Raises specific `WeatherProviderUnavailable` to hide implementation details."""
         params = {
             "latitude": latitude,
@@ -22,26 +182,56 @@ class WeatherService:
             url = Config.WEATHER_PROVIDER_BASE_URL
             logger.debug(f"Fetching weather from {url} with params: {params}")
 
-            response = requests.get(
-                url, 
-                params=params, 
-                timeout=Config.WEATHER_PROVIDER_TIMEOUT_SECONDS
-            )
-            response.raise_for_status()
-            
+            with upstream_call("weather"):
+                response = get_http_client().get(
+                    url,
+                    params=params,
+                    timeout=Config.WEATHER_PROVIDER_TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+
             data = response.json()
             logger.info("Weather data fetched successfully from provider")
-            
-            if "current_weather" not in data:
-                raise ValueError("Invalid response format from weather provider")
-
-            current = data["current_weather"]
-            
-            return WeatherData(
-                temperature_celsius=current["temperature"],
-                fetched_at=datetime.now(timezone.utc)
-            )
+            return self._parse_current_weather(data)
 
         except (requests.RequestException, ValueError) as e:
             logger.warning(f"Weather fetch failed: {str(e)}")
             raise WeatherProviderUnavailable(description="Unable to fetch weather data")
+
+    async def _fetch_from_provider_async(self, latitude: float, longitude: float) -> WeatherData:
+        """Non-blocking provider call on the shared async client. Same error contract as `_fetch_from_provider`."""
+        from app.core.aio_http_client import ProviderRequestError, get_async_http_client
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current_weather": "true"
+        }
+
+        try:
+            url = Config.WEATHER_PROVIDER_BASE_URL
+            logger.debug(f"Fetching weather (async) from {url} with params: {params}")
+
+            with upstream_call("weather"):
+                data = await get_async_http_client().get_json(
+                    url,
+                    params=params,
+                    timeout=Config.WEATHER_PROVIDER_TIMEOUT_SECONDS
+                )
+            logger.info("Weather data fetched successfully from provider")
+            return self._parse_current_weather(data)
+
+        except (ProviderRequestError, ValueError) as e:
+            logger.warning(f"Weather fetch failed: {str(e)}")
+            raise WeatherProviderUnavailable(description="Unable to fetch weather data")
+
+    @staticmethod
+    def _parse_current_weather(data: Dict) -> WeatherData:
+        if not isinstance(data, dict) or "current_weather" not in data:
+            raise ValueError("Invalid response format from weather provider")
+
+        current = data["current_weather"]
+
+        return WeatherData(
+            temperature_celsius=current["temperature"],
+            fetched_at=datetime.now(timezone.utc)
+        )
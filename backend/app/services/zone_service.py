@@ -1,18 +1,51 @@
 import logging
-from typing import List
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
-from werkzeug.exceptions import NotFound
-from app.repo.zone_repository import ZoneRepository
+from werkzeug.exceptions import BadRequest, NotFound
+from app.repo.weather_reading_repository import WeatherReadingRepository, to_utc_naive
+from app.repo.zone_repository import ZONE_RESPONSE_COLUMNS, ZoneRepository
 from app.models.zone import Zone
-from app.dtos.zone_dto import ZoneCreate, ZoneUpdate, ZoneResponse
+from app.dtos.zone_dto import (
+    ZoneCreate,
+    ZoneUpdate,
+    ZoneResponse,
+    ZoneRefreshResult,
+    ZoneBulkRefreshResponse,
+)
+from app.dtos.weather_dto import WeatherData, WeatherHistoryPoint, ZoneHistoryResponse
+from app.core.config import Config
 from app.core.enums import WeatherStatus
+from app.core.geo import covering_geohash_ranges, encode_geohash, haversine_km
+from app.core.pagination import encode_cursor
 
 logger = logging.getLogger(__name__)
 
+_ZONE_FIELDS = tuple(column.key for column in ZONE_RESPONSE_COLUMNS)
+
+# History range when `from` is omitted, and the bucket widths picked when `bucket` is
+HISTORY_DEFAULT_RANGE = timedelta(days=7)
+HISTORY_BUCKETS_SECONDS = (60, 300, 900, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 86400, 7 * 86400)
+
+def weather_reading(zone: Zone, weather_data: WeatherData) -> Optional[Dict[str, Any]]:
+    """
+    History row for `weather_data` about to be stored on `zone`, or `None` when the zone already holds that
+    very observation (a cache hit repeating the last fetch). Call before updating the zone.
+    """
+    fetched_at = to_utc_naive(weather_data.fetched_at)
+    if zone.last_fetched_at is not None and to_utc_naive(zone.last_fetched_at) == fetched_at:
+        return None
+    return {"zone_id": zone.id, "fetched_at": fetched_at, "temperature": weather_data.temperature_celsius}
+
 class ZoneService:
+    # Zones per bulk refresh call: the `zone_ids` maxItems, also applied when refreshing all zones
+    BULK_REFRESH_MAX_ZONES = 500
+
     def __init__(self, session: Session, user_id: int):
         # Service instance is bound to a specific user to enforce data isolation across all operations.
         self.repo = ZoneRepository(session, user_id)
+        self.readings = WeatherReadingRepository(session)
         self.user_id = user_id
 
     def create_zone(self, dto: ZoneCreate) -> ZoneResponse:
@@ -23,15 +56,50 @@ class ZoneService:
             country_code=dto.country_code,
             latitude=dto.latitude,
             longitude=dto.longitude,
+            geohash=encode_geohash(dto.latitude, dto.longitude),
             weather_status=WeatherStatus.NEVER_FETCHED
         )
         created_zone = self.repo.create(new_zone)
         logger.info(f"Zone created successfully (id={created_zone.id})")
         return ZoneResponse.model_validate(created_zone)
 
-    def list_zones(self) -> List[ZoneResponse]:
-        zones = self.repo.get_all()
-        return [ZoneResponse.model_validate(z) for z in zones]
+    def list_zones(self, limit: int, after_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        One keyset page of the user's zones, ordered by id. `next_cursor` is set only when more zones follow.
+        Built from column rows as plain dicts shaped like `ZoneListResponse`, skipping ORM and Pydantic per row.
+        """
+        # Over-fetch by one row to learn whether another page exists without a COUNT query
+        rows = self.repo.get_page_rows(after_id, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "items": [dict(zip(_ZONE_FIELDS, row)) for row in rows],
+            "next_cursor": encode_cursor(rows[-1].id) if has_more else None,
+        }
+
+    def nearby_zones(self, latitude: float, longitude: float, radius_km: float, limit: int) -> Dict[str, Any]:
+        """
+        The user's zones within `radius_km` of a point, nearest first, as plain dicts with `distance_km`.
+        Candidates come from index range scans over the geohash cells covering the circle; an exact
+        haversine check then drops the cells' corners.
+        """
+        rows = self.repo.get_rows_in_geohash_ranges(covering_geohash_ranges(latitude, longitude, radius_km))
+        matches = []
+        for row in rows:
+            distance = haversine_km(latitude, longitude, row.latitude, row.longitude)
+            if distance <= radius_km:
+                matches.append((distance, row))
+        matches.sort(key=lambda match: (match[0], match[1].id))
+        return {
+            "items": [
+                {**dict(zip(_ZONE_FIELDS, row)), "distance_km": round(distance, 3)}
+                for distance, row in matches[:limit]
+            ]
+        }
+
+    def zones_version(self) -> int:
+        """Change counter over all of the user's zones. Lets reads be revalidated without loading any zone."""
+        return self.repo.get_version()
 
     def get_zone(self, zone_id: int) -> ZoneResponse:
         zone = self._get_owned_zone_or_404(zone_id)
@@ -49,6 +117,7 @@ class ZoneService:
         zone.country_code = dto.country_code
         zone.latitude = dto.latitude
         zone.longitude = dto.longitude
+        zone.geohash = encode_geohash(dto.latitude, dto.longitude)
         zone.weather_status = WeatherStatus.NEVER_FETCHED
         zone.temperature = None
         zone.last_fetched_at = None
@@ -61,11 +130,12 @@ class ZoneService:
     def delete_zone(self, zone_id: int) -> None:
         logger.info(f"Deleting zone {zone_id} for user {self.user_id}")
         zone = self._get_owned_zone_or_404(zone_id)
+        self.readings.delete_for_zone(zone.id)
         self.repo.delete(zone)
         logger.info(f"Zone {zone_id} deleted")
             
     def refresh_zone(self, zone_id: int) -> ZoneResponse:
-        """Orchestrates on-demand weather update. Fetches live data and transitions state to `FRESH`."""
+        """Orchestrates on-demand weather update. Transitions state to `FRESH`, or `CACHED` when served from the shared weather cache."""
         zone = self._get_owned_zone_or_404(zone_id)
         
         logger.info(f"Refreshing weather for zone {zone_id}")
@@ -74,14 +144,121 @@ class ZoneService:
         weather_service = WeatherService()
         
         weather_data = weather_service.fetch_current_weather(zone.latitude, zone.longitude)
-        
+        return self._apply_weather(zone, weather_data)
+
+    def apply_weather(self, zone_id: int, weather_data: WeatherData) -> ZoneResponse:
+        """Stores weather fetched outside this session (async serving mode). Re-checks ownership, the zone may be gone."""
+        zone = self._get_owned_zone_or_404(zone_id)
+        return self._apply_weather(zone, weather_data)
+
+    def refresh_zones(self, zone_ids: Optional[List[int]] = None) -> ZoneBulkRefreshResponse:
+        """
+        Refreshes many zones at once (all of the user's zones when `zone_ids` is omitted).
+        Locations are batched into as few provider calls as possible and all successful updates
+        are written back in a single flush. Failures are reported per zone instead of aborting the batch.
+        At most BULK_REFRESH_MAX_ZONES per call: a user with more zones must list them in `zone_ids`, page by page.
+        """
+        if zone_ids is None:
+            zones = self.repo.get_all(limit=self.BULK_REFRESH_MAX_ZONES + 1)
+            if len(zones) > self.BULK_REFRESH_MAX_ZONES:
+                raise BadRequest(
+                    description=f"More than {self.BULK_REFRESH_MAX_ZONES} zones: pass `zone_ids` "
+                                f"(at most {self.BULK_REFRESH_MAX_ZONES} per call)"
+                )
+            requested_ids = [z.id for z in zones]
+        else:
+            requested_ids = list(dict.fromkeys(zone_ids))
+            zones = self.repo.get_many(requested_ids)
+
+        logger.info(f"Bulk refreshing {len(zones)} zones for user {self.user_id}")
+        from app.services.weather_service import WeatherService
+        weather_service = WeatherService()
+        weather_by_key = weather_service.fetch_current_weather_many(
+            (z.latitude, z.longitude) for z in zones
+        )
+
+        zones_by_id = {z.id: z for z in zones}
+        refreshed: List[Zone] = []
+        readings = []
+        failures = {}
+        for zone in zones:
+            weather_data = weather_by_key.get(WeatherService.cache_key(zone.latitude, zone.longitude))
+            if weather_data is None:
+                failures[zone.id] = "Unable to fetch weather data"
+                continue
+            reading = weather_reading(zone, weather_data)
+            if reading is not None:
+                readings.append(reading)
+            zone.temperature = weather_data.temperature_celsius
+            zone.last_fetched_at = to_utc_naive(weather_data.fetched_at)
+            zone.weather_status = WeatherStatus.CACHED if weather_data.from_cache else WeatherStatus.FRESH
+            refreshed.append(zone)
+
+        self.repo.update_many(refreshed)
+        self.readings.add_many(readings)
+
+        results = []
+        for zone_id in requested_ids:
+            zone = zones_by_id.get(zone_id)
+            if zone is None:
+                results.append(ZoneRefreshResult(zone_id=zone_id, success=False, error=f"Zone {zone_id} not found"))
+            elif zone_id in failures:
+                results.append(ZoneRefreshResult(zone_id=zone_id, success=False, error=failures[zone_id]))
+            else:
+                results.append(ZoneRefreshResult(zone_id=zone_id, success=True, zone=ZoneResponse.model_validate(zone)))
+
+        failed = len(results) - len(refreshed)
+        logger.info(f"Bulk refresh done for user {self.user_id}: {len(refreshed)} refreshed, {failed} failed")
+        return ZoneBulkRefreshResponse(refreshed=len(refreshed), failed=failed, results=results)
+
+    def get_history(
+        self, zone_id: int, start: Optional[datetime], end: Optional[datetime], bucket_seconds: Optional[int]
+    ) -> ZoneHistoryResponse:
+        """
+        Temperature history of a zone over [start, end) (naive UTC; default: the last HISTORY_DEFAULT_RANGE),
+        downsampled by the database to min/max/avg per bucket. Without `bucket_seconds`, picks the narrowest
+        standard bucket giving at most ZONE_HISTORY_TARGET_POINTS points.
+        """
+        self._get_owned_zone_or_404(zone_id)
+        end = end or datetime.now(timezone.utc).replace(tzinfo=None)
+        start = start or end - HISTORY_DEFAULT_RANGE
+        if start >= end:
+            raise BadRequest(description="`from` must be before `to`")
+
+        span_seconds = (end - start).total_seconds()
+        if bucket_seconds is None:
+            target = Config.ZONE_HISTORY_TARGET_POINTS
+            bucket_seconds = next(
+                (width for width in HISTORY_BUCKETS_SECONDS if span_seconds / width <= target),
+                math.ceil(span_seconds / target),
+            )
+        elif span_seconds / bucket_seconds > Config.ZONE_HISTORY_MAX_POINTS:
+            raise BadRequest(description=f"Range too long for this bucket (more than {Config.ZONE_HISTORY_MAX_POINTS} points)")
+
+        rows = self.readings.get_buckets(zone_id, start, end, bucket_seconds)
+        points = [
+            WeatherHistoryPoint(
+                bucket_start=start + timedelta(seconds=bucket * bucket_seconds),
+                min_temperature=minimum,
+                max_temperature=maximum,
+                avg_temperature=average,
+                readings=count,
+            )
+            for bucket, minimum, maximum, average, count in rows
+        ]
+        return ZoneHistoryResponse(zone_id=zone_id, start=start, end=end, bucket_seconds=bucket_seconds, points=points)
+
+    def _apply_weather(self, zone: Zone, weather_data: WeatherData) -> ZoneResponse:
+        reading = weather_reading(zone, weather_data)
         # Update Zone State
         zone.temperature = weather_data.temperature_celsius
-        zone.last_fetched_at = weather_data.fetched_at
-        zone.weather_status = WeatherStatus.FRESH
+        zone.last_fetched_at = to_utc_naive(weather_data.fetched_at)
+        zone.weather_status = WeatherStatus.CACHED if weather_data.from_cache else WeatherStatus.FRESH
         
         updated_zone = self.repo.update(zone)
-        logger.info(f"Weather refreshed for zone {zone_id} (temp={zone.temperature})")
+        if reading is not None:
+            self.readings.add_many([reading])
+        logger.info(f"Weather refreshed for zone {zone.id} (temp={zone.temperature})")
         return ZoneResponse.model_validate(updated_zone)
 
     def _get_owned_zone_or_404(self, zone_id: int) -> Zone:
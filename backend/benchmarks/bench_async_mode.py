@@ -0,0 +1,186 @@
+"""
+Sync (thread-per-request WSGI) vs async (aiohttp event loop) serving mode under upstream latency.
+
+Starts a local fake provider that answers after a fixed delay, serves the app in both modes on local ports
+against a throwaway SQLite file, and drives the same concurrent load through each:
+  - refresh: POST /zones/{id}/refresh, one distinct location per request (weather cache disabled)
+  - search:  GET /cities/search, one distinct query per request (city search cache disabled)
+  - get:     GET /zones/{id}, DB-only CRUD baseline
+
+Usage (from backend/, with requirements-async.txt installed):
+    python benchmarks/bench_async_mode.py --requests 400 --concurrency 100 --provider-delay 0.2 --sync-threads 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=100, help="in-flight client requests")
+    parser.add_argument("--provider-delay", type=float, default=0.2, help="fake upstream latency (seconds)")
+    parser.add_argument("--sync-threads", type=int, default=16, help="request threads of the sync server (like gunicorn gthread)")
+    parser.add_argument("--db-workers", type=int, default=16, help="ASYNC_DB_WORKERS of the async server")
+    return parser.parse_args()
+
+ARGS = parse_args()
+DB_DIR = tempfile.mkdtemp(prefix="bench-async-")
+PROVIDER_PORT, SYNC_PORT, ASYNC_PORT = 18551, 18552, 18553
+
+# Configure before the app is imported: Config is read at import time
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}",
+    "WEATHER_PROVIDER_BASE_URL": f"http://127.0.0.1:{PROVIDER_PORT}/forecast",
+    "CITY_GEOCODING_BASE_URL": f"http://127.0.0.1:{PROVIDER_PORT}/search",
+    "CITY_SEARCH_BACKEND": "open_meteo",
+    "WEATHER_CACHE_TTL_SECONDS": "0",
+    "CITY_SEARCH_CACHE_TTL_SECONDS": "0",
+    "PROVIDER_HTTP_POOL_SIZE": str(ARGS.concurrency),
+    "ASYNC_PROVIDER_POOL_SIZE": str(ARGS.concurrency),
+    "ASYNC_DB_WORKERS": str(ARGS.db_workers),
+    "LOG_LEVEL": "WARNING",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from aiohttp import web
+from werkzeug.serving import BaseWSGIServer
+
+def start_in_thread(target) -> None:
+    threading.Thread(target=target, daemon=True).start()
+
+def serve_aiohttp(app: web.Application, port: int):
+    """Runs an aiohttp application on its own event loop in a daemon thread. Returns a shutdown callable."""
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app, access_log=None)
+
+    def run():
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port, backlog=4096).start())
+        ready.set()
+        loop.run_forever()
+
+    start_in_thread(run)
+    ready.wait()
+    return lambda: asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+
+def fake_provider() -> web.Application:
+    async def forecast(request):
+        await asyncio.sleep(ARGS.provider_delay)
+        return web.json_response({"current_weather": {"temperature": 20.0}})
+
+    async def search(request):
+        await asyncio.sleep(ARGS.provider_delay)
+        name = request.query.get("name", "")
+        return web.json_response({"results": [{"name": name, "country_code": "XX", "latitude": 1.0, "longitude": 2.0}]})
+
+    app = web.Application()
+    app.router.add_get("/forecast", forecast)
+    app.router.add_get("/search", search)
+    return app
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server with a fixed pool of request threads, the way sync workers are deployed."""
+    request_queue_size = 4096
+
+    def __init__(self, *args, threads: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+async def run_load(base_url: str, paths, method: str, headers):
+    """Fires all requests with bounded concurrency. Returns (elapsed seconds, latencies, errors)."""
+    semaphore = asyncio.Semaphore(ARGS.concurrency)
+    latencies, errors = [], 0
+    connector = aiohttp.TCPConnector(limit=ARGS.concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=timeout, headers=headers) as client:
+        async def one(path):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                async with client.request(method, path) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(path) for path in paths))
+        return time.perf_counter() - started, latencies, errors
+
+async def prepare(base_url: str):
+    """Registers a user and creates one zone per request, each at its own location."""
+    credentials = {"username": "bench", "password": "BenchPassword123!"}
+    async with aiohttp.ClientSession(base_url) as client:
+        await client.post("/api/v1/auth/register", json=credentials)
+        async with client.post("/api/v1/auth/login", json=credentials) as response:
+            token = (await response.json())["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        zone_ids = []
+        for i in range(ARGS.requests):
+            body = {"name": f"Zone {i}", "latitude": -80 + (i % 1600) * 0.1, "longitude": -170 + (i // 1600) * 0.1}
+            async with client.post("/api/v1/zones", json=body, headers=headers) as response:
+                zone_ids.append((await response.json())["id"])
+    return headers, zone_ids
+
+def report(mode: str, scenario: str, elapsed: float, latencies, errors: int) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{mode:<6} {scenario:<8} {len(latencies) / elapsed:>9.1f} req/s   "
+        f"p50 {statistics.median(ordered) * 1000:>7.1f} ms   p95 {p95 * 1000:>7.1f} ms   errors {errors}"
+    )
+
+async def main():
+    from app import create_app
+    from app.aio import create_async_app
+    from app.core.database import init_db
+
+    init_db()
+    serve_aiohttp(fake_provider(), PROVIDER_PORT)
+
+    sync_server = PooledWSGIServer("127.0.0.1", SYNC_PORT, create_app().app, threads=ARGS.sync_threads)
+    start_in_thread(sync_server.serve_forever)
+    stop_async_server = serve_aiohttp(create_async_app().app, ASYNC_PORT)
+
+    headers, zone_ids = await prepare(f"http://127.0.0.1:{SYNC_PORT}")
+    print(
+        f"{ARGS.requests} requests/scenario, concurrency {ARGS.concurrency}, provider delay {ARGS.provider_delay * 1000:.0f} ms, "
+        f"sync threads {ARGS.sync_threads}, async DB workers {ARGS.db_workers}\n"
+    )
+
+    for mode, port in (("sync", SYNC_PORT), ("async", ASYNC_PORT)):
+        base_url = f"http://127.0.0.1:{port}"
+        scenarios = (
+            ("refresh", "POST", [f"/api/v1/zones/{zone_id}/refresh" for zone_id in zone_ids]),
+            ("search", "GET", [f"/api/v1/cities/search?q={mode}-city-{i}" for i in range(ARGS.requests)]),
+            ("get", "GET", [f"/api/v1/zones/{zone_id}" for zone_id in zone_ids]),
+        )
+        for scenario, method, paths in scenarios:
+            elapsed, latencies, errors = await run_load(base_url, paths, method, headers)
+            report(mode, scenario, elapsed, latencies, errors)
+
+    sync_server.shutdown()
+    stop_async_server()
+
+if __name__ == "__main__":
+    asyncio.run(main())
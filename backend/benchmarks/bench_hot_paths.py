@@ -0,0 +1,195 @@
+"""
+Micro-benchmarks of the service, repository, auth and DTO hot paths, with a regression gate.
+
+Runs in-process against in-memory SQLite with the weather provider stubbed (no network), so results reflect
+this code and its libraries only. Each case is repeated for at least --min-time seconds and the median
+per-call time is reported. Repository and listing cases run for users owning 10, 1k and 100k zones.
+
+Results can be saved as JSON and compared against a baseline recorded on the same machine; the run exits
+with status 1 when any case's median is more than --max-regression percent slower than in the baseline.
+
+Usage (from backend/):
+    python benchmarks/bench_hot_paths.py --save baseline.json               # on the reference commit
+    python benchmarks/bench_hot_paths.py --baseline baseline.json --max-regression 20
+    python benchmarks/bench_hot_paths.py --sizes 10,1000 --filter repo.    # quicker subset
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from unittest.mock import Mock, patch
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,1000,100000", help="zones per user for the size-dependent cases")
+    parser.add_argument("--min-time", type=float, default=0.3, help="seconds spent on each case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed slowdown per case, in percent")
+    return parser.parse_args()
+
+ARGS = parse_args()
+
+# Configure before the app is imported: Config is read at import time
+os.environ.update({
+    "DATABASE_URL": "sqlite:///:memory:",
+    "PASSWORD_HASH_WORKERS": "0",
+    "SLOW_QUERY_MS": "0",
+    "LOG_LEVEL": "WARNING",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, init_db
+from app.core.enums import WeatherStatus
+from app.core.geo import encode_geohash
+from app.core.security import clear_token_cache, create_access_token, decode_token, hash_password
+from app.dtos.zone_dto import ZoneCreate, ZoneResponse
+from app.models.user import User
+from app.models.zone import Zone
+from app.repo.zone_repository import ZoneRepository
+from app.services.weather_service import WeatherService
+from app.services.zone_service import ZoneService
+
+PAGE_SIZE = 100
+ZONE_PAYLOAD = {"name": "Home", "country_code": "FR", "latitude": 48.8566, "longitude": 2.3522}
+
+def measure(fn, setup=None, teardown=None):
+    """Median and mean seconds per call of `fn`; `setup`/`teardown` run around each call, untimed."""
+    timings = []
+    deadline = time.perf_counter() + ARGS.min_time
+    while len(timings) < 5 or time.perf_counter() < deadline:
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+        if teardown:
+            teardown()
+    return {
+        "median_us": round(statistics.median(timings) * 1e6, 2),
+        "mean_us": round(statistics.fmean(timings) * 1e6, 2),
+        "iterations": len(timings),
+    }
+
+def seed_user(session, username: str, zones: int) -> int:
+    user = User(username=username, password_hash="-")
+    session.add(user)
+    session.flush()
+    for start in range(0, zones, 10000):
+        rows = []
+        for i in range(start, min(start + 10000, zones)):
+            latitude, longitude = -80 + (i % 1600) * 0.1, -170 + (i // 1600 % 3400) * 0.1
+            rows.append({
+                "user_id": user.id,
+                "name": f"Zone {i}",
+                "country_code": "FR",
+                "latitude": latitude,
+                "longitude": longitude,
+                "geohash": encode_geohash(latitude, longitude),
+                "temperature": 20.5 if i % 2 else None,
+                "weather_status": WeatherStatus.CACHED if i % 2 else WeatherStatus.NEVER_FETCHED,
+            })
+        session.bulk_insert_mappings(Zone, rows)
+    session.commit()
+    return user.id
+
+def provider_stub():
+    response = Mock()
+    response.json.return_value = {"current_weather": {"temperature": 21.5}}
+    response.raise_for_status = Mock()
+    return response
+
+def cases(session):
+    """(name, fn, setup, teardown) for every case."""
+    sizes = [int(size) for size in ARGS.sizes.split(",")]
+    for size in sizes:
+        user_id = seed_user(session, f"bench-{size}", size)
+        repo = ZoneRepository(session, user_id)
+        service = ZoneService(session, user_id)
+        zone_ids = [row.id for row in repo.get_page_rows(None, size)]
+        middle_id = zone_ids[len(zone_ids) // 2]
+        sample_ids = zone_ids[::max(1, len(zone_ids) // 50)][:50]
+        last_page_after = zone_ids[max(0, len(zone_ids) - PAGE_SIZE - 1)]
+
+        yield f"repo.get_page_rows[{size}]", lambda: repo.get_page_rows(None, PAGE_SIZE), None, None
+        yield f"repo.get_page_rows_last_page[{size}]", lambda: repo.get_page_rows(last_page_after, PAGE_SIZE), None, None
+        yield f"repo.get_by_id[{size}]", lambda: repo.get_by_id(middle_id), None, session.expunge_all
+        yield f"repo.get_many_50[{size}]", lambda: repo.get_many(sample_ids), None, session.expunge_all
+        yield f"repo.get_version[{size}]", repo.get_version, None, None
+        yield f"service.list_zones[{size}]", lambda: service.list_zones(PAGE_SIZE), None, None
+        # Seeded zones lie on a 0.1 degree grid: a 25 km radius around the middle zone holds a few dozen of them
+        middle = repo.get_by_id(middle_id)
+        nearby_point = (middle.latitude, middle.longitude)
+        session.expunge_all()
+        yield f"service.nearby_zones_25km[{size}]", lambda: service.nearby_zones(*nearby_point, 25, PAGE_SIZE), None, None
+
+    user_id = seed_user(session, "bench-writes", 10)
+    service = ZoneService(session, user_id)
+    zone_id = ZoneRepository(session, user_id).get_page_rows(None, 1)[0].id
+    dto = ZoneCreate(**ZONE_PAYLOAD)
+    yield "service.create_zone", lambda: service.create_zone(dto), None, session.rollback
+    # Cache cleared before each call, so every refresh goes through the (stubbed) provider path
+    yield "service.refresh_zone", lambda: service.refresh_zone(zone_id), WeatherService.clear_cache, session.rollback
+
+    token = create_access_token(user_id=user_id)
+    decode_token(token)
+    yield "security.decode_token_cached", lambda: decode_token(token), None, None
+    yield "security.decode_token_cold", lambda: decode_token(token), clear_token_cache, None
+    yield "security.hash_password", lambda: hash_password("bench-password"), None, None
+
+    zone = session.get(Zone, zone_id)
+    yield "dto.zone_create_validate", lambda: ZoneCreate.model_validate(ZONE_PAYLOAD), None, None
+    yield "dto.zone_response_round_trip", lambda: ZoneResponse.model_validate(zone).model_dump(mode="json"), None, None
+
+def compare(results, baseline_path: str) -> int:
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    regressions = 0
+    print(f"\n{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {result['median_us']:>9.1f} us {'new':>8}")
+            continue
+        before, after = baseline[name]["median_us"], result["median_us"]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > ARGS.max_regression:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before:>9.1f} us {after:>9.1f} us {change:>+7.1f}%{flag}")
+    if regressions:
+        print(f"\n{regressions} case(s) more than {ARGS.max_regression:.0f}% slower than {baseline_path}")
+    return regressions
+
+def main():
+    init_db()
+    session = SessionLocal()
+    results = {}
+    print(f"{'case':<40} {'median':>12} {'mean':>12} {'calls':>8}")
+    with patch("requests.Session.get", return_value=provider_stub()):
+        for name, fn, setup, teardown in cases(session):
+            if ARGS.filter not in name:
+                continue
+            fn()  # warm up (statement cache, lazy imports)
+            if teardown:
+                teardown()
+            result = results[name] = measure(fn, setup, teardown)
+            print(f"{name:<40} {result['median_us']:>9.1f} us {result['mean_us']:>9.1f} us {result['iterations']:>8}")
+    session.close()
+
+    if ARGS.save:
+        with open(ARGS.save, "w") as out:
+            json.dump({
+                "meta": {"python": platform.python_version(), "machine": platform.machine(), "sizes": ARGS.sizes},
+                "results": results,
+            }, out, indent=2)
+    if ARGS.baseline and compare(results, ARGS.baseline):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
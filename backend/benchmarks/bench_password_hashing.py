@@ -0,0 +1,79 @@
+"""
+Login (Argon2 verify) throughput: inline on request threads vs the dedicated process pool.
+
+Each "login" is one `verify_and_update` against a stored hash, the CPU-bound part of POST /auth/login.
+Reports logins/s, logins/s per core used, and p50/p95 latency seen by the request threads.
+
+Usage (from backend/):
+    python benchmarks/bench_password_hashing.py --logins 200 --threads 32 --workers 4
+    python benchmarks/bench_password_hashing.py --target-ms 250   # calibrate first, then measure
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import Config
+from app.core.password_hasher import Argon2Params, PasswordHasher, calibrate
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32, help="concurrent request threads")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    parser.add_argument("--time-cost", type=int, default=Config.PASSWORD_HASH_TIME_COST)
+    parser.add_argument("--memory-kib", type=int, default=Config.PASSWORD_HASH_MEMORY_KIB)
+    parser.add_argument("--parallelism", type=int, default=Config.PASSWORD_HASH_PARALLELISM)
+    parser.add_argument("--target-ms", type=float, default=0, help="calibrate time cost to this latency first")
+    return parser.parse_args()
+
+def run(hasher: PasswordHasher, hashed: str, logins: int, threads: int):
+    def login(_):
+        started = time.perf_counter()
+        assert hasher.verify_and_update("bench-password", hashed)[0]
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        started = time.perf_counter()
+        latencies = sorted(pool.map(login, range(logins)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies
+
+def report(label: str, cores: int, logins: int, elapsed: float, latencies) -> None:
+    rate = logins / elapsed
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{label:<26} {rate:>8.1f} logins/s   {rate / cores:>7.1f} /s/core   "
+        f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   p95 {p95 * 1000:>7.1f} ms"
+    )
+
+def main():
+    args = parse_args()
+    if args.target_ms > 0:
+        params = calibrate(args.target_ms, args.memory_kib, args.parallelism)
+    else:
+        params = Argon2Params(args.time_cost, args.memory_kib, args.parallelism)
+
+    cores = os.cpu_count() or 1
+    print(f"{params}, {args.logins} logins, {args.threads} request threads, {cores} cores\n")
+
+    inline = PasswordHasher(params, workers=0, max_queue=0)
+    hashed = inline.hash("bench-password")
+    report("inline (request threads)", cores, args.logins, *run(inline, hashed, args.logins, args.threads))
+
+    pooled = PasswordHasher(params, workers=args.workers, max_queue=0)
+    pooled.start()
+    try:
+        elapsed, latencies = run(pooled, hashed, args.logins, args.threads)
+        report(f"process pool ({args.workers})", min(cores, args.workers), args.logins, elapsed, latencies)
+        print(f"\npool stats: {pooled.stats()}")
+    finally:
+        pooled.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+What response validation costs per endpoint: the same requests with every response validated vs none.
+
+Seeds one user with zones in a throwaway SQLite file and drives each endpoint through the Flask test client
+(in-process, so the numbers are handler + framework time without network noise). Reports mean latency with
+RESPONSE_VALIDATION_SAMPLE_RATE=1 and =0, the difference, and the validator's own mean time per response.
+
+Usage (from backend/):
+    python benchmarks/bench_response_validation.py --zones 2000 --requests 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint and mode")
+    return parser.parse_args()
+
+ARGS = parse_args()
+DB_DIR = tempfile.mkdtemp(prefix="bench-validation-")
+
+# Configure before the app is imported: Config is read at import time
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}",
+    "PASSWORD_HASH_WORKERS": "0",
+    "LOG_LEVEL": "WARNING",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.api.response_validation import stats
+from app.core.config import Config
+from app.core.database import SessionLocal, init_db
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.zone import Zone
+
+def seed() -> int:
+    session = SessionLocal()
+    user = User(username="bench", password_hash="-")
+    session.add(user)
+    session.flush()
+    session.bulk_insert_mappings(Zone, [
+        {"user_id": user.id, "name": f"Zone {i}", "latitude": (i % 180) - 89.5, "longitude": (i % 360) - 179.5}
+        for i in range(ARGS.zones)
+    ])
+    session.commit()
+    user_id = user.id
+    session.close()
+    return user_id
+
+def mean_latency(client, path: str, headers) -> float:
+    started = time.perf_counter()
+    for _ in range(ARGS.requests):
+        resp = client.get(path, headers=headers)
+        assert resp.status_code == 200, (path, resp.status_code)
+    return (time.perf_counter() - started) / ARGS.requests
+
+def main():
+    init_db()
+    user_id = seed()
+    client = create_app().app.test_client()
+    headers = {"Authorization": f"Bearer {create_access_token(user_id=user_id)}"}
+    endpoints = (
+        ("list_zones", "/api/v1/zones?limit=500"),
+        ("list_zones", "/api/v1/zones?limit=20"),
+        ("get_zone", "/api/v1/zones/1"),
+    )
+    print(f"{ARGS.zones} zones, {ARGS.requests} requests per endpoint and mode\n")
+    print(f"{'endpoint':<30} {'validated':>11} {'skipped':>11} {'overhead':>10} {'validator':>11}")
+
+    for name, path in endpoints:
+        client.get(path, headers=headers)  # warm up
+        Config.RESPONSE_VALIDATION_SAMPLE_RATE = 1
+        stats.clear()
+        validated = mean_latency(client, path, headers)
+        validator_ms = stats.snapshot()["operations"][f"app.api.zones.{name}"]["mean_validation_ms"]
+        Config.RESPONSE_VALIDATION_SAMPLE_RATE = 0
+        skipped = mean_latency(client, path, headers)
+        print(
+            f"{path.replace('/api/v1', ''):<30} {validated * 1000:>8.2f} ms {skipped * 1000:>8.2f} ms "
+            f"{(validated - skipped) / validated * 100:>9.0f}% {validator_ms:>8.2f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold start: import time and time-to-first-request of a fresh process.
+
+Provisions a throwaway SQLite database once (python -m app.cli init-db), then starts N fresh interpreters.
+Each one measures its own phases and the parent reports medians:
+  - import_db:     `import app.core.database` (must not connect or provision)
+  - import_app:    `from app import create_app`
+  - create_app:    spec loading, route setup, background services
+  - first_request: first authenticated GET /zones (engine creation, first connection)
+  - process:       wall time of the whole child, interpreter start-up included
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --runs 10 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app.core.database as database
+imported_db = time.perf_counter()
+assert database.engine is None, "importing app.core.database created an engine"
+from app import create_app
+imported_app = time.perf_counter()
+connexion_app = create_app()
+created = time.perf_counter()
+from app.core.security import create_access_token
+client = connexion_app.app.test_client()
+resp = client.get("/api/v1/zones", headers={"Authorization": "Bearer " + create_access_token(user_id=1)})
+assert resp.status_code == 200, resp.status_code
+first_request = time.perf_counter()
+print(json.dumps({
+    "import_db": imported_db - started,
+    "import_app": imported_app - imported_db,
+    "create_app": created - imported_app,
+    "first_request": first_request - created,
+}))
+"""
+
+PHASES = ("import_db", "import_app", "create_app", "first_request", "process")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", help="also write the medians (seconds) to this file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-startup-'), 'bench.db')}",
+        "LOG_LEVEL": "WARNING",
+    }
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    print(f"init-db (once per deployment): {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        child = subprocess.run([sys.executable, "-c", CHILD], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True)
+        samples["process"].append(time.perf_counter() - started)
+        for phase, seconds in json.loads(child.stdout.strip().splitlines()[-1]).items():
+            samples[phase].append(seconds)
+
+    medians = {phase: statistics.median(values) for phase, values in samples.items()}
+    print(f"{'phase':<15} {'median':>10} {'min':>10}   ({args.runs} fresh processes)")
+    for phase in PHASES:
+        print(f"{phase:<15} {medians[phase] * 1000:>7.0f} ms {min(samples[phase]) * 1000:>7.0f} ms")
+
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(medians, out, indent=2)
+
+if __name__ == "__main__":
+    main()
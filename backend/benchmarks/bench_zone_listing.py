@@ -0,0 +1,146 @@
+"""
+Zone listing cost per page: ORM entities + Pydantic + framework JSON vs column projection + fast encoder.
+
+Seeds one user with N zones in a throwaway SQLite file, then walks every keyset page both ways:
+  - pydantic:   full ORM rows -> ZoneResponse.model_validate -> model_dump -> Connexion's JSON encoder (previous path)
+  - projection: ZoneService.list_zones (column tuples -> dicts) -> app.core.serialization.dumps (current path)
+and finally the current path end to end through GET /zones (routing, auth, response validation included).
+
+Usage (from backend/):
+    python benchmarks/bench_zone_listing.py --zones 10000 --page-size 500 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=10000, help="zones owned by the user")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5, help="full walks per variant (best is reported)")
+    return parser.parse_args()
+
+ARGS = parse_args()
+DB_DIR = tempfile.mkdtemp(prefix="bench-listing-")
+
+# Configure before the app is imported: Config is read at import time
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}",
+    "ZONES_PAGE_MAX_LIMIT": str(ARGS.page_size),
+    "PASSWORD_HASH_WORKERS": "0",
+    "LOG_LEVEL": "WARNING",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connexion.jsonifier import JSONEncoder
+from app.core.database import SessionLocal, init_db
+from app.core.enums import WeatherStatus
+from app.core.serialization import dumps
+from app.dtos.zone_dto import ZoneListResponse, ZoneResponse
+from app.models.user import User
+from app.models.zone import Zone
+from app.services.zone_service import ZoneService
+
+def seed() -> int:
+    session = SessionLocal()
+    user = User(username="bench", password_hash="-")
+    session.add(user)
+    session.flush()
+    now = datetime.utcnow()
+    session.bulk_insert_mappings(Zone, [
+        {
+            "user_id": user.id,
+            "name": f"Zone {i}",
+            "country_code": "FR",
+            "latitude": -80 + (i % 1600) * 0.1,
+            "longitude": -170 + (i // 1600) * 0.1,
+            "temperature": 20.5 if i % 2 else None,
+            "last_fetched_at": now if i % 2 else None,
+            "weather_status": WeatherStatus.CACHED if i % 2 else WeatherStatus.NEVER_FETCHED,
+        }
+        for i in range(ARGS.zones)
+    ])
+    session.commit()
+    user_id = user.id
+    session.close()
+    return user_id
+
+def walk_pydantic(user_id: int) -> int:
+    """Previous path, reproduced: entities, per-row validation and dump, framework encoder (indent=2)."""
+    session = SessionLocal()
+    total, after_id = 0, 0
+    while True:
+        zones = (
+            session.query(Zone).filter(Zone.user_id == user_id, Zone.id > after_id)
+            .order_by(Zone.id).limit(ARGS.page_size + 1).all()
+        )
+        page = ZoneListResponse(items=[ZoneResponse.model_validate(z) for z in zones[:ARGS.page_size]])
+        total += len(json.dumps(page.model_dump(), cls=JSONEncoder, indent=2))
+        if len(zones) <= ARGS.page_size:
+            break
+        after_id = zones[ARGS.page_size - 1].id
+    session.close()
+    return total
+
+def walk_projection(user_id: int) -> int:
+    session = SessionLocal()
+    service = ZoneService(session, user_id)
+    total, after_id = 0, None
+    while True:
+        page = service.list_zones(ARGS.page_size, after_id)
+        total += len(dumps(page))
+        if page["next_cursor"] is None:
+            break
+        after_id = page["items"][-1]["id"]
+    session.close()
+    return total
+
+def walk_http(client, headers) -> int:
+    total, cursor = 0, None
+    while True:
+        query = {"limit": ARGS.page_size, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/api/v1/zones", headers=headers, query_string=query)
+        assert resp.status_code == 200, resp.status_code
+        total += len(resp.data)
+        cursor = resp.json["next_cursor"]
+        if cursor is None:
+            break
+    return total
+
+def best_of(fn, *args):
+    best, size = float("inf"), 0
+    for _ in range(ARGS.rounds):
+        started = time.perf_counter()
+        size = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, size
+
+def report(label: str, elapsed: float, size: int) -> None:
+    pages = -(-ARGS.zones // ARGS.page_size)
+    print(
+        f"{label:<22} {ARGS.zones / elapsed:>10.0f} zones/s   {elapsed / pages * 1000:>7.2f} ms/page   "
+        f"{size / 1024:>8.0f} KiB total"
+    )
+
+def main():
+    from app import create_app
+    from app.core.security import create_access_token
+
+    init_db()
+    user_id = seed()
+    print(f"{ARGS.zones} zones, page size {ARGS.page_size}, best of {ARGS.rounds} walks\n")
+
+    report("pydantic (previous)", *best_of(walk_pydantic, user_id))
+    report("projection + dumps", *best_of(walk_projection, user_id))
+
+    client = create_app().app.test_client()
+    headers = {"Authorization": f"Bearer {create_access_token(user_id=user_id)}"}
+    report("GET /zones end to end", *best_of(walk_http, client, headers))
+
+if __name__ == "__main__":
+    main()
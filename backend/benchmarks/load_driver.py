@@ -0,0 +1,203 @@
+"""
+End-to-end load test: the app started from run.py, a local provider simulator, and a mixed workload.
+
+Unless --app-url points at a running deployment, starts benchmarks/provider_simulator.py and `python run.py`
+(after `python -m app.cli init-db`) as subprocesses, with the provider URLs pointed at the simulator and a
+throwaway SQLite database (or --database-url). Seeds --users accounts with --zones-per-user zones each, then
+runs closed-loop virtual users at each --concurrency step for --duration seconds. Each virtual user picks
+operations by weight:
+  - login:   POST /auth/login
+  - list:    GET /zones?limit=100
+  - refresh: POST /zones/{id}/refresh on one of its zones
+  - search:  a typeahead burst, GET /cities/search for each prefix of a city name (2+ characters)
+and reports throughput and p50/p95/p99 per operation and step.
+
+Usage (from backend/, with requirements-async.txt installed):
+    python benchmarks/load_driver.py --concurrency 1,8,32,64 --duration 20
+    python benchmarks/load_driver.py --server-mode async --provider-latency lognormal:80:400 --provider-error-rate 0.01
+    python benchmarks/load_driver.py --app-url http://staging:8080 --users 50 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import aiohttp
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API = "/api/v1"
+CITY_NAMES = ("paris", "london", "berlin", "madrid", "amsterdam", "barcelona", "lisbon", "stockholm", "vienna", "prague")
+PASSWORD = "LoadTestPassword123!"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", default="1,8,32,64", help="virtual users per step")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per step")
+    parser.add_argument("--mix", default="login=2,list=50,refresh=20,search=28", help="operation weights")
+    parser.add_argument("--users", type=int, default=20, help="accounts shared by the virtual users")
+    parser.add_argument("--zones-per-user", type=int, default=50)
+    parser.add_argument("--app-url", help="load this running app instead of starting run.py")
+    parser.add_argument("--server-mode", choices=("wsgi", "async"), default="wsgi", help="APP_SERVER_MODE of the started app")
+    parser.add_argument("--database-url", help="DATABASE_URL of the started app (default: throwaway SQLite file)")
+    parser.add_argument("--provider-latency", default="lognormal:80:400", help="simulator delay distribution (ms)")
+    parser.add_argument("--provider-error-rate", type=float, default=0.0)
+    parser.add_argument("--provider-rate-limit", type=float, default=0.0, help="simulator requests/s before 429")
+    parser.add_argument("--json", help="also write the per-step results to this file")
+    return parser.parse_args()
+
+ARGS = parse_args()
+APP_PORT, SIMULATOR_PORT = 8080, 8090
+
+def start_stack():
+    """Starts the simulator and the app (run.py). Returns the subprocesses to stop afterwards."""
+    simulator = subprocess.Popen([
+        sys.executable, os.path.join(BACKEND_DIR, "benchmarks", "provider_simulator.py"),
+        "--port", str(SIMULATOR_PORT),
+        "--latency", ARGS.provider_latency,
+        "--error-rate", str(ARGS.provider_error_rate),
+        "--rate-limit", str(ARGS.provider_rate_limit),
+    ], cwd=BACKEND_DIR)
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": ARGS.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='load-driver-'), 'load.db')}",
+        "APP_SERVER_MODE": ARGS.server_mode,
+        "WEATHER_PROVIDER_BASE_URL": f"http://127.0.0.1:{SIMULATOR_PORT}/v1/forecast",
+        "CITY_GEOCODING_BASE_URL": f"http://127.0.0.1:{SIMULATOR_PORT}/v1/search",
+        "CITY_SEARCH_BACKEND": "open_meteo",
+        "LOG_LEVEL": "WARNING",
+    }
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    app = subprocess.Popen([sys.executable, "run.py"], cwd=BACKEND_DIR, env=env)
+    return [app, simulator]
+
+async def wait_until_up(client: aiohttp.ClientSession, url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with client.get(url) as response:
+                if response.status < 500:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not come up within {timeout:.0f} s")
+        await asyncio.sleep(0.2)
+
+async def seed(client: aiohttp.ClientSession):
+    """Registers and logs in the accounts and creates their zones. Returns [(username, headers, zone_ids)]."""
+    run_id = f"{int(time.time())}"
+    accounts = []
+    for u in range(ARGS.users):
+        username = f"load-{run_id}-{u}"
+        credentials = {"username": username, "password": PASSWORD}
+        async with client.post(f"{API}/auth/register", json=credentials) as response:
+            response.raise_for_status()
+        async with client.post(f"{API}/auth/login", json=credentials) as response:
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {(await response.json())['access_token']}"}
+        zone_ids = []
+        for z in range(ARGS.zones_per_user):
+            # Spread over the globe so refreshes are not all answered by the weather cache
+            body = {"name": f"Zone {z}", "latitude": random.uniform(-60, 70), "longitude": random.uniform(-179, 179)}
+            async with client.post(f"{API}/zones", json=body, headers=headers) as response:
+                response.raise_for_status()
+                zone_ids.append((await response.json())["id"])
+        accounts.append([username, headers, zone_ids])
+    return accounts
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, operation: str, request) -> None:
+        started = time.perf_counter()
+        try:
+            async with request as response:
+                await response.read()
+                if response.status >= 400:
+                    self.errors[operation] += 1
+        except aiohttp.ClientError:
+            self.errors[operation] += 1
+        self.latencies[operation].append(time.perf_counter() - started)
+
+async def virtual_user(client: aiohttp.ClientSession, account, mix, deadline: float, recorder: Recorder) -> None:
+    username, headers, zone_ids = account
+    operations, weights = zip(*mix.items())
+    while time.monotonic() < deadline:
+        operation = random.choices(operations, weights)[0]
+        if operation == "login":
+            await recorder.call("login", client.post(f"{API}/auth/login", json={"username": username, "password": PASSWORD}))
+        elif operation == "list":
+            await recorder.call("list", client.get(f"{API}/zones", params={"limit": 100}, headers=headers))
+        elif operation == "refresh":
+            await recorder.call("refresh", client.post(f"{API}/zones/{random.choice(zone_ids)}/refresh", headers=headers))
+        elif operation == "search":
+            city = random.choice(CITY_NAMES)
+            for length in range(2, len(city) + 1):
+                await recorder.call("search", client.get(f"{API}/cities/search", params={"q": city[:length]}, headers=headers))
+
+def percentile(ordered, share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] if ordered else 0.0
+
+async def run_step(client, accounts, mix, concurrency: int):
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + ARGS.duration
+    await asyncio.gather(*(virtual_user(client, accounts[i % len(accounts)], mix, deadline, recorder) for i in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    step = {"concurrency": concurrency, "seconds": round(elapsed, 2), "operations": {}}
+    total = sum(len(values) for values in recorder.latencies.values())
+    print(f"\nconcurrency {concurrency}: {total / elapsed:.1f} req/s over {elapsed:.1f} s")
+    print(f"  {'operation':<10} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for operation in mix:
+        ordered = sorted(recorder.latencies[operation])
+        if not ordered:
+            continue
+        result = step["operations"][operation] = {
+            "requests": len(ordered),
+            "throughput": round(len(ordered) / elapsed, 2),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "errors": recorder.errors[operation],
+        }
+        print(
+            f"  {operation:<10} {result['throughput']:>8.1f} {result['p50_ms']:>6.1f} ms {result['p95_ms']:>6.1f} ms "
+            f"{result['p99_ms']:>6.1f} ms {result['errors']:>7}"
+        )
+    return step
+
+async def main():
+    mix = {name: float(weight) for name, weight in (item.split("=") for item in ARGS.mix.split(","))}
+    processes = [] if ARGS.app_url else start_stack()
+    base_url = ARGS.app_url or f"http://127.0.0.1:{APP_PORT}"
+    steps = []
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(base_url, connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as client:
+            await wait_until_up(client, f"{API}/openapi.json")
+            accounts = await seed(client)
+            print(f"{ARGS.users} users x {ARGS.zones_per_user} zones, mix {ARGS.mix}, {ARGS.duration:.0f} s per step")
+            for concurrency in (int(value) for value in ARGS.concurrency.split(",")):
+                steps.append(await run_step(client, accounts, mix, concurrency))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    if ARGS.json:
+        with open(ARGS.json, "w") as out:
+            json.dump({"mix": mix, "steps": steps}, out, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
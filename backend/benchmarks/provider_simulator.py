@@ -0,0 +1,144 @@
+"""
+Local stand-in for the Open-Meteo forecast and geocoding APIs, for load tests that must not hit the real service.
+
+Serves the two endpoints the app calls, with the same response shapes:
+  - GET /v1/forecast?latitude=..&longitude=..&current_weather=true   (comma-separated lists for batches)
+  - GET /v1/search?name=..&count=..                                   (deterministic cities per query)
+Every request waits a latency drawn from --latency, fails with a 503 at --error-rate, and is answered 429
+beyond --rate-limit requests/s (token bucket, per endpoint). Counters are served at GET /stats.
+
+Point the app at it with:
+    WEATHER_PROVIDER_BASE_URL=http://127.0.0.1:8090/v1/forecast
+    CITY_GEOCODING_BASE_URL=http://127.0.0.1:8090/v1/search
+
+Usage (from backend/, with requirements-async.txt installed):
+    python benchmarks/provider_simulator.py --port 8090 --latency lognormal:80:400 --error-rate 0.01 --rate-limit 200
+Latency distributions (milliseconds): fixed:MS, uniform:LOW:HIGH, lognormal:MEDIAN:P99
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import Counter
+from typing import Callable, Optional
+from aiohttp import web
+
+CITY_SUFFIXES = ("", "ville", "burg", "stadt", "ton", "field", "mouth", "haven", "dorf", "sur-Mer")
+COUNTRY_CODES = ("FR", "DE", "ES", "IT", "PT", "AT", "CZ", "NO", "IE", "GB")
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Sampler of delays in seconds for `fixed:MS`, `uniform:LOW:HIGH` or `lognormal:MEDIAN:P99` (milliseconds)."""
+    kind, *values = spec.split(":")
+    values = [float(value) / 1000 for value in values]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        median, p99 = values
+        # P99 of a lognormal is median * exp(2.326 * sigma)
+        sigma = math.log(p99 / median) / 2.326 if p99 > median else 0.0
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    raise argparse.ArgumentTypeError(f"invalid latency distribution: {spec}")
+
+class TokenBucket:
+    """`rate` requests/s with bursts up to one second's worth; rate 0 = unlimited."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+def create_simulator(latency: Callable[[], float], error_rate: float, rate_limit: float) -> web.Application:
+    counters: Counter = Counter()
+    buckets = {"forecast": TokenBucket(rate_limit), "search": TokenBucket(rate_limit)}
+
+    async def simulate(endpoint: str) -> Optional[web.Response]:
+        """Applies rate limiting, latency and injected failures. Returns an error response, or None to proceed."""
+        counters[f"{endpoint}_requests"] += 1
+        if not buckets[endpoint].take():
+            counters[f"{endpoint}_429"] += 1
+            return web.json_response({"error": True, "reason": "Too many requests"}, status=429)
+        await asyncio.sleep(latency())
+        if random.random() < error_rate:
+            counters[f"{endpoint}_503"] += 1
+            return web.json_response({"error": True, "reason": "Simulated outage"}, status=503)
+        return None
+
+    async def forecast(request: web.Request) -> web.Response:
+        error = await simulate("forecast")
+        if error is not None:
+            return error
+        try:
+            latitudes = [float(value) for value in request.query["latitude"].split(",")]
+            longitudes = [float(value) for value in request.query["longitude"].split(",")]
+        except (KeyError, ValueError):
+            return web.json_response({"error": True, "reason": "Invalid coordinates"}, status=400)
+        locations = [
+            {
+                "latitude": lat,
+                "longitude": lon,
+                # Plausible and stable per location, drifting slowly over time
+                "current_weather": {"temperature": round(25 - abs(lat) * 0.4 + math.sin(time.time() / 600 + lon) * 3, 1)},
+            }
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+        return web.json_response(locations[0] if len(locations) == 1 else locations)
+
+    async def search(request: web.Request) -> web.Response:
+        error = await simulate("search")
+        if error is not None:
+            return error
+        name = request.query.get("name", "").strip()
+        count = int(request.query.get("count", "10"))
+        # Like a real gazetteer, short prefixes match many places and longer queries few
+        matches = min(count, max(0, len(CITY_SUFFIXES) - 2 * (len(name) - 3)))
+        results = []
+        for i in range(matches):
+            seed = int(hashlib.sha256(f"{name.lower()}:{i}".encode()).hexdigest()[:12], 16)
+            results.append({
+                "name": f"{name.title()}{CITY_SUFFIXES[i]}",
+                "country_code": COUNTRY_CODES[seed % len(COUNTRY_CODES)],
+                "latitude": round((seed % 18000) / 100 - 90, 4),
+                "longitude": round((seed // 18000 % 36000) / 100 - 180, 4),
+            })
+        return web.json_response({"results": results} if results else {})
+
+    async def stats(_request: web.Request) -> web.Response:
+        return web.json_response(dict(counters))
+
+    app = web.Application()
+    app.router.add_get("/v1/forecast", forecast)
+    app.router.add_get("/v1/search", search)
+    app.router.add_get("/stats", stats)
+    return app
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=parse_latency, default="lognormal:80:400", help="delay distribution (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/s per endpoint before 429 (0 = none)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(
+        create_simulator(args.latency, args.error_rate, args.rate_limit),
+        host=args.host, port=args.port, access_log=None, backlog=4096
+    )
@@ -1,17 +1,24 @@
-from app import create_app
-from app.core.database import init_db
+from app.core.config import Config
 
-connexion_app = create_app()
+if Config.APP_SERVER_MODE == "async":
+    from app.aio import create_async_app
+    connexion_app = create_async_app()
+else:
+    from app import create_app
+    connexion_app = create_app()
 app = connexion_app.app
 
 if __name__ == '__main__':
     from app.core.logging import setup_logging
     setup_logging()
     
-    print("Initializing database...")
-    init_db()
+    # The database is provisioned separately (python -m app.cli init-db), once per deployment
     
-    # Run using the standard Flask development server
-    # With Connexion 2.x, routes are registered on 'app'
-    # Use 0.0.0.0 to bind to all interfaces, making it accessible from outside the container
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    if Config.APP_SERVER_MODE == "async":
+        # aiohttp server: one event loop for all requests, DB work on the ASYNC_DB_WORKERS pool
+        connexion_app.run(host="0.0.0.0", port=8080)
+    else:
+        # Run using the standard Flask development server
+        # With Connexion 2.x, routes are registered on 'app'
+        # Use 0.0.0.0 to bind to all interfaces, making it accessible from outside the container
+        app.run(host="0.0.0.0", port=8080, debug=False)
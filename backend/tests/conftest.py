@@ -1,11 +1,21 @@
+import os
+from contextlib import contextmanager
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
+
+# Tests check every response against the spec and fail on any violation (set before Config is imported)
+os.environ.setdefault("RESPONSE_VALIDATION_SAMPLE_RATE", "1")
+os.environ.setdefault("RESPONSE_VALIDATION_STRICT", "true")
+
 from app import create_app
 from app.core.database import Base, get_session
+from app.core.db_pool_metrics import PoolMetrics
+from app.core.query_accounting import attach as attach_query_accounting, track_queries
 
 # 1. Create a SINGLE in-memory engine for the entire test session
 TEST_ENGINE = create_engine("sqlite:///:memory:")
+attach_query_accounting(TEST_ENGINE)
 
 @pytest.fixture(scope="session")
 def app():
@@ -72,6 +82,21 @@ def client(app, session):
     """A test client for the app, depending on the session fixture to ensure monkeypatching is active."""
     return app.test_client()
 
+@pytest.fixture
+def read_replica(app, monkeypatch):
+    """
+    Routes read sessions to a separate, empty in-memory database standing in for a lagging replica.
+    Yields its session factory so tests can seed it.
+    """
+    replica_engine = create_engine("sqlite:///:memory:")
+    attach_query_accounting(replica_engine)
+    Base.metadata.create_all(bind=replica_engine)
+    replica_sessions = sessionmaker(bind=replica_engine)
+    monkeypatch.setattr("app.core.database.ReadSessionLocal", replica_sessions)
+    monkeypatch.setattr("app.core.database.read_pool_metrics", PoolMetrics())
+    yield replica_sessions
+    replica_engine.dispose()
+
 @pytest.fixture
 def auth_header(client):
     """Helper to get an auth header for a fresh user."""
@@ -87,3 +112,32 @@ def auth_header(client):
     })
     token = resp.json["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Process-wide caches outlive a single test; reset them so tests stay independent."""
+    from app.api.response_validation import stats as response_validation_stats
+    from app.core.metrics import registry as metrics_registry
+    from app.core.security import clear_token_cache
+    from app.services.city_search_service import CitySearchService
+    from app.services.weather_service import WeatherService
+    CitySearchService.clear_cache()
+    WeatherService.clear_cache()
+    clear_token_cache()
+    response_validation_stats.clear()
+    metrics_registry.clear()
+    yield
+
+@pytest.fixture
+def assert_num_queries():
+    """
+    `with assert_num_queries(3): client.get(...)` fails unless the block runs exactly that many SQL statements,
+    so N+1 regressions (and extra round trips) break the build. The failure lists the statements.
+    """
+    @contextmanager
+    def check(expected: int):
+        with track_queries("test", keep_statements=True) as stats:
+            yield stats
+        executed = "\n".join(f"  {statement}" for statement in stats.executed)
+        assert stats.statements == expected, f"expected {expected} SQL statements, got {stats.statements}:\n{executed}"
+    return check
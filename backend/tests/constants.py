@@ -3,3 +3,5 @@ DEFAULT_USERNAME = "testuser"
 ZONE_A_NAME = "Test Zone A"
 ZONE_A_LAT = 45.0
 ZONE_A_LON = 12.0
+# Provider calls go through the pooled session in app.core.http_client
+PROVIDER_HTTP_GET = "requests.Session.get"
@@ -0,0 +1,176 @@
+"""Async serving mode tests (aiohttp flavour of the same OpenAPI spec)."""
+
+import asyncio
+from concurrent.futures import Executor, Future
+from unittest.mock import patch
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+from app.aio import create_async_app
+from app.core.aio_http_client import AsyncProviderHttpClient
+from tests.constants import DEFAULT_USERNAME, DEFAULT_PASSWORD, ZONE_A_NAME, ZONE_A_LAT, ZONE_A_LON, PROVIDER_HTTP_GET
+
+ASYNC_PROVIDER_GET = "app.core.aio_http_client.AsyncProviderHttpClient.get_json"
+
+class _InlineExecutor(Executor):
+    """Runs DB work on the calling thread: the test SQLite connection is bound to the main thread."""
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+def _run(scenario):
+    """Serves the async app on a local port and runs `scenario(client, headers)` against it."""
+    async def main():
+        connexion_app = create_async_app(executor=_InlineExecutor())
+        async with TestClient(TestServer(connexion_app.app)) as client:
+            credentials = {"username": DEFAULT_USERNAME, "password": DEFAULT_PASSWORD}
+            await client.post("/api/v1/auth/register", json=credentials)
+            resp = await client.post("/api/v1/auth/login", json=credentials)
+            token = (await resp.json())["access_token"]
+            return await scenario(client, {"Authorization": f"Bearer {token}"})
+    return asyncio.run(main())
+
+async def _create_zone(client, headers):
+    resp = await client.post("/api/v1/zones", headers=headers, json={
+        "name": ZONE_A_NAME, "latitude": ZONE_A_LAT, "longitude": ZONE_A_LON
+    })
+    assert resp.status == 201
+    return (await resp.json())["id"]
+
+def test_async_mode_crud_matches_sync_mode(session):
+    """CRUD handlers run unchanged on the worker pool: same payloads, status codes and errors."""
+    async def scenario(client, headers):
+        zone_id = await _create_zone(client, headers)
+
+        resp = await client.get("/api/v1/zones", headers=headers)
+        assert resp.status == 200
+        assert [z["id"] for z in (await resp.json())["items"]] == [zone_id]
+
+        # Not captured by /zones/{zone_id}
+        resp = await client.get("/api/v1/zones/nearby", headers=headers, params={"lat": ZONE_A_LAT, "lon": ZONE_A_LON, "radius_km": 1})
+        assert resp.status == 200
+        assert [z["id"] for z in (await resp.json())["items"]] == [zone_id]
+
+        resp = await client.put(f"/api/v1/zones/{zone_id}", headers=headers, json={
+            "name": "Renamed", "latitude": ZONE_A_LAT, "longitude": ZONE_A_LON
+        })
+        assert resp.status == 200
+        assert (await resp.json())["name"] == "Renamed"
+
+        resp = await client.delete(f"/api/v1/zones/{zone_id}", headers=headers)
+        assert resp.status == 204
+
+        resp = await client.get(f"/api/v1/zones/{zone_id}", headers=headers)
+        assert resp.status == 404
+
+        resp = await client.get("/api/v1/zones")
+        assert resp.status == 401
+
+    _run(scenario)
+
+def test_async_refresh_uses_async_client_and_coalesces(session):
+    """Concurrent refreshes of one zone share a single non-blocking provider call; the sync client is never used."""
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return {"current_weather": {"temperature": 21.5}}
+
+    async def scenario(client, headers):
+        zone_id = await _create_zone(client, headers)
+        with patch(ASYNC_PROVIDER_GET, side_effect=slow_get) as mock_get, patch(PROVIDER_HTTP_GET) as sync_get:
+            responses = await asyncio.gather(*[
+                client.post(f"/api/v1/zones/{zone_id}/refresh", headers=headers) for _ in range(5)
+            ])
+            bodies = [await resp.json() for resp in responses]
+
+        assert [resp.status for resp in responses] == [200] * 5
+        assert all(body["temperature"] == 21.5 for body in bodies)
+        assert mock_get.call_count == 1
+        sync_get.assert_not_called()
+
+        # One shared observation, so one history reading (`from` reaches the handler's catch-all here too)
+        resp = await client.get(f"/api/v1/zones/{zone_id}/history", headers=headers, params={"from": "2000-01-01T00:00:00Z"})
+        assert resp.status == 200
+        assert [point["readings"] for point in (await resp.json())["points"]] == [1]
+
+        resp = await client.post("/api/v1/zones/999999/refresh", headers=headers)
+        assert resp.status == 404
+
+    _run(scenario)
+
+def test_async_refresh_provider_failure(session):
+    from app.core.aio_http_client import ProviderRequestError
+
+    async def scenario(client, headers):
+        zone_id = await _create_zone(client, headers)
+        with patch(ASYNC_PROVIDER_GET, side_effect=ProviderRequestError("503")):
+            resp = await client.post(f"/api/v1/zones/{zone_id}/refresh", headers=headers)
+        assert resp.status == 503
+
+    _run(scenario)
+
+def test_async_mode_metrics(session):
+    """Requests are labelled by operationId and status on the aiohttp flavour too; /internal/metrics serves text."""
+    from app.core.config import Config
+
+    async def scenario(client, headers):
+        zone_id = await _create_zone(client, headers)
+        await client.get(f"/api/v1/zones/{zone_id}", headers=headers)
+        await client.get("/api/v1/zones")
+        with patch.object(Config, "INTERNAL_API_TOKEN", "token"):
+            resp = await client.get("/internal/metrics", headers={"X-Internal-Token": "token"})
+        assert resp.status == 200
+        assert resp.content_type == "text/plain"
+        return await resp.text()
+
+    text_body = _run(scenario)
+    assert 'weather_app_http_requests_total{operation="app.api.zones.get_zone",status="200"} 1' in text_body
+    assert 'weather_app_http_requests_total{operation="app.api.zones.list_zones",status="401"} 1' in text_body
+    assert 'weather_app_http_request_duration_seconds_count{operation="app.api.auth.login"} 1' in text_body
+
+def test_async_city_search(session):
+    async def scenario(client, headers):
+        payload = {"results": [{"name": "Paris", "country_code": "FR", "latitude": 48.8566, "longitude": 2.3522}]}
+        with patch(ASYNC_PROVIDER_GET, return_value=payload) as mock_get:
+            first = await client.get("/api/v1/cities/search", headers=headers, params={"q": "Paris"})
+            second = await client.get("/api/v1/cities/search", headers=headers, params={"q": "paris"})
+
+        assert first.status == second.status == 200
+        assert (await first.json())["results"][0]["name"] == "Paris"
+        assert await second.json() == await first.json()
+        # Shares the query cache with the sync mode
+        assert mock_get.call_count == 1
+
+    _run(scenario)
+
+def test_async_client_retries_then_raises():
+    """Provider client retries 5xx with backoff and surfaces exhaustion as `ProviderRequestError`."""
+    from aiohttp import web
+    from app.core.aio_http_client import ProviderRequestError
+    calls = []
+
+    async def handler(request):
+        calls.append(request.path)
+        return web.Response(status=503) if len(calls) < 3 else web.json_response({"ok": True})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with TestServer(app) as server:
+            client = AsyncProviderHttpClient(max_retries=2, backoff_factor=0, backoff_jitter=0)
+            try:
+                assert await client.get_json(str(server.make_url("/"))) == {"ok": True}
+                calls.clear()
+                client.max_retries = 1
+                with pytest.raises(ProviderRequestError):
+                    await client.get_json(str(server.make_url("/")))
+                assert client.stats()["failures"] == 1
+            finally:
+                await client.close()
+
+    asyncio.run(main())
+    assert len(calls) == 2
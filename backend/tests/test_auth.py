@@ -39,3 +39,221 @@ def test_login_failure(client):
         "password": "WRONGpassword"
     })
     assert resp.status_code == 401
+
+def test_login_rehashes_password_with_current_parameters(client, session):
+    """Hashes made with older Argon2 parameters are transparently upgraded on the next successful login."""
+    from unittest.mock import patch
+    from app.core.password_hasher import Argon2Params, get_password_hasher
+    from app.models.user import User
+    hasher = get_password_hasher()
+    old_params = Argon2Params(time_cost=1, memory_kib=1024, parallelism=1)
+    new_params = Argon2Params(time_cost=2, memory_kib=2048, parallelism=1)
+
+    with patch.object(hasher, "params", old_params):
+        client.post("/api/v1/auth/register", json={"username": "rehashuser", "password": DEFAULT_PASSWORD})
+    stored = session.query(User.password_hash).filter(User.username == "rehashuser").scalar()
+    assert "m=1024,t=1" in stored
+
+    with patch.object(hasher, "params", new_params):
+        resp = client.post("/api/v1/auth/login", json={"username": "rehashuser", "password": DEFAULT_PASSWORD})
+        assert resp.status_code == 200
+        rehashed = session.query(User.password_hash).filter(User.username == "rehashuser").scalar()
+        assert "m=2048,t=2" in rehashed
+
+        # Already current: no further rewrite
+        client.post("/api/v1/auth/login", json={"username": "rehashuser", "password": DEFAULT_PASSWORD})
+        assert session.query(User.password_hash).filter(User.username == "rehashuser").scalar() == rehashed
+
+def test_password_hasher_pool_and_queue_bound():
+    """Jobs run on worker processes started on first use; beyond `max_queue` pending jobs, callers get 503."""
+    import threading
+    from unittest.mock import patch
+    import pytest
+    from app.core.exceptions import PasswordHashingBusy
+    from app.core.password_hasher import Argon2Params, PasswordHasher
+    params = Argon2Params(time_cost=1, memory_kib=1024, parallelism=1)
+
+    pooled = PasswordHasher(params, workers=1, max_queue=4)
+    try:
+        # No processes until the first job
+        assert pooled._executor is None
+        hashed = pooled.hash(DEFAULT_PASSWORD)
+        assert pooled._executor is not None
+        assert pooled.verify_and_update(DEFAULT_PASSWORD, hashed) == (True, None)
+        assert pooled.verify_and_update("WrongPassword1!", hashed)[0] is False
+        stats = pooled.stats()
+        assert stats["completed"] == 3
+        assert stats["in_flight"] == 0
+    finally:
+        pooled.shutdown()
+
+    inline = PasswordHasher(params, workers=0, max_queue=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(*args):
+        started.set()
+        release.wait(5)
+        return "hash"
+
+    with patch("app.core.password_hasher._hash", side_effect=slow_hash):
+        worker = threading.Thread(target=inline.hash, args=(DEFAULT_PASSWORD,))
+        worker.start()
+        started.wait(5)
+        with pytest.raises(PasswordHashingBusy):
+            inline.hash(DEFAULT_PASSWORD)
+        release.set()
+        worker.join()
+
+    stats = inline.stats()
+    assert stats["rejected"] == 1
+    assert stats["peak_in_flight"] == 1
+
+def test_password_hasher_exported_and_calibration_not_per_worker(client):
+    """Hashing counters reach /internal/metrics; a latency target is not calibrated per process when several run."""
+    from unittest.mock import patch
+    from app.core.config import Config
+    from app.core.metrics import registry
+    from app.core.password_hasher import configured_params
+    client.post("/api/v1/auth/register", json={"username": "metricsuser", "password": DEFAULT_PASSWORD})
+    text_body = registry.collect()
+    assert 'weather_app_password_hash_jobs_total{result="completed"}' in text_body
+    assert "weather_app_password_hash_in_flight 0" in text_body
+
+    with patch.object(Config, "PASSWORD_HASH_TARGET_MS", 250.0), patch.object(Config, "WEB_CONCURRENCY", 4), \
+            patch("app.core.password_hasher.calibrate") as calibrate:
+        assert configured_params().time_cost == Config.PASSWORD_HASH_TIME_COST
+    assert calibrate.call_count == 0
+
+def test_verified_token_cache_still_rejects_expired_and_tampered_tokens():
+    """Repeat tokens skip `jwt.decode`, but tampering and expiry are never masked by the cache."""
+    import time
+    from datetime import timedelta
+    from unittest.mock import patch
+    import jwt
+    import pytest
+    from connexion.exceptions import OAuthProblem
+    from app.core.security import create_access_token, decode_token, token_cache_stats
+
+    token = create_access_token(user_id=42)
+    first = decode_token(token)
+    with patch("app.core.security.jwt.decode", wraps=jwt.decode) as full_decode:
+        second = decode_token(token)
+        full_decode.assert_not_called()
+    assert second == first and second["sub"] == "42"
+    # Callers get their own copy; mutating it cannot poison the cache
+    second["sub"] = "1"
+    assert decode_token(token)["sub"] == "42"
+    assert token_cache_stats()["hits"] == 2
+
+    header, payload, signature = token.split(".")
+    tampered_signature = signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")
+    with pytest.raises(OAuthProblem):
+        decode_token(f"{header}.{payload}.{tampered_signature}")
+    forged = jwt.encode({"sub": "42", "exp": first["exp"]}, "an-attacker-key-that-is-not-the-app-secret", algorithm="HS256")
+    with pytest.raises(OAuthProblem):
+        decode_token(forged)
+
+    short_lived = create_access_token(user_id=42, expires_delta=timedelta(seconds=1))
+    decode_token(short_lived)
+    time.sleep(1.1)
+    with pytest.raises(OAuthProblem):
+        decode_token(short_lived)
+
+def _login(client, username):
+    client.post("/api/v1/auth/register", json={"username": username, "password": DEFAULT_PASSWORD})
+    resp = client.post("/api/v1/auth/login", json={"username": username, "password": DEFAULT_PASSWORD})
+    assert resp.status_code == 200
+    return resp.json
+
+def test_refresh_rotates_tokens_without_password_check(client):
+    """A refresh token buys a new token pair via one lookup; the password hasher is never involved."""
+    from unittest.mock import patch
+    tokens = _login(client, "refreshuser")
+    assert tokens["refresh_token"]
+
+    with patch("app.core.password_hasher.PasswordHasher.verify_and_update") as verify:
+        resp = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        verify.assert_not_called()
+    assert resp.status_code == 200
+    assert resp.json["refresh_token"] != tokens["refresh_token"]
+    assert resp.json["expires_in"] > 0
+
+    resp = client.get("/api/v1/zones", headers={"Authorization": f"Bearer {resp.json['access_token']}"})
+    assert resp.status_code == 200
+
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": "never-issued"})
+    assert resp.status_code == 401
+
+def test_refresh_token_reuse_revokes_the_sign_in(client):
+    """Replaying a rotated refresh token kills every token of that sign-in, including the newest one."""
+    first = _login(client, "reuseuser")["refresh_token"]
+    second = client.post("/api/v1/auth/refresh", json={"refresh_token": first}).json["refresh_token"]
+
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert resp.status_code == 401
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": second})
+    assert resp.status_code == 401
+
+    # Other sign-ins of the same user are unaffected
+    other = client.post("/api/v1/auth/login", json={"username": "reuseuser", "password": DEFAULT_PASSWORD}).json
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": other["refresh_token"]})
+    assert resp.status_code == 200
+
+def test_logout_revokes_refresh_token(client):
+    tokens = _login(client, "logoutuser")
+    resp = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 204
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+    # Idempotent
+    resp = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 204
+
+def test_expired_refresh_token_is_rejected(client):
+    from unittest.mock import patch
+    from app.core.config import Config
+    with patch.object(Config, "REFRESH_TOKEN_EXPIRE_DAYS", 0):
+        tokens = _login(client, "expireduser")
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+def test_purge_refresh_tokens_keeps_only_live_sign_ins(client, session):
+    """Expired tokens and ended sign-ins are deleted; a live sign-in keeps its rotated tokens for reuse detection."""
+    from datetime import datetime, timedelta, timezone
+    from unittest.mock import patch
+    from app.core.config import Config
+    from app.models.refresh_token import RefreshToken
+    from app.repo.refresh_token_repository import RefreshTokenRepository
+    from app.core.security import hash_refresh_token
+
+    live = _login(client, "purgeuser")["refresh_token"]
+    rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": live}).json["refresh_token"]
+    credentials = {"username": "purgeuser", "password": DEFAULT_PASSWORD}
+    logged_out = client.post("/api/v1/auth/login", json=credentials).json["refresh_token"]
+    client.post("/api/v1/auth/logout", json={"refresh_token": logged_out})
+    with patch.object(Config, "REFRESH_TOKEN_EXPIRE_DAYS", 0):
+        client.post("/api/v1/auth/login", json=credentials)
+
+    repo = RefreshTokenRepository(session)
+    now = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=1)
+    assert repo.purge_dead(now, limit=1) == 1
+    assert repo.purge_dead(now, limit=10) == 1
+    assert repo.purge_dead(now, limit=10) == 0
+    remaining = {token.token_hash for token in session.query(RefreshToken).all()}
+    assert remaining == {hash_refresh_token(live), hash_refresh_token(rotated)}
+
+def test_login_looks_up_user_on_replica(client, read_replica):
+    """Credential lookups are served by the replica, falling back to the primary for not-yet-replicated users."""
+    from app.core.security import hash_password
+    from app.models.user import User
+    credentials = {"username": "replicauser", "password": DEFAULT_PASSWORD}
+    client.post("/api/v1/auth/register", json=credentials)
+
+    # Not on the replica yet: the primary answers
+    assert client.post("/api/v1/auth/login", json=credentials).status_code == 200
+
+    # Once replicated, the replica's row is used (here deliberately holding another password)
+    with read_replica() as replica:
+        replica.add(User(username="replicauser", password_hash=hash_password("OtherPassword123!")))
+        replica.commit()
+    assert client.post("/api/v1/auth/login", json=credentials).status_code == 401
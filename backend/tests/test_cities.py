@@ -1,7 +1,9 @@
 """City search API tests."""
 
+import sys
+import pytest
 from unittest.mock import patch, Mock
-from tests.constants import DEFAULT_USERNAME, DEFAULT_PASSWORD
+from tests.constants import DEFAULT_USERNAME, DEFAULT_PASSWORD, PROVIDER_HTTP_GET
 
 def test_search_cities_success(client, auth_header):
     """Test successful city search."""
@@ -25,7 +27,7 @@ def test_search_cities_success(client, auth_header):
     }
     mock_response.raise_for_status = Mock()
     
-    with patch("app.services.city_search_service.requests.get", return_value=mock_response):
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Paris"})
         
         assert resp.status_code == 200
@@ -53,7 +55,7 @@ def test_search_cities_no_results(client, auth_header):
     mock_response.json.return_value = {"results": []}
     mock_response.raise_for_status = Mock()
     
-    with patch("app.services.city_search_service.requests.get", return_value=mock_response):
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "NonexistentCity12345"})
         
         assert resp.status_code == 200
@@ -76,7 +78,7 @@ def test_search_cities_max_results_limit(client, auth_header):
     }
     mock_response.raise_for_status = Mock()
     
-    with patch("app.services.city_search_service.requests.get", return_value=mock_response):
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "City"})
         
         assert resp.status_code == 200
@@ -87,7 +89,7 @@ def test_search_cities_api_failure_handling(client, auth_header):
     """Test that API failures return 503 Service Unavailable."""
     import requests
     
-    with patch("app.services.city_search_service.requests.get", side_effect=requests.RequestException("API Error")):
+    with patch(PROVIDER_HTTP_GET, side_effect=requests.RequestException("API Error")):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Paris"})
         
         # Should return 503 when external API is unavailable
@@ -109,7 +111,7 @@ def test_search_cities_partial_match(client, auth_header):
     }
     mock_response.raise_for_status = Mock()
     
-    with patch("app.services.city_search_service.requests.get", return_value=mock_response):
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Ber"})
         
         assert resp.status_code == 200
@@ -131,9 +133,188 @@ def test_search_cities_missing_country_code(client, auth_header):
     }
     mock_response.raise_for_status = Mock()
     
-    with patch("app.services.city_search_service.requests.get", return_value=mock_response):
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response):
         resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Test"})
         
         assert resp.status_code == 200
         assert len(resp.json["results"]) == 1
         assert resp.json["results"][0]["country_code"] is None
+
+def test_search_cities_repeat_query_served_from_cache(client, auth_header):
+    """Equivalent queries (case, whitespace) hit the cache instead of the provider."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "results": [{"name": "Vienna", "country_code": "AT", "latitude": 48.2082, "longitude": 16.3738}]
+    }
+    mock_response.raise_for_status = Mock()
+
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response) as mock_get:
+        first = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Vienna"})
+        second = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "  vienna "})
+
+    assert mock_get.call_count == 1
+    assert first.json == second.json
+
+def test_search_cities_typeahead_reuses_complete_prefix(client, auth_header):
+    """A longer query is filtered from a cached prefix result that was not truncated."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "results": [
+            {"name": "Berlin", "country_code": "DE", "latitude": 52.52, "longitude": 13.405},
+            {"name": "Bern", "country_code": "CH", "latitude": 46.948, "longitude": 7.4474},
+            {"name": "Bergamo", "country_code": "IT", "latitude": 45.6983, "longitude": 9.6773}
+        ]
+    }
+    mock_response.raise_for_status = Mock()
+
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response) as mock_get:
+        client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Ber"})
+        resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Berl"})
+
+    assert mock_get.call_count == 1
+    assert [c["name"] for c in resp.json["results"]] == ["Berlin"]
+
+def test_prefix_hit_counter_is_exact_under_concurrency():
+    """Prefix answers from many request threads are all counted (the increment is not a lost update)."""
+    import threading
+    from app.dtos.city_dto import CitySearchResult
+    from app.services.city_search_service import CitySearchService, _CachedSearch, _search_cache
+    berlin = CitySearchResult(name="Berlin", country_code="DE", latitude=52.52, longitude=13.405)
+    _search_cache.set("ber", _CachedSearch(results=(berlin,), complete=True))
+    service = CitySearchService()
+
+    def answer():
+        for _ in range(500):
+            assert service._answer_from_prefix("berl") is not None
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=answer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert CitySearchService.cache_stats()["prefix_hits"] == 8 * 500
+
+def test_search_cities_truncated_prefix_not_reused(client, auth_header):
+    """A prefix whose results were cut off at MAX_RESULTS may miss matches, so the provider is asked again."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "results": [
+            {"name": f"Spring{i}", "country_code": "US", "latitude": 40.0, "longitude": -70.0}
+            for i in range(5)
+        ]
+    }
+    mock_response.raise_for_status = Mock()
+
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response) as mock_get:
+        client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Spr"})
+        client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Spri"})
+
+    assert mock_get.call_count == 2
+
+GEONAMES_ROWS = [
+    # geonameid, name, asciiname, alternatenames, lat, lon, class, code, country, cc2, admin1-4, population
+    ["2950159", "Berlin", "Berlin", "", "52.52437", "13.41053", "P", "PPLC", "DE", "", "16", "", "", "", "3426354"],
+    ["5083330", "Berlin", "Berlin", "", "44.46867", "-71.18508", "P", "PPL", "US", "", "NH", "", "", "", "9367"],
+    ["2661552", "Bern", "Bern", "", "46.94809", "7.44744", "P", "PPLC", "CH", "", "BE", "", "", "", "121631"],
+    ["3182164", "Bergamo", "Bergamo", "", "45.69601", "9.66721", "P", "PPLA2", "IT", "", "09", "", "", "", "121781"],
+    ["2867714", "München", "Muenchen", "", "48.13743", "11.57549", "P", "PPLA", "DE", "", "02", "", "", "", "1260391"],
+    ["2950158", "Berlin Lake", "Berlin Lake", "", "52.5", "13.4", "H", "LK", "DE", "", "", "", "", "", "0"],
+]
+
+def _write_geonames(path):
+    path.write_text("\n".join("\t".join(row) for row in GEONAMES_ROWS) + "\n", encoding="utf-8")
+    return str(path)
+
+def test_gazetteer_index_prefix_search_ranked_by_population(tmp_path):
+    """The local index matches name prefixes (case-insensitive, ASCII aliases included) and ranks by population."""
+    from app.services.gazetteer_index import GazetteerIndex
+    index = GazetteerIndex.from_geonames(_write_geonames(tmp_path / "cities.txt"))
+
+    results = index.search("BER", limit=5)
+    assert [(c.name, c.country_code) for c in results] == [
+        ("Berlin", "DE"), ("Bergamo", "IT"), ("Bern", "CH"), ("Berlin", "US")
+    ]
+    assert index.search("berl", limit=1)[0].latitude == 52.5244
+    # Non-populated features are skipped; ASCII spelling resolves to the original name
+    assert index.search("muen", limit=5)[0].name == "München"
+    assert index.search("münch", limit=5)[0].name == "München"
+    assert index.search("xyz", limit=5) == []
+
+def test_gazetteer_index_persists_and_memory_maps(tmp_path):
+    """A saved index reloads via mmap with identical answers."""
+    from app.services.gazetteer_index import GazetteerIndex
+    built = GazetteerIndex.from_geonames(_write_geonames(tmp_path / "cities.txt"))
+    index_path = str(tmp_path / "cities.idx")
+    built.save(index_path)
+
+    loaded = GazetteerIndex.load(index_path)
+    assert loaded.size == built.size
+    assert loaded.search("be", limit=5) == built.search("be", limit=5)
+
+def test_gazetteer_index_short_prefixes_match_the_ranked_key_range():
+    """Precomputed top-k answers for 1-3 character prefixes equal ranking every matching key."""
+    from app.services.gazetteer_index import GazetteerIndex, _TOP_K
+    names = ["Aachen", "Aalen", "Abu Dhabi", "Accra", "Ab", "A", "Zürich", "Zug", "Ämari"]
+    rows = [(name, name.replace("ü", "u").replace("Ä", "A"), 0.0, 0.0, 1000 + i, "XX") for i, name in enumerate(names)]
+    index = GazetteerIndex.build(rows)
+
+    for query in ("a", "AA", "ab", "abu", "z", "zü", "zur", "ä", "q"):
+        # A limit above _TOP_K bypasses the precomputed lists and ranks the whole key range
+        assert index.search(query, limit=5) == index.search(query, limit=_TOP_K + 1)[:5], query
+    assert [c.name for c in index.search("a", limit=3)] == ["Ämari", "A", "Ab"]
+
+def test_gazetteer_index_crowded_long_prefixes_are_ranked_at_build_time(monkeypatch):
+    """Prefixes longer than 3 characters matching many keys read a precomputed top-k; no lookup scans more keys."""
+    import app.services.gazetteer_index as gazetteer
+    monkeypatch.setattr(gazetteer, "_RANGE_SCAN_MAX", 4)
+    names = [f"San {suffix}" for suffix in ("Jose", "Juan", "Jacinto", "Javier", "Diego", "Dimas", "Luis", "Lucas")]
+    names += ["San", "San", "Sankt Gallen", "Santa Ana", "Santa Fe", "Santo Andre", "Santos", "Santiago"]
+    rows = [(name, name, 0.0, 0.0, 7919 * i % 1000, "XX") for i, name in enumerate(names)]
+    index = gazetteer.GazetteerIndex.build(rows)
+
+    nlargest = gazetteer.heapq.nlargest
+    scanned = []
+    def counting_nlargest(n, candidates, key):
+        scanned.append(len(candidates))
+        return nlargest(n, candidates, key=key)
+
+    for query in ("san j", "san ja", "sant", "santa", "san d", "sanx", "san jose"):
+        scanned.clear()
+        with patch.object(gazetteer.heapq, "nlargest", counting_nlargest):
+            precomputed = index.search(query, limit=3)
+        assert all(count <= 4 for count in scanned), query
+        # A limit above _TOP_K bypasses the precomputed lists and ranks the whole key range
+        assert precomputed == index.search(query, limit=gazetteer._TOP_K + 1)[:3], query
+    assert [c.name for c in index.search("san j", limit=2)] == ["San Juan", "San Jacinto"]
+
+def test_gazetteer_index_rejects_a_file_built_with_the_other_byte_order(tmp_path):
+    """The arrays are read in native order, so an index from a host of the other endianness must be rebuilt."""
+    from app.services.gazetteer_index import GazetteerIndex
+    data = bytearray(GazetteerIndex.from_geonames(_write_geonames(tmp_path / "cities.txt"))._buffer)
+    # Header: 4-byte magic, then the builder's byte order as b"l" / b"b"
+    assert data[4:5] == sys.byteorder.encode("ascii")[:1]
+    data[4:5] = b"b" if sys.byteorder == "little" else b"l"
+    with pytest.raises(ValueError, match="byte order"):
+        GazetteerIndex(bytes(data))
+
+def test_search_cities_local_backend_makes_no_external_call(client, auth_header, tmp_path, monkeypatch):
+    """With CITY_SEARCH_BACKEND=local the endpoint is served from the gazetteer index."""
+    import app.services.gazetteer_index as gazetteer
+    from app.core.config import Config
+    monkeypatch.setattr(Config, "CITY_SEARCH_BACKEND", "local")
+    monkeypatch.setattr(Config, "CITY_GAZETTEER_PATH", _write_geonames(tmp_path / "cities.txt"))
+    monkeypatch.setattr(Config, "CITY_GAZETTEER_INDEX_PATH", str(tmp_path / "cities.idx"))
+    monkeypatch.setattr(gazetteer, "_index", None)
+
+    with patch(PROVIDER_HTTP_GET) as mock_get:
+        resp = client.get("/api/v1/cities/search", headers=auth_header, query_string={"q": "Bern"})
+
+    assert mock_get.call_count == 0
+    assert resp.status_code == 200
+    assert resp.json["results"][0]["name"] == "Bern"
+    assert (tmp_path / "cities.idx").exists()
@@ -0,0 +1,268 @@
+"""Internal operational endpoints and the instrumented DB pool behind them."""
+
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from app.core.config import Config
+from app.core.database import engine_options
+from app.core.db_pool_metrics import PoolMetrics
+
+INTERNAL_TOKEN = "internal-test-token"
+
+def test_internal_endpoints_require_token(client):
+    """No token, a wrong token, or an unset INTERNAL_API_TOKEN all get 401."""
+    with patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN):
+        assert client.get("/internal/db/pool").status_code == 401
+        assert client.get("/internal/db/pool", headers={"X-Internal-Token": "wrong"}).status_code == 401
+
+    with patch.object(Config, "INTERNAL_API_TOKEN", None):
+        assert client.get("/internal/db/pool", headers={"X-Internal-Token": INTERNAL_TOKEN}).status_code == 401
+
+def test_db_pool_stats_count_sessions(client, auth_header):
+    """Every request session records its checkout wait."""
+    with patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN):
+        headers = {"X-Internal-Token": INTERNAL_TOKEN}
+        before = client.get("/internal/db/pool", headers=headers).json["checkout_wait_ms"]["sessions"]
+        client.get("/api/v1/zones", headers=auth_header)
+        resp = client.get("/internal/db/pool", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json["checkout_wait_ms"]["sessions"] == before + 1
+    assert resp.json["checkout_wait_ms"]["max"] >= resp.json["checkout_wait_ms"]["p50"] >= 0
+
+def test_pool_metrics_track_queue_pool(tmp_path):
+    """In-use, overflow and connection ages follow checkouts and checkins on a real QueuePool."""
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    with patch.object(Config, "DB_POOL_SIZE", 1), patch.object(Config, "DB_MAX_OVERFLOW", 2):
+        pooled = create_engine(url, **engine_options(url))
+    metrics = PoolMetrics()
+    metrics.attach(pooled)
+
+    first, second = pooled.connect(), pooled.connect()
+    first.execute(text("SELECT 1"))
+    stats = metrics.snapshot(pooled)
+    assert stats["pool_class"] == "QueuePool"
+    assert (stats["size"], stats["checkedout"], stats["overflow"]) == (1, 2, 1)
+    assert stats["in_use"] == 2
+    assert stats["connection_age_seconds"]["open"] == 2
+
+    first.close()
+    second.close()
+    stats = metrics.snapshot(pooled)
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 2
+    assert stats["checkouts"] == 2
+    # One connection beyond pool_size is discarded on checkin
+    assert stats["connection_age_seconds"]["open"] == 1
+    pooled.dispose()
+
+def test_engine_options_from_config():
+    """Pool settings apply to pooled URLs; in-memory SQLite keeps its single connection."""
+    options = engine_options("mssql+pyodbc://sa:pw@db:1433/weather_app?driver=ODBC+Driver+18+for+SQL+Server")
+    assert options["pool_size"] == Config.DB_POOL_SIZE
+    assert options["max_overflow"] == Config.DB_MAX_OVERFLOW
+    assert options["pool_recycle"] == Config.DB_POOL_RECYCLE
+    assert options["pool_pre_ping"] == Config.DB_POOL_PRE_PING
+    assert options["fast_executemany"] == Config.DB_FAST_EXECUTEMANY
+
+    assert "pool_size" not in engine_options("sqlite:///:memory:")
+    assert "fast_executemany" not in engine_options("sqlite:///weather.db")
+
+def test_response_validation_sampling_and_violations(client, auth_header):
+    """Violations fail the request only in strict mode; otherwise they are counted. Unsampled responses skip validation."""
+    from app.api.response_validation import stats
+    from app.dtos.zone_dto import ZoneResponse
+    resp = client.post("/api/v1/zones", headers=auth_header, json={"name": "Zone", "latitude": 1.0, "longitude": 2.0})
+    zone_id = resp.json["id"]
+    # A status outside the spec's enum, as a handler bug would produce it
+    broken = ZoneResponse.model_construct(id=zone_id, name="Zone", country_code=None, latitude=1.0, longitude=2.0,
+                                          temperature=None, last_fetched_at=None, weather_status="unknown_status")
+
+    with patch("app.services.zone_service.ZoneService.get_zone", return_value=broken):
+        assert client.get(f"/api/v1/zones/{zone_id}", headers=auth_header).status_code == 500
+
+        with patch.object(Config, "RESPONSE_VALIDATION_STRICT", False):
+            assert client.get(f"/api/v1/zones/{zone_id}", headers=auth_header).status_code == 200
+
+        with patch.object(Config, "RESPONSE_VALIDATION_SAMPLE_RATE", 0):
+            client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+
+    with patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN):
+        resp = client.get("/internal/response-validation", headers={"X-Internal-Token": INTERNAL_TOKEN})
+    assert resp.status_code == 200
+    assert resp.json["operations"]["app.api.zones.get_zone"] == {
+        **resp.json["operations"]["app.api.zones.get_zone"],
+        "responses": 3,
+        "validated": 2,
+        "violations": 2,
+    }
+    assert stats.snapshot()["operations"]["app.api.zones.create_zone"]["violations"] == 0
+
+def test_metrics_endpoint_reports_operations_upstream_and_sessions(client, auth_header):
+    """Requests are labelled by operationId and status; provider calls by outcome; sessions and caches are counted."""
+    import requests
+    from app.services.weather_service import WeatherService
+    from tests.constants import PROVIDER_HTTP_GET
+    from tests.test_weather import _mock_provider_response
+    zone_id = client.post("/api/v1/zones", headers=auth_header, json={"name": "Zone", "latitude": 1.0, "longitude": 2.0}).json["id"]
+    client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    with patch(PROVIDER_HTTP_GET, return_value=_mock_provider_response(18.0)):
+        client.post(f"/api/v1/zones/{zone_id}/refresh", headers=auth_header)
+    WeatherService.clear_cache()
+    with patch(PROVIDER_HTTP_GET, side_effect=requests.Timeout("slow")):
+        client.post(f"/api/v1/zones/{zone_id}/refresh", headers=auth_header)
+    # Last: a failed request rolls back the test's shared transaction
+    client.get("/api/v1/zones/999999", headers=auth_header)
+
+    with patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN):
+        resp = client.get("/internal/metrics", headers={"X-Internal-Token": INTERNAL_TOKEN})
+
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain")
+    text_body = resp.get_data(as_text=True)
+    assert 'weather_app_http_requests_total{operation="app.api.zones.get_zone",status="200"} 1' in text_body
+    assert 'weather_app_http_requests_total{operation="app.api.zones.get_zone",status="404"} 1' in text_body
+    assert 'weather_app_http_request_duration_seconds_count{operation="app.api.zones.create_zone"} 1' in text_body
+    assert 'weather_app_http_request_duration_seconds_bucket{operation="app.api.zones.create_zone",le="+Inf"} 1' in text_body
+    assert 'weather_app_upstream_requests_total{provider="weather",status="2xx"} 1' in text_body
+    assert 'weather_app_upstream_requests_total{provider="weather",status="timeout"} 1' in text_body
+    assert 'weather_app_db_sessions_total{database="primary",outcome="ok"}' in text_body
+    assert 'weather_app_cache_requests_total{cache="access_token",result="hit"}' in text_body
+    assert 'weather_app_cache_entries{cache="weather"} 0' in text_body
+    assert 'weather_app_singleflight_calls_total{flight="weather",result="executed"} 1' in text_body
+
+def test_metrics_are_summed_across_processes(tmp_path):
+    """In multi-process mode a scrape adds up every worker's snapshot file, histograms bucket by bucket."""
+    import json
+    from app.core.metrics import MetricsRegistry
+    worker = MetricsRegistry(prefix="test_")
+    requests_total = worker.counter("requests_total", "Requests", ("operation",))
+    latency = worker.histogram("latency_seconds", "Latency", ("operation",), buckets=(0.1, 1.0))
+    requests_total.inc(operation="a")
+    latency.observe(0.05, operation="a")
+    latency.observe(0.5, operation="a")
+    # What another worker flushed
+    other = worker.snapshot()
+    (tmp_path / "metrics_1.json").write_text(json.dumps(other))
+
+    with patch.object(Config, "METRICS_MULTIPROC_DIR", str(tmp_path)):
+        latency.observe(5.0, operation="a")
+        text_body = worker.collect()
+
+    assert 'test_requests_total{operation="a"} 2' in text_body
+    assert 'test_latency_seconds_bucket{operation="a",le="0.1"} 2' in text_body
+    assert 'test_latency_seconds_bucket{operation="a",le="1"} 4' in text_body
+    assert 'test_latency_seconds_bucket{operation="a",le="+Inf"} 5' in text_body
+    assert 'test_latency_seconds_count{operation="a"} 5' in text_body
+
+def test_metrics_export_cache_sizing_and_singleflight_counters():
+    """Caches report evictions, expirations and current size next to hits/misses; single-flights their coalesced calls."""
+    import threading
+    import time
+    from app.core.cache import TTLCache
+    from app.core.metrics import MetricsRegistry
+    from app.core.singleflight import SingleFlight
+    registry = MetricsRegistry(prefix="test_")
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    flight = SingleFlight()
+    registry.register_cache("demo", cache)
+    registry.register_singleflight("demo", flight)
+
+    cache.set("short", 1, ttl_seconds=0.01)
+    cache.set("a", 1)
+    cache.set("b", 2)  # evicts "short"
+    cache.set("c", 3, ttl_seconds=0.01)  # evicts "a"
+    time.sleep(0.02)
+    assert cache.get("c") is None  # expired
+    assert cache.get("b") == 2
+
+    started, release = threading.Event(), threading.Event()
+
+    def leader():
+        started.set()
+        release.wait(5)
+        return "value"
+
+    threads = [threading.Thread(target=flight.do, args=("key", leader))]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=flight.do, args=("key", leader)))
+    threads[1].start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    text_body = registry.collect()
+    assert 'test_cache_requests_total{cache="demo",result="hit"} 1' in text_body
+    assert 'test_cache_requests_total{cache="demo",result="miss"} 1' in text_body
+    assert 'test_cache_evictions_total{cache="demo"} 2' in text_body
+    assert 'test_cache_expirations_total{cache="demo"} 1' in text_body
+    assert "# TYPE test_cache_entries gauge" in text_body
+    assert 'test_cache_entries{cache="demo"} 1' in text_body
+    assert 'test_singleflight_calls_total{flight="demo",result="executed"} 1' in text_body
+    assert 'test_singleflight_calls_total{flight="demo",result="coalesced"} 1' in text_body
+
+def test_requests_profiled_on_demand(session, auth_header, tmp_path):
+    """With PROFILING_DIR set, a request carrying the internal token leaves a collapsed-stack dump and a summary."""
+    import json
+    from app import create_app
+    with patch.object(Config, "PROFILING_DIR", str(tmp_path)), patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN), \
+            patch.object(Config, "PROFILING_INTERVAL_MS", 0.5):
+        profiled_client = create_app().app.test_client()
+        plain = profiled_client.get("/api/v1/zones", headers=auth_header)
+        wrong = profiled_client.get("/api/v1/zones", headers={**auth_header, "X-Profile-Request": "wrong"})
+        resp = profiled_client.get("/api/v1/zones", headers={**auth_header, "X-Profile-Request": INTERNAL_TOKEN})
+
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in plain.headers and "X-Profile-Id" not in wrong.headers
+    profile_id = resp.headers["X-Profile-Id"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{profile_id}.collapsed", f"{profile_id}.json"]
+    summary = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert summary["operation"] == "app.api.zones.list_zones"
+    assert summary["status"] == 200
+    assert summary["duration_ms"] > 0
+    for line in (tmp_path / f"{profile_id}.collapsed").read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) >= 1 and ";" in stack
+
+def test_stack_sampler_collapses_stacks():
+    """Samples of a busy thread land on its innermost function, rooted at the outermost one."""
+    import threading
+    import time
+    from app.core.profiler import StackSampler
+
+    def busy_leaf():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    sampler = StackSampler(threading.get_ident(), 0.002).start()
+    busy_leaf()
+    sampler.stop()
+
+    assert sampler.samples > 0
+    top_stack, _ = sampler.stacks.most_common(1)[0]
+    assert top_stack.endswith(f"{__name__}:test_stack_sampler_collapses_stacks;{__name__}:busy_leaf")
+    assert sampler.collapsed().splitlines()[0] == f"{top_stack} {sampler.stacks[top_stack]}"
+
+def test_slow_queries_logged_without_parameter_values(client, auth_header, caplog):
+    """Statements over SLOW_QUERY_MS are logged with the operation and parameter types, never the values."""
+    import logging
+    with patch.object(Config, "SLOW_QUERY_MS", 0.000001), caplog.at_level(logging.WARNING, logger="app.core.query_accounting"):
+        client.post("/api/v1/zones", headers=auth_header, json={"name": "Secret Garden", "latitude": 1.0, "longitude": 2.0})
+
+    slow = [record.getMessage() for record in caplog.records if record.name == "app.core.query_accounting"]
+    assert any("app.api.zones.create_zone" in message and "INSERT INTO zones" in message for message in slow)
+    assert all("Secret Garden" not in message for message in slow)
+    assert any("<str>" in message and "<float>" in message for message in slow)
+
+def test_statements_per_request_in_metrics(client, auth_header):
+    """Each request's statement count and SQL time feed per-operation histograms."""
+    with patch.object(Config, "INTERNAL_API_TOKEN", INTERNAL_TOKEN):
+        client.get("/api/v1/zones", headers=auth_header)
+        text_body = client.get("/internal/metrics", headers={"X-Internal-Token": INTERNAL_TOKEN}).get_data(as_text=True)
+
+    assert 'weather_app_db_statements_per_request_sum{operation="app.api.zones.list_zones"} 2' in text_body
+    assert 'weather_app_db_statements_per_request_bucket{operation="app.api.zones.list_zones",le="2"} 1' in text_body
+    assert 'weather_app_db_time_per_request_seconds_count{operation="app.api.zones.list_zones"} 1' in text_body
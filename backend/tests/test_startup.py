@@ -0,0 +1,67 @@
+"""Process start-up: imports stay side-effect free and provisioning is an explicit step."""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(code_or_args, database_url):
+    args = ["-c", code_or_args] if isinstance(code_or_args, str) else code_or_args
+    env = {**os.environ, "DATABASE_URL": database_url, "LOG_LEVEL": "WARNING"}
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+def test_importing_database_module_has_no_side_effects(tmp_path):
+    """No engine, no connection, no database file, and no web framework import until they are needed."""
+    db_path = tmp_path / "lazy.db"
+    result = _run(
+        "import sys, app.core.database as d; "
+        "assert d.engine is None; assert 'connexion' not in sys.modules",
+        f"sqlite:///{db_path}"
+    )
+    assert result.returncode == 0, result.stderr
+    assert not db_path.exists()
+
+def test_cli_init_db_provisions_tables(tmp_path):
+    """`python -m app.cli init-db` creates the tables; running it again is harmless."""
+    database_url = f"sqlite:///{tmp_path / 'provisioned.db'}"
+    for _ in range(2):
+        result = _run(["-m", "app.cli", "init-db"], database_url)
+        assert result.returncode == 0, result.stderr
+
+    result = _run(
+        "from sqlalchemy import inspect; from app.core.database import get_engine; "
+        "print(sorted(inspect(get_engine()).get_table_names()))",
+        database_url
+    )
+    assert result.stdout.strip() == "['refresh_tokens', 'users', 'weather_readings', 'zones']"
+
+def test_cli_init_db_adds_columns_missing_from_an_earlier_schema(tmp_path):
+    """Tables created before `users.zones_version` and `zones.geohash` existed get them, existing rows included."""
+    database_url = f"sqlite:///{tmp_path / 'upgraded.db'}"
+    result = _run(
+        "from sqlalchemy import text; from app.core.database import get_engine\n"
+        "with get_engine().begin() as c:\n"
+        "    c.execute(text('CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(255) NOT NULL, "
+        "password_hash VARCHAR(255) NOT NULL, created_at DATETIME)'))\n"
+        "    c.execute(text('CREATE TABLE zones (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, name VARCHAR(255) NOT NULL, "
+        "country_code VARCHAR(2), latitude FLOAT NOT NULL, longitude FLOAT NOT NULL, temperature FLOAT, "
+        "last_fetched_at DATETIME, weather_status VARCHAR(13) NOT NULL)'))\n"
+        "    c.execute(text(\"INSERT INTO users (id, username, password_hash) VALUES (1, 'old', 'x')\"))",
+        database_url
+    )
+    assert result.returncode == 0, result.stderr
+    for _ in range(2):
+        result = _run(["-m", "app.cli", "init-db"], database_url)
+        assert result.returncode == 0, result.stderr
+
+    result = _run(
+        "from sqlalchemy import inspect, text; from app.core.database import get_engine\n"
+        "inspector = inspect(get_engine())\n"
+        "print('geohash' in {c['name'] for c in inspector.get_columns('zones')})\n"
+        "print('ix_zones_user_geohash' in {i['name'] for i in inspector.get_indexes('zones')})\n"
+        "with get_engine().connect() as c: print(c.execute(text('SELECT zones_version FROM users')).scalar_one())",
+        database_url
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["True", "True", "0"]
@@ -1,6 +1,17 @@
-from unittest.mock import patch
-from datetime import datetime, timezone
+import threading
+import time
+from unittest.mock import patch, Mock
+from datetime import datetime, timedelta, timezone
+from app.core.cache import TTLCache
+from app.core.exceptions import WeatherProviderUnavailable
+from app.core.metrics import registry
+from app.core.time_range import parse_timestamp
 from app.dtos.weather_dto import WeatherData
+from app.models.weather_reading import WeatherReading
+from app.repo.weather_reading_repository import WeatherReadingRepository
+from app.services.refresh_scheduler import RefreshScheduler
+from app.services.weather_service import WeatherService
+from tests.constants import PROVIDER_HTTP_GET
 
 def test_refresh_zone_weather(client, auth_header):
     """
@@ -32,4 +43,342 @@ def test_refresh_zone_weather(client, auth_header):
         assert resp.status_code == 200
         assert resp.json["weather_status"] == "fresh"
         assert resp.json["temperature"] == 15.5
-        assert "2025-01-01" in resp.json["last_fetched_at"]
+        assert resp.json["last_fetched_at"] == "2025-01-01T12:00:00Z"
+
+    # The refresh response renders the timestamp exactly as later reads do
+    resp = client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    assert resp.json["last_fetched_at"] == "2025-01-01T12:00:00Z"
+
+def _mock_provider_response(temperature):
+    mock_response = Mock()
+    mock_response.json.return_value = {"current_weather": {"temperature": temperature}}
+    mock_response.raise_for_status = Mock()
+    return mock_response
+
+def test_refresh_same_city_served_from_cache(client, auth_header):
+    """Zones on the same (quantized) coordinates share one upstream call; later hits are marked `cached`."""
+    zone_ids = []
+    for name, lat, lon in [("Paris A", 48.8566, 2.3522), ("Paris B", 48.8571, 2.3519)]:
+        resp = client.post("/api/v1/zones", headers=auth_header, json={
+            "name": name,
+            "latitude": lat,
+            "longitude": lon
+        })
+        zone_ids.append(resp.json["id"])
+
+    with patch(PROVIDER_HTTP_GET, return_value=_mock_provider_response(18.0)) as mock_get:
+        first = client.post(f"/api/v1/zones/{zone_ids[0]}/refresh", headers=auth_header)
+        second = client.post(f"/api/v1/zones/{zone_ids[1]}/refresh", headers=auth_header)
+
+    assert mock_get.call_count == 1
+    assert first.json["weather_status"] == "fresh"
+    assert second.json["weather_status"] == "cached"
+    assert second.json["temperature"] == 18.0
+    assert second.json["last_fetched_at"] == first.json["last_fetched_at"]
+
+    stats = WeatherService.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_weather_cache_evicts_least_recently_used():
+    """The cache stays within its size bound and evicts the least recently used key."""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_weather_cache_entry_expires():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_concurrent_fetches_for_same_location_are_coalesced():
+    """A burst of concurrent misses for one location costs a single upstream request."""
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=5)
+        return _mock_provider_response(21.0)
+
+    results = []
+    with patch(PROVIDER_HTTP_GET, side_effect=slow_get) as mock_get:
+        threads = [
+            threading.Thread(target=lambda: results.append(WeatherService().fetch_current_weather(40.7128, -74.006)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        # Let every thread reach the in-flight call before the upstream "responds"
+        deadline = time.monotonic() + 5
+        while WeatherService.inflight_stats()["coalesced"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+    assert mock_get.call_count == 1
+    assert len(results) == 8
+    assert all(r.temperature_celsius == 21.0 for r in results)
+
+def test_coalesced_callers_share_upstream_error():
+    """Followers of a failed in-flight fetch receive the same error instead of retrying upstream."""
+    import requests
+    release = threading.Event()
+
+    def failing_get(*args, **kwargs):
+        release.wait(timeout=5)
+        raise requests.ConnectionError("boom")
+
+    errors = []
+
+    def worker():
+        try:
+            WeatherService().fetch_current_weather(35.6762, 139.6503)
+        except WeatherProviderUnavailable as e:
+            errors.append(e)
+
+    with patch(PROVIDER_HTTP_GET, side_effect=failing_get) as mock_get:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 5
+        while WeatherService.inflight_stats()["coalesced"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+    assert mock_get.call_count == 1
+    assert len(errors) == 4
+    assert WeatherService.inflight_stats()["in_flight"] == 0
+
+def _create_zone(client, auth_header, name, lat, lon):
+    resp = client.post("/api/v1/zones", headers=auth_header, json={
+        "name": name,
+        "latitude": lat,
+        "longitude": lon
+    })
+    return resp.json["id"]
+
+def test_bulk_refresh_batches_locations(client, auth_header):
+    """Bulk refresh dedupes coordinates and resolves them in one multi-location provider call."""
+    paris_a = _create_zone(client, auth_header, "Paris A", 48.8566, 2.3522)
+    paris_b = _create_zone(client, auth_header, "Paris B", 48.8566, 2.3522)
+    berlin = _create_zone(client, auth_header, "Berlin", 52.52, 13.405)
+
+    mock_response = Mock()
+    mock_response.json.return_value = [
+        {"current_weather": {"temperature": 11.0}},
+        {"current_weather": {"temperature": 7.5}},
+    ]
+    mock_response.raise_for_status = Mock()
+
+    with patch(PROVIDER_HTTP_GET, return_value=mock_response) as mock_get:
+        resp = client.post("/api/v1/zones/refresh", headers=auth_header, json={
+            "zone_ids": [paris_a, paris_b, berlin, 999999]
+        })
+
+    assert resp.status_code == 200
+    assert mock_get.call_count == 1
+    params = mock_get.call_args.kwargs["params"]
+    assert params["latitude"] == "48.8566,52.52"
+    assert params["longitude"] == "2.3522,13.405"
+
+    assert resp.json["refreshed"] == 3
+    assert resp.json["failed"] == 1
+    by_id = {r["zone_id"]: r for r in resp.json["results"]}
+    assert by_id[paris_a]["zone"]["temperature"] == 11.0
+    assert by_id[paris_b]["zone"]["temperature"] == 11.0
+    assert by_id[berlin]["zone"]["temperature"] == 7.5
+    assert by_id[berlin]["zone"]["weather_status"] == "fresh"
+    assert by_id[berlin]["zone"]["last_fetched_at"].endswith("Z")
+    assert by_id[999999]["success"] is False
+
+    # Results are persisted
+    resp = client.get(f"/api/v1/zones/{berlin}", headers=auth_header)
+    assert resp.json["temperature"] == 7.5
+
+def test_bulk_refresh_all_zones_reports_provider_failure(client, auth_header):
+    """Without a body every zone is refreshed; a provider outage is reported per zone instead of failing the call."""
+    import requests
+    zone_id = _create_zone(client, auth_header, "Rome", 41.9028, 12.4964)
+
+    with patch(PROVIDER_HTTP_GET, side_effect=requests.ConnectionError("down")):
+        resp = client.post("/api/v1/zones/refresh", headers=auth_header)
+
+    assert resp.status_code == 200
+    assert resp.json["refreshed"] == 0
+    assert resp.json["failed"] == 1
+    assert resp.json["results"][0]["zone_id"] == zone_id
+    assert resp.json["results"][0]["error"] == "Unable to fetch weather data"
+
+def test_bulk_refresh_all_zones_is_capped(client, auth_header):
+    """Refreshing every zone is bounded like `zone_ids`: over the cap the call is rejected before any provider call."""
+    from app.services.zone_service import ZoneService
+    for i in range(3):
+        _create_zone(client, auth_header, f"Zone {i}", 10.0 + i, 20.0)
+
+    with patch.object(ZoneService, "BULK_REFRESH_MAX_ZONES", 3), \
+            patch(PROVIDER_HTTP_GET, return_value=_mock_provider_response(5.0)):
+        assert client.post("/api/v1/zones/refresh", headers=auth_header).status_code == 200
+
+    # Last: a failed request rolls back the test's shared transaction
+    with patch.object(ZoneService, "BULK_REFRESH_MAX_ZONES", 2), patch(PROVIDER_HTTP_GET) as mock_get:
+        resp = client.post("/api/v1/zones/refresh", headers=auth_header)
+    assert resp.status_code == 400
+    assert "zone_ids" in resp.json["detail"]
+    assert mock_get.call_count == 0
+
+def test_scheduler_refreshes_stalest_zones_once_per_location(client, auth_header, session):
+    """The background scheduler dedupes identical coordinates across zones and writes results back."""
+    madrid_a = _create_zone(client, auth_header, "Madrid A", 40.4168, -3.7038)
+    madrid_b = _create_zone(client, auth_header, "Madrid B", 40.4168, -3.7038)
+    lisbon = _create_zone(client, auth_header, "Lisbon", 38.7223, -9.1393)
+    etag_before = client.get("/api/v1/zones", headers=auth_header).headers["ETag"]
+
+    scheduler = RefreshScheduler(max_age_seconds=3600, batch_size=100, workers=2, rate_per_second=0)
+    with patch(PROVIDER_HTTP_GET, return_value=_mock_provider_response(25.0)) as mock_get:
+        refreshed = scheduler.run_once()
+
+    assert refreshed == 3
+    assert mock_get.call_count == 2
+    for zone_id in (madrid_a, madrid_b, lisbon):
+        resp = client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+        assert resp.json["temperature"] == 25.0
+        assert resp.json["last_fetched_at"] is not None
+    # and each zone's observation is appended to its history
+    assert session.query(WeatherReading).filter(WeatherReading.zone_id.in_([madrid_a, madrid_b, lisbon])).count() == 3
+    # Background writes invalidate the owner's cached zone reads too
+    resp = client.get("/api/v1/zones", headers={**auth_header, "If-None-Match": etag_before})
+    assert resp.status_code == 200
+
+    # Freshly fetched zones are no longer stale
+    with patch(PROVIDER_HTTP_GET) as mock_get:
+        assert scheduler.run_once() == 0
+    assert mock_get.call_count == 0
+
+def test_provider_client_reuses_connections_and_retries():
+    """
+    The pooled provider client keeps connections alive across calls and retries transient 429/5xx answers,
+    waiting no longer than its cap when a Retry-After asks for minutes.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from app.core.http_client import ProviderHttpClient
+
+    statuses = [429, 503, 200, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status = statuses.pop(0)
+            body = b'{"current_weather": {"temperature": 1.0}}'
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "600")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/forecast"
+    client = ProviderHttpClient(pool_size=2, max_retries=2, backoff_factor=0, backoff_jitter=0, max_retry_after=0.05)
+    try:
+        started = time.perf_counter()
+        for _ in range(2):
+            resp = client.get(url, timeout=5)
+            assert resp.status_code == 200
+        assert time.perf_counter() - started < 2
+        stats = client.stats()
+        with patch("app.core.http_client._client", client):
+            metrics_text = registry.collect()
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == []
+    assert stats["requests"] == 2
+    pool = next(iter(stats["pools"].values()))
+    assert pool["connections_opened"] == 1
+    assert pool["requests"] == 4
+    pool_label = f'pool="http://127.0.0.1:{server.server_port}"'
+    assert f"weather_app_provider_http_pool_requests_total{{{pool_label}}} 4" in metrics_text
+    assert f"weather_app_provider_http_idle_connections{{{pool_label}}} 1" in metrics_text
+
+def test_refreshes_record_history_downsampled_in_sql(client, auth_header, session):
+    """Refreshes append readings (a repeated cache hit does not); history aggregates them per bucket in SQL."""
+    zone_id = _create_zone(client, auth_header, "History", 45.0, 5.0)
+    observations = [(10.0, 0), (14.0, 20), (14.0, 20), (20.0, 70)]  # (temperature, minutes after 12:00)
+    for temperature, minutes in observations:
+        weather_data = WeatherData(
+            temperature_celsius=temperature,
+            fetched_at=datetime(2025, 1, 1, 12, minutes % 60, tzinfo=timezone.utc) + timedelta(hours=minutes // 60),
+        )
+        with patch("app.services.weather_service.WeatherService.fetch_current_weather", return_value=weather_data):
+            assert client.post(f"/api/v1/zones/{zone_id}/refresh", headers=auth_header).status_code == 200
+    assert session.query(WeatherReading).filter(WeatherReading.zone_id == zone_id).count() == 3
+
+    resp = client.get(f"/api/v1/zones/{zone_id}/history", headers=auth_header, query_string={
+        "from": "2025-01-01T12:00:00Z", "to": "2025-01-01T14:00:00Z", "bucket": "1h",
+    })
+    assert resp.status_code == 200
+    assert resp.json["bucket_seconds"] == 3600
+    assert [
+        (p["bucket_start"][:19], p["min_temperature"], p["max_temperature"], p["avg_temperature"], p["readings"])
+        for p in resp.json["points"]
+    ] == [("2025-01-01T12:00:00", 10.0, 14.0, 12.0, 2), ("2025-01-01T13:00:00", 20.0, 20.0, 20.0, 1)]
+
+    # A year of readings every 10 minutes comes back as a few hundred points
+    start = datetime(2024, 1, 1)
+    WeatherReadingRepository(session).add_many([
+        {"zone_id": zone_id, "fetched_at": start + timedelta(minutes=10 * i), "temperature": float(i % 30)}
+        for i in range(6 * 24 * 365)
+    ])
+    resp = client.get(f"/api/v1/zones/{zone_id}/history", headers=auth_header, query_string={
+        "from": "2024-01-01T00:00:00", "to": "2025-01-01T00:00:00",
+    })
+    assert resp.json["bucket_seconds"] == 86400
+    assert len(resp.json["points"]) == 365  # non-empty buckets only (2024 has 366 days)
+    assert sum(p["readings"] for p in resp.json["points"]) == 6 * 24 * 365
+    assert resp.json["points"][0]["min_temperature"] == 0.0 and resp.json["points"][0]["max_temperature"] == 29.0
+
+    # Deleting the zone deletes its history
+    assert client.delete(f"/api/v1/zones/{zone_id}", headers=auth_header).status_code == 204
+    assert session.query(WeatherReading).filter(WeatherReading.zone_id == zone_id).count() == 0
+
+    # Rejected before any point is computed (last: a failed request rolls back this test's transaction)
+    query = {"from": "2024-01-01T00:00:00", "to": "2025-01-01T00:00:00", "bucket": "1m"}
+    other_zone = _create_zone(client, auth_header, "Other", 1.0, 1.0)
+    assert client.get(f"/api/v1/zones/{other_zone}/history", headers=auth_header, query_string=query).status_code == 400
+    assert client.get(f"/api/v1/zones/{other_zone}/history", headers=auth_header, query_string={"bucket": "1w"}).status_code == 400
+
+def test_history_bucket_offset_does_not_overflow_on_mssql():
+    """The seconds offset must be 64-bit on MSSQL: 32-bit DATEDIFF overflows for ranges starting decades back."""
+    from datetime import datetime
+    from sqlalchemy import DateTime, literal
+    from sqlalchemy.dialects import mssql
+    from app.models.weather_reading import WeatherReading
+    from app.repo.weather_reading_repository import seconds_between
+    expression = seconds_between(literal(datetime(1900, 1, 1), DateTime), WeatherReading.fetched_at)
+    assert str(expression.compile(dialect=mssql.dialect())).startswith("DATEDIFF_BIG(second, ")
+
+def test_history_timestamps_accept_rfc3339_utc_suffix():
+    """`Z`/`z` mean UTC on every supported Python (fromisoformat only accepts them from 3.11); offsets become UTC."""
+    expected = datetime(2025, 1, 1, 12, 0)
+    for value in ("2025-01-01T12:00:00Z", "2025-01-01T12:00:00z", "2025-01-01T13:00:00+01:00", "2025-01-01T12:00:00"):
+        assert parse_timestamp(value, "from") == expected
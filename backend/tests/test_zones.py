@@ -22,9 +22,10 @@ def test_create_and_list_zone(client, auth_header):
     # 2. List Zones
     resp = client.get("/api/v1/zones", headers=auth_header)
     assert resp.status_code == 200
-    assert len(resp.json) == 1
-    assert resp.json[0]["id"] == zone_id
-    assert resp.json[0]["name"] == ZONE_A_NAME
+    assert len(resp.json["items"]) == 1
+    assert resp.json["items"][0]["id"] == zone_id
+    assert resp.json["items"][0]["name"] == ZONE_A_NAME
+    assert resp.json["next_cursor"] is None
 
 def test_zone_isolation(client, auth_header):
     """Ensure User A cannot see User B's zones."""
@@ -59,7 +60,7 @@ def test_zone_isolation(client, auth_header):
     # User B Lists Zones -> Should be empty (cannot see A's zone)
     resp = client.get("/api/v1/zones", headers=header_b)
     assert resp.status_code == 200
-    assert len(resp.json) == 0
+    assert len(resp.json["items"]) == 0
 
 def test_delete_zone(client, auth_header):
     """Test deleting a zone."""
@@ -150,3 +151,224 @@ def test_update_zone_lifecycle(client, auth_header):
     assert resp.status_code == 200
     assert resp.json["name"] == "Moved"
     assert resp.json["weather_status"] == "never_fetched" # Should be reset
+
+def test_list_zones_keyset_pagination(client, auth_header):
+    """Pages follow `next_cursor` in id order without gaps or repeats; the last page has no cursor."""
+    created = []
+    for i in range(5):
+        resp = client.post("/api/v1/zones", headers=auth_header, json={
+            "name": f"Zone {i}",
+            "latitude": ZONE_A_LAT,
+            "longitude": ZONE_A_LON
+        })
+        created.append(resp.json["id"])
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/api/v1/zones", headers=auth_header, query_string=query)
+        assert resp.status_code == 200
+        assert len(resp.json["items"]) <= 2
+        seen.extend(z["id"] for z in resp.json["items"])
+        pages += 1
+        cursor = resp.json["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(created)
+    assert pages == 3
+
+    # A zone deleted between pages does not shift the next page
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 2})
+    client.delete(f"/api/v1/zones/{created[2]}", headers=auth_header)
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 2, "cursor": resp.json["next_cursor"]})
+    assert [z["id"] for z in resp.json["items"]] == created[3:5]
+
+    # The configured maximum wins over a larger requested page
+    from unittest.mock import patch
+    from app.core.config import Config
+    with patch.object(Config, "ZONES_PAGE_MAX_LIMIT", 1):
+        resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 100})
+    assert len(resp.json["items"]) == 1
+    assert resp.json["next_cursor"] is not None
+
+def test_list_zones_rejects_bad_limit_and_cursor(client, auth_header):
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 501})
+    assert resp.status_code == 400
+
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 0})
+    assert resp.status_code == 400
+
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+def test_zone_reads_revalidate_with_etag(client, auth_header):
+    """Unchanged zones answer If-None-Match with an empty 304; any zone write changes the ETag."""
+    resp = client.post("/api/v1/zones", headers=auth_header, json={
+        "name": ZONE_A_NAME,
+        "latitude": ZONE_A_LAT,
+        "longitude": ZONE_A_LON
+    })
+    zone_id = resp.json["id"]
+
+    list_resp = client.get("/api/v1/zones", headers=auth_header)
+    zone_resp = client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    list_etag, zone_etag = list_resp.headers["ETag"], zone_resp.headers["ETag"]
+    assert list_etag != zone_etag
+
+    resp = client.get("/api/v1/zones", headers={**auth_header, "If-None-Match": list_etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert resp.headers["ETag"] == list_etag
+
+    resp = client.get(f"/api/v1/zones/{zone_id}", headers={**auth_header, "If-None-Match": f'W/{zone_etag}, "other"'})
+    assert resp.status_code == 304
+
+    # A different page is a different representation
+    resp = client.get("/api/v1/zones", headers={**auth_header, "If-None-Match": list_etag}, query_string={"limit": 1})
+    assert resp.status_code == 200
+
+    client.put(f"/api/v1/zones/{zone_id}", headers=auth_header, json={
+        "name": "Renamed",
+        "latitude": ZONE_A_LAT,
+        "longitude": ZONE_A_LON
+    })
+    resp = client.get("/api/v1/zones", headers={**auth_header, "If-None-Match": list_etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != list_etag
+    assert resp.json["items"][0]["name"] == "Renamed"
+
+    client.delete(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    resp = client.get(f"/api/v1/zones/{zone_id}", headers={**auth_header, "If-None-Match": zone_etag})
+    assert resp.status_code == 404
+
+def test_zone_reads_use_replica_once_it_has_the_users_latest_write(app, client, auth_header, session, read_replica, assert_num_queries):
+    """
+    Reads go to the replica only when it holds the user's current `zones_version` from the primary, so a write is
+    visible right away even through another app instance (process) than the one that served it.
+    """
+    from app import create_app
+    from app.models.user import User
+    from app.models.zone import Zone
+    other_instance = create_app().app.test_client()
+    resp = client.post("/api/v1/zones", headers=auth_header, json={
+        "name": ZONE_A_NAME,
+        "latitude": ZONE_A_LAT,
+        "longitude": ZONE_A_LON
+    })
+    zone_id = resp.json["id"]
+
+    # The (empty) replica has not caught up: the primary answers, whichever instance serves the read
+    for reader in (client, other_instance):
+        assert [z["id"] for z in reader.get("/api/v1/zones", headers=auth_header).json["items"]] == [zone_id]
+        assert reader.get(f"/api/v1/zones/{zone_id}", headers=auth_header).status_code == 200
+
+    # Replicated (the replica's copy is marked so we can tell who answered): the replica serves
+    user = session.query(User).one()
+    with read_replica() as replica:
+        replica.add(User(id=user.id, username=user.username, password_hash=user.password_hash, zones_version=user.zones_version))
+        replica.add(Zone(id=zone_id, user_id=user.id, name="From replica", latitude=ZONE_A_LAT, longitude=ZONE_A_LON))
+        replica.commit()
+    # One version lookup on the primary, the replica's own version check, then the zone
+    with assert_num_queries(3):
+        resp = other_instance.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    assert resp.json["name"] == "From replica"
+    # Revalidation is answered from the primary's version alone, without touching the replica
+    with assert_num_queries(1):
+        resp = other_instance.get(f"/api/v1/zones/{zone_id}", headers={**auth_header, "If-None-Match": resp.headers["ETag"]})
+    assert resp.status_code == 304
+
+    # A newer write makes the replica stale again for this user
+    client.put(f"/api/v1/zones/{zone_id}", headers=auth_header, json={
+        "name": "Renamed", "latitude": ZONE_A_LAT, "longitude": ZONE_A_LON
+    })
+    assert other_instance.get(f"/api/v1/zones/{zone_id}", headers=auth_header).json["name"] == "Renamed"
+
+def test_list_zones_fast_path_matches_pydantic_output(app, client, auth_header, session):
+    """The projection + fast-encoder listing parses to exactly what the Pydantic DTO path produced, with either encoder."""
+    import json
+    from datetime import datetime
+    from unittest.mock import patch
+    from app.core.enums import WeatherStatus
+    from app.dtos.zone_dto import ZoneListResponse, ZoneResponse
+    from app.models.zone import Zone
+    for i, (fetched_at, temperature) in enumerate([
+        (None, None),
+        (datetime(2024, 1, 2, 3, 4, 5), -3.5),
+        (datetime(2024, 6, 30, 23, 59, 59, 123456), 21.0),
+    ]):
+        resp = client.post("/api/v1/zones", headers=auth_header, json={
+            "name": f"Zone {i}", "country_code": "FR" if i else None, "latitude": 48.8566 + i, "longitude": 2.3522
+        })
+        zone = session.get(Zone, resp.json["id"])
+        zone.last_fetched_at, zone.temperature = fetched_at, temperature
+        zone.weather_status = WeatherStatus.CACHED if fetched_at else WeatherStatus.NEVER_FETCHED
+    session.flush()
+
+    zones = session.query(Zone).order_by(Zone.id).all()
+    with app.app_context():
+        expected = ZoneListResponse(items=[ZoneResponse.model_validate(z) for z in zones[:2]], next_cursor=None)
+        expected_json = json.loads(app.json.dumps(expected.model_dump()))
+
+    resp = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 2})
+    assert resp.content_type == "application/json"
+    body = resp.get_json()
+    next_cursor = body.pop("next_cursor")
+    assert next_cursor
+    expected_json.pop("next_cursor")
+    assert body == expected_json
+
+    with patch("app.core.serialization.orjson", None):
+        fallback = client.get("/api/v1/zones", headers=auth_header, query_string={"limit": 2})
+    assert fallback.json == {**expected_json, "next_cursor": next_cursor}
+
+def test_zone_endpoints_query_counts(client, auth_header, assert_num_queries):
+    """Fixed statement counts per endpoint; listing stays at two statements however many zones there are (no N+1)."""
+    with assert_num_queries(2):  # INSERT + zones_version bump, no refresh SELECT
+        zone_id = client.post("/api/v1/zones", headers=auth_header, json={"name": "Zone", "latitude": 1.0, "longitude": 2.0}).json["id"]
+    for i in range(20):
+        client.post("/api/v1/zones", headers=auth_header, json={"name": f"Zone {i}", "latitude": 1.0, "longitude": 2.0})
+
+    with assert_num_queries(2):  # ETag version + page
+        assert len(client.get("/api/v1/zones", headers=auth_header).json["items"]) == 21
+    with assert_num_queries(2):
+        client.get(f"/api/v1/zones/{zone_id}", headers=auth_header)
+    with assert_num_queries(3):
+        client.put(f"/api/v1/zones/{zone_id}", headers=auth_header, json={"name": "Renamed", "latitude": 1.0, "longitude": 2.0})
+    with assert_num_queries(4):  # lookup + its weather history + zone + zones_version bump
+        client.delete(f"/api/v1/zones/{zone_id}", headers=auth_header)
+
+def test_nearby_zones_within_radius_nearest_first(client, auth_header, assert_num_queries):
+    """Geohash cells prefilter, the exact distance decides; only the caller's zones, across the antimeridian too."""
+    def create(name, lat, lon, headers=auth_header):
+        return client.post("/api/v1/zones", headers=headers, json={"name": name, "latitude": lat, "longitude": lon}).json["id"]
+
+    paris = create("Paris", 48.8566, 2.3522)
+    versailles = create("Versailles", 48.8049, 2.1204)  # ~17.9 km from Paris
+    create("Orleans", 47.9030, 1.9093)  # ~111 km
+    fiji_east = create("Fiji East", -16.8, 179.99)
+    fiji_west = create("Fiji West", -16.8, -179.99)  # ~2.1 km away, across the antimeridian
+
+    client.post("/api/v1/auth/register", json={"username": "nearby_b", "password": DEFAULT_PASSWORD})
+    token_b = client.post("/api/v1/auth/login", json={"username": "nearby_b", "password": DEFAULT_PASSWORD}).json["access_token"]
+    create("Paris B", 48.8566, 2.3522, headers={"Authorization": f"Bearer {token_b}"})
+
+    with assert_num_queries(2):  # ETag version + one indexed candidate query
+        resp = client.get("/api/v1/zones/nearby", headers=auth_header, query_string={"lat": 48.86, "lon": 2.35, "radius_km": 50})
+    assert resp.status_code == 200
+    assert [z["id"] for z in resp.json["items"]] == [paris, versailles]
+    assert resp.json["items"][1]["name"] == "Versailles"
+    assert 17 < resp.json["items"][1]["distance_km"] < 19
+
+    resp = client.get("/api/v1/zones/nearby", headers=auth_header, query_string={"lat": -16.8, "lon": 179.999, "radius_km": 5})
+    assert [z["id"] for z in resp.json["items"]] == [fiji_east, fiji_west]
+
+    # Moving a zone moves its geohash
+    client.put(f"/api/v1/zones/{versailles}", headers=auth_header, json={"name": "Lyon", "latitude": 45.764, "longitude": 4.8357})
+    resp = client.get("/api/v1/zones/nearby", headers=auth_header, query_string={"lat": 48.86, "lon": 2.35, "radius_km": 50, "limit": 5})
+    assert [z["id"] for z in resp.json["items"]] == [paris]
+    resp = client.get("/api/v1/zones/nearby", headers=auth_header, query_string={"lat": 45.75, "lon": 4.85, "radius_km": 5})
+    assert [z["id"] for z in resp.json["items"]] == [versailles]
+
+    resp = client.get("/api/v1/zones/nearby", headers=auth_header, query_string={"lat": 48.86, "lon": 2.35, "radius_km": 0})
+    assert resp.status_code == 400
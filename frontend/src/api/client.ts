@@ -1,12 +1,15 @@
 import { STANDARD_GENERAL_ERROR_MSG } from '../constants'
-import { useAuth } from '../contexts/AuthContext'
-import type { AuthResponse, UserLogin, UserRegister, CitySearchResponse, Zone } from '../types/api'
+import { storedRefreshToken, useAuth } from '../contexts/AuthContext'
+import type { AuthResponse, UserLogin, UserRegister, CitySearchResponse, Zone, ZoneListResponse } from '../types/api'
 
 // In Docker: use relative path (nginx proxies /api to backend)
 // In local dev: use relative path (vite proxy handles it)
 // Only use absolute URL if explicitly set via env var
 const API_BASE = import.meta.env.VITE_API_BASE_URL || '/api/v1'
 
+// GET /zones page size (the server caps it at 500)
+const ZONES_PAGE_SIZE = 500
+
 export const ResponseStatusToErrorMessage: Record<number, Record<string, string>> = {
   400: {
     'default': 'Invalid input',
@@ -22,26 +25,74 @@ export const ResponseStatusToErrorMessage: Record<number, Record<string, string>
   },
 }
 
+type TokensRefreshed = (accessToken: string, refreshToken: string) => void
+
+// Refresh tokens are single-use and replaying one revokes the whole sign-in, so every client instance
+// (they are recreated per render) shares one exchange per refresh token, including already-finished ones.
+const refreshExchanges = new Map<string, Promise<AuthResponse | null>>()
+
+function exchangeRefreshToken(refreshToken: string): Promise<AuthResponse | null> {
+  let exchange = refreshExchanges.get(refreshToken)
+  if (!exchange) {
+    exchange = fetch(`${API_BASE}/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    })
+      .then(response => (response.ok ? response.json() as Promise<AuthResponse> : null))
+      .catch(() => null)
+    refreshExchanges.set(refreshToken, exchange)
+  }
+  return exchange
+}
+
 class ApiClient {
   private token: string | null
+  private refreshToken: string | null
+  private onTokensRefreshed: TokensRefreshed | null
 
-  constructor(token: string | null) {
+  constructor(token: string | null, refreshToken: string | null = null, onTokensRefreshed: TokensRefreshed | null = null) {
     this.token = token
+    this.refreshToken = refreshToken
+    this.onTokensRefreshed = onTokensRefreshed
   }
 
-  private async request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
-    const url = `${API_BASE}${endpoint}`
+  private send(url: string, options: RequestInit): Promise<Response> {
     const headers: HeadersInit = {
       'Content-Type': 'application/json',
       ...(this.token && { Authorization: `Bearer ${this.token}` }),
       ...options.headers,
     }
+    return fetch(url, { ...options, headers })
+  }
+
+  // Swaps the refresh token for a new pair (no password round-trip). Returns false when the session is over.
+  private async tryRefresh(): Promise<boolean> {
+    // Another tab may have rotated the token since this client was created (or signed out: nothing stored)
+    this.refreshToken = storedRefreshToken()
+    if (!this.refreshToken) {
+      return false
+    }
+    const tokens = await exchangeRefreshToken(this.refreshToken)
+    if (!tokens) {
+      return false
+    }
+    this.token = tokens.access_token
+    this.refreshToken = tokens.refresh_token
+    this.onTokensRefreshed?.(tokens.access_token, tokens.refresh_token)
+    return true
+  }
+
+  private async request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+    const url = `${API_BASE}${endpoint}`
 
     try {
-      const response = await fetch(url, {
-        ...options,
-        headers,
-      })
+      let response = await this.send(url, options)
+
+      // Expired access token: refresh once and replay the request
+      if (response.status === 401 && !endpoint.startsWith('/auth/') && await this.tryRefresh()) {
+        response = await this.send(url, options)
+      }
 
       if (!response.ok) {
         let errorDetail: string | undefined
@@ -93,12 +144,38 @@ class ApiClient {
     })
   }
 
+  async logout(): Promise<void> {
+    if (!this.refreshToken) {
+      return
+    }
+    return this.request<void>('/auth/logout', {
+      method: 'POST',
+      body: JSON.stringify({ refresh_token: this.refreshToken }),
+    })
+  }
+
   async searchCities(query: string): Promise<CitySearchResponse> {
     return this.request<CitySearchResponse>(`/cities/search?q=${encodeURIComponent(query)}`)
   }
 
+  async listZonesPage(cursor: string | null = null, limit: number = ZONES_PAGE_SIZE): Promise<ZoneListResponse> {
+    const params = new URLSearchParams({ limit: String(limit) })
+    if (cursor) {
+      params.set('cursor', cursor)
+    }
+    return this.request<ZoneListResponse>(`/zones?${params}`)
+  }
+
+  // Follows `next_cursor` until the last page
   async listZones(): Promise<Zone[]> {
-    return this.request<Zone[]>('/zones')
+    const zones: Zone[] = []
+    let cursor: string | null = null
+    do {
+      const page: ZoneListResponse = await this.listZonesPage(cursor)
+      zones.push(...page.items)
+      cursor = page.next_cursor
+    } while (cursor)
+    return zones
   }
 
   async createZone(name: string, latitude: number, longitude: number, countryCode: string | null = null): Promise<Zone> {
@@ -129,6 +206,6 @@ class ApiClient {
 }
 
 export function useApiClient(): ApiClient {
-  const { token } = useAuth()
-  return new ApiClient(token)
+  const { token, refreshToken, login } = useAuth()
+  return new ApiClient(token, refreshToken, login)
 }
@@ -2,16 +2,24 @@ import { createContext, useContext, useState, useEffect, ReactNode } from 'react
 
 interface AuthContextType {
   token: string | null
-  login: (token: string) => void
+  refreshToken: string | null
+  login: (token: string, refreshToken: string) => void
   logout: () => void
 }
 
 const AuthContext = createContext<AuthContextType | null>(null)
 
 // Manages global auth state.
-// Context is sufficient here since state is minimal (just the token).
+// Context is sufficient here since state is minimal (the access token and its refresh token).
 
 const TOKEN_KEY = 'weather_app_token'
+const REFRESH_TOKEN_KEY = 'weather_app_refresh_token'
+
+// The refresh token as last stored by any tab. Tokens are single-use, so a tab must exchange this one rather than
+// the copy it loaded: replaying a token another tab already rotated revokes the whole sign-in.
+export function storedRefreshToken(): string | null {
+  return localStorage.getItem(REFRESH_TOKEN_KEY)
+}
 
 interface AuthProviderProps {
   children: ReactNode
@@ -22,6 +30,10 @@ export function AuthProvider({ children }: AuthProviderProps) {
     return localStorage.getItem(TOKEN_KEY)
   })
 
+  const [refreshToken, setRefreshToken] = useState<string | null>(() => {
+    return localStorage.getItem(REFRESH_TOKEN_KEY)
+  })
+
   useEffect(() => {
     if (token) {
       localStorage.setItem(TOKEN_KEY, token)
@@ -30,18 +42,31 @@ export function AuthProvider({ children }: AuthProviderProps) {
     }
   }, [token])
 
-  const login = (newToken: string) => {
-    console.info('User logged in successfully')
+  useEffect(() => {
+    if (refreshToken) {
+      localStorage.setItem(REFRESH_TOKEN_KEY, refreshToken)
+    } else {
+      localStorage.removeItem(REFRESH_TOKEN_KEY)
+    }
+  }, [refreshToken])
+
+  // Also used after a silent refresh (see ApiClient). Stored right away, not in the effects, so that other tabs
+  // see the rotated refresh token before their next exchange.
+  const login = (newToken: string, newRefreshToken: string) => {
+    localStorage.setItem(TOKEN_KEY, newToken)
+    localStorage.setItem(REFRESH_TOKEN_KEY, newRefreshToken)
     setToken(newToken)
+    setRefreshToken(newRefreshToken)
   }
 
   const logout = () => {
     console.info('User initiated logout')
     setToken(null)
+    setRefreshToken(null)
   }
 
   return (
-    <AuthContext.Provider value={{ token, login, logout }}>
+    <AuthContext.Provider value={{ token, refreshToken, login, logout }}>
       {children}
     </AuthContext.Provider>
   )
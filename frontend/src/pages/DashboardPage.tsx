@@ -38,6 +38,8 @@ function DashboardPage() {
   }, []) // Fetch zones on component mount
 
   const handleLogout = () => {
+    // Best effort: the refresh token is forgotten locally either way
+    apiClient.logout().catch(() => undefined)
     logout()
     navigate('/login')
   }
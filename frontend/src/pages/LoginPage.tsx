@@ -32,7 +32,8 @@ function LoginPage() {
         throw new Error('Invalid response from server')
       }
       
-      login(response.access_token)
+      console.info('User logged in successfully')
+      login(response.access_token, response.refresh_token)
       navigate('/dashboard')
     } catch (err) {
       setError(getErrorMessage(err))
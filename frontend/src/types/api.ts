@@ -4,6 +4,7 @@ export interface AuthResponse {
   access_token: string
   token_type: string
   expires_in: number
+  refresh_token: string
 }
 
 export interface UserRegister {
@@ -39,3 +40,8 @@ export interface Zone {
   last_fetched_at: string | null
   weather_status: WeatherStatus
 }
+
+export interface ZoneListResponse {
+  items: Zone[]
+  next_cursor: string | null
+}